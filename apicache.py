@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+
+# Fixture statuses after which API-Football no longer changes a match's data
+FINISHEDSTATUSES = {"FT", "AET", "PEN", "AWD", "WO", "CANC", "ABD"}
+
+
+class CacheMissError(LookupError):
+    """Raised in replay mode when a request has no cached payload."""
+
+
+def canonicalpath(path):
+    """Normalize an API path so the same query always maps to the same cache key."""
+    parts = urlsplit(path)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{parts.path}?{query}" if query else parts.path
+
+
+def _fixtureid(path):
+    """Return the fixture id a per-fixture endpoint path refers to, or None."""
+    parts = urlsplit(path)
+    query = dict(parse_qsl(parts.query))
+    if parts.path == "/fixtures" and "id" in query:
+        return query["id"]
+    if parts.path.startswith("/fixtures/") and "fixture" in query:
+        return query["fixture"]
+    return None
+
+
+def _isfinishedpayload(payload):
+    for item in payload.get("response") or []:
+        status = ((item.get("fixture") or {}).get("status") or {}).get("short")
+        if status not in FINISHEDSTATUSES:
+            return False
+    return bool(payload.get("response"))
+
+
+def _kickoff(fixture):
+    """Kickoff of an API fixture as a unix timestamp, or None if the payload doesn't say."""
+    if fixture.get("timestamp") is not None:
+        return fixture["timestamp"]
+    try:
+        return datetime.fromisoformat(fixture["date"].replace("Z", "+00:00")).timestamp()
+    except (KeyError, AttributeError, ValueError):
+        return None
+
+
+def _hasoverduefixture(payload, now):
+    """Does a fixture list hold a match that has kicked off but isn't finished in this copy?"""
+    for item in payload.get("response") or []:
+        fixture = item.get("fixture") or {}
+        status = (fixture.get("status") or {}).get("short")
+        kickoff = _kickoff(fixture)
+        if status not in FINISHEDSTATUSES and kickoff is not None and kickoff <= now:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of API-Football JSON payloads.
+
+    Entries are keyed by the sha256 of the canonical endpoint path and query.
+    Payloads fetched after their fixture had finished never expire; everything
+    else (teams, coaches, player profiles, season fixture lists, unfinished
+    fixtures, and events, statistics, players or lineups cached before the
+    fixture was known to be finished) is refetched once it is older than
+    `ttl` seconds. A season fixture list is also refetched as soon as one of
+    its unfinished fixtures has kicked off, so new results show up on the next
+    run rather than a week later.
+    """
+
+    def __init__(self, cachedir=".apicache", ttl=7 * 24 * 3600):
+        self.cachedir = cachedir
+        self.ttl = ttl
+
+    def _entrypath(self, path):
+        key = hashlib.sha256(canonicalpath(path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cachedir, key[:2], f"{key}.json")
+
+    def _load(self, path):
+        try:
+            with open(self._entrypath(path), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _finishedsince(self, fixtureid):
+        """When this fixture was first seen finished, or None if it hasn't been."""
+        entry = self._load(f"/fixtures?id={fixtureid}")
+        if entry and entry.get("finished"):
+            return entry.get("fetchedat", 0)
+        return None
+
+    def get(self, path, ignorettl=False):
+        """Return the cached payload for path, or None if missing or expired."""
+        entry = self._load(path)
+        if entry is None:
+            return None
+        if ignorettl or entry.get("finished"):
+            return entry["payload"]
+        # A season list that still shows a kicked-off match as unplayed is out of date
+        islist = urlsplit(path).path == "/fixtures" and _fixtureid(path) is None
+        if islist and _hasoverduefixture(entry["payload"], time.time()):
+            return None
+        if time.time() - entry.get("fetchedat", 0) > self.ttl:
+            return None
+        return entry["payload"]
+
+    def put(self, path, payload):
+        # API-Football reports quota and parameter problems in-band; don't keep those
+        if payload.get("errors"):
+            return
+        canonical = canonicalpath(path)
+        fetchedat = time.time()
+        fixtureid = _fixtureid(canonical)
+        if fixtureid is None:
+            finished = False
+        elif urlsplit(canonical).path == "/fixtures":
+            finished = _isfinishedpayload(payload)
+        else:
+            # Events, statistics, players and lineups only stop changing once the match
+            # is over, so they're final only if the fixture was already finished when fetched
+            finishedsince = self._finishedsince(fixtureid)
+            finished = finishedsince is not None and finishedsince <= fetchedat
+        entry = {
+            "path": canonical,
+            "fetchedat": fetchedat,
+            "finished": finished,
+            "payload": payload,
+        }
+        entrypath = self._entrypath(path)
+        os.makedirs(os.path.dirname(entrypath), exist_ok=True)
+        # Write to a temp file first so concurrent readers never see a partial entry
+        tmppath = f"{entrypath}.{os.getpid()}.{id(entry)}.tmp"
+        with open(tmppath, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmppath, entrypath)
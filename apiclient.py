@@ -0,0 +1,151 @@
+import http.client
+import json
+import queue
+import threading
+import time
+from apicache import CacheMissError
+from ingeststats import stats
+from ratelimiter import RateLimiter
+
+
+APIHOST = "v3.football.api-sports.io"
+
+# Errors raised when a pooled keep-alive socket was closed while it sat idle
+_STALEERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.ResponseNotReady,
+    http.client.BadStatusLine,
+    OSError,
+)
+
+# How many times a request is re-sent after API-Football answers 429
+MAXTHROTTLERETRIES = 3
+
+
+class ApiClient:
+    """
+    Small pool of persistent keep-alive HTTPS connections to API-Football.
+
+    A connection is checked out for each request and handed back afterwards, so
+    one client can be shared by every stage (and every thread) of a run. If a
+    pooled socket has gone stale it is reopened and the request is sent again.
+
+    With a ResponseCache attached, getjson() answers from disk when it can. In
+    offline (replay) mode the network is never touched and a miss raises
+    CacheMissError.
+
+    Every request that does go to the network first takes a token from the
+    shared RateLimiter, which is kept in step with the quota headers of each
+    response.
+    """
+
+    def __init__(self, headers, host=APIHOST, poolsize=4, timeout=30, cache=None, offline=False,
+                 ratelimiter=None):
+        if offline and cache is None:
+            raise ValueError("offline mode requires a response cache")
+        self.headers = dict(headers)
+        self.host = host
+        self.timeout = timeout
+        self.poolsize = poolsize
+        self.cache = cache
+        self.offline = offline
+        self.ratelimiter = ratelimiter if ratelimiter is not None else RateLimiter()
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(poolsize)
+        self._closed = False
+
+    def _checkout(self):
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+
+    def _checkin(self, c, reuse):
+        if reuse and not self._closed:
+            self._idle.put(c)
+        else:
+            c.close()
+        self._slots.release()
+
+    def request(self, path):
+        """
+        Send a GET for path over a pooled connection, paced by the rate limiter.
+
+        A 429 empties the limiter's bucket and the request is sent again once it
+        has refilled. Returns (status, response headers, raw body bytes).
+        """
+        for attempt in range(MAXTHROTTLERETRIES + 1):
+            self.ratelimiter.acquire()
+            start = time.perf_counter()
+            status, headers, raw = self._send(path)
+            stats.add("apitime", time.perf_counter() - start)
+            stats.add("apicalls")
+            stats.add("apibytes", len(raw))
+            self.ratelimiter.update(headers)
+            if status != 429 or attempt == MAXTHROTTLERETRIES:
+                return status, headers, raw
+            self.ratelimiter.backoff()
+
+    def _send(self, path):
+        c = self._checkout()
+        reuse = False
+        try:
+            for attempt in range(2):
+                try:
+                    c.request("GET", path, headers=self.headers)
+                    res = c.getresponse()
+                    raw = res.read()
+                    break
+                except _STALEERRORS:
+                    # Closing resets the connection; http.client reopens it on the next request
+                    c.close()
+                    if attempt:
+                        raise
+            reuse = not res.will_close
+            return res.status, res.headers, raw
+        finally:
+            self._checkin(c, reuse)
+
+    def getjson(self, path):
+        """GET path and decode the JSON payload, going through the response cache if one is set."""
+        if self.cache is not None:
+            payload = self.cache.get(path, ignorettl=self.offline)
+            if payload is not None:
+                stats.add("cachehits")
+                return payload
+            if self.offline:
+                raise CacheMissError(f"No cached payload for {path}")
+        status, headers, raw = self.request(path)
+        payload = json.loads(raw.decode("utf-8"))
+        if self.cache is not None and status == 200:
+            self.cache.put(path, payload)
+        return payload
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_client = None
+_clientlock = threading.Lock()
+
+
+def getclient(headers, poolsize=4, cache=None, offline=False, ratelimiter=None):
+    """
+    Return the process-wide ApiClient, creating it on first use.
+
+    poolsize, cache, offline and ratelimiter only take effect on the call that
+    creates it.
+    """
+    global _client
+    with _clientlock:
+        if _client is None:
+            _client = ApiClient(headers, poolsize=poolsize, cache=cache, offline=offline,
+                                ratelimiter=ratelimiter)
+        return _client
@@ -0,0 +1,309 @@
+"""
+Offline benchmark of the multiplemain ingest path.
+
+Recorded API payloads are replayed through ingestfixture() (players, fixture,
+events, statistics, player statistics and lineups stages) against a throwaway
+Postgres database, and the run reports fixtures/sec, SQL statements and commits
+per fixture, and p50/p95 wall time per stage.
+
+Payloads are read from a directory of JSON files shaped like response cache
+entries ({"path": ..., "payload": ...}), so either benchmarks/fixtures or a real
+.apicache directory can be used. Player, team and coach profiles missing from
+the recordings are synthesized from the lineups, so the first fixture also
+exercises the insert path for new dimension rows.
+
+    python benchmark.py --dsn "host=localhost user=postgres"
+    python benchmark.py --dsn "host=localhost user=postgres" --synthetic-seasons 10 --json bench.json
+"""
+import argparse
+import copy
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, urlsplit
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extensions import make_dsn
+
+import multiplemain
+from apicache import ResponseCache, canonicalpath
+from apiclient import getclient
+from ingeststats import STAGES, CountingConnection, stats
+
+logger = logging.getLogger(__name__)
+
+BENCHDIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMAFILES = (
+    os.path.join(BENCHDIR, "benchmarks", "schema.sql"),
+    os.path.join(BENCHDIR, "sql", "fixturelineupplayer.sql"),
+    os.path.join(BENCHDIR, "sql", "ingest_indexes.sql"),
+)
+
+# A regular MLS season; used to size --synthetic-seasons
+FIXTURESPERSEASON = 34
+
+# Synthetic fixtures get api ids from here up so they never collide with recorded ones
+SYNTHETICFIXTUREBASE = 900000000
+
+# Timezone given to seeded venues; recorded payloads don't carry one
+SEEDVENUETIMEZONE = "America/New_York"
+
+
+def loadpayloads(directory):
+    """Read every recorded {"path", "payload"} JSON file under directory into {canonical path: payload}."""
+    payloads = {}
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if isinstance(entry, dict) and "path" in entry and "payload" in entry:
+                payloads[canonicalpath(entry["path"])] = entry["payload"]
+    return payloads
+
+
+def recordedfixtures(payloads):
+    """Api fixture ids that have every per-fixture endpoint recorded."""
+    fixtureids = []
+    for path in payloads:
+        parts = urlsplit(path)
+        query = dict(parse_qsl(parts.query))
+        if parts.path == "/fixtures" and "id" in query:
+            fixture = int(query["id"])
+            if all(canonicalpath(p.format(fixture=fixture)) in payloads
+                   for p in multiplemain.FIXTUREENDPOINTS.values()):
+                fixtureids.append(fixture)
+    return sorted(fixtureids)
+
+
+def _setfixtureid(payload, fixture):
+    payload["parameters"] = {k: str(fixture) for k in (payload.get("parameters") or {})}
+    for item in payload.get("response") or []:
+        if isinstance(item.get("fixture"), dict) and "id" in item["fixture"]:
+            item["fixture"]["id"] = fixture
+
+
+def synthesize(payloads, basefixtures, count):
+    """
+    Add `count` synthetic fixtures cloned round-robin from the recorded ones.
+
+    Each clone gets a new api fixture id and is dated a week after the
+    previous clone of the same base fixture. Returns the new fixture ids.
+    """
+    newfixtures = []
+    for n in range(count):
+        base = basefixtures[n % len(basefixtures)]
+        fixture = SYNTHETICFIXTUREBASE + n
+        for name, path in multiplemain.FIXTUREENDPOINTS.items():
+            payload = copy.deepcopy(payloads[canonicalpath(path.format(fixture=base))])
+            _setfixtureid(payload, fixture)
+            if name == "fixture":
+                for item in payload.get("response") or []:
+                    info = item["fixture"]
+                    shifted = datetime.fromisoformat(info["date"]) + timedelta(weeks=n // len(basefixtures) + 1)
+                    info["date"] = shifted.isoformat()
+                    info["timestamp"] = int(shifted.timestamp())
+            payloads[canonicalpath(path.format(fixture=fixture))] = payload
+        newfixtures.append(fixture)
+    return newfixtures
+
+
+def _wrap(get, parameters, response):
+    return {"get": get, "parameters": parameters, "errors": [], "results": len(response),
+            "paging": {"current": 1, "total": 1}, "response": response}
+
+
+def synthesizeprofiles(payloads, fixtureids):
+    """Fill in /players/profiles, /teams and /coachs payloads the recordings don't have."""
+    for fixture in fixtureids:
+        lineups = payloads[canonicalpath(f"/fixtures/lineups?fixture={fixture}")].get("response") or []
+        for lineup in lineups:
+            team = lineup.get("team") or {}
+            path = canonicalpath(f"/teams?id={team.get('id')}")
+            if team.get("id") is not None and path not in payloads:
+                payloads[path] = _wrap("teams", {"id": str(team["id"])}, [
+                    {"team": {"id": team["id"], "name": team.get("name"), "country": "USA", "founded": None},
+                     "venue": {}}])
+            coach = lineup.get("coach") or {}
+            path = canonicalpath(f"/coachs?id={coach.get('id')}")
+            if coach.get("id") is not None and path not in payloads:
+                firstname, _, lastname = (coach.get("name") or "").rpartition(" ")
+                payloads[path] = _wrap("coachs", {"id": str(coach["id"])}, [
+                    {"id": coach["id"], "name": coach.get("name"), "firstname": firstname or None,
+                     "lastname": lastname or None, "birth": {"date": None, "place": None, "country": None},
+                     "nationality": None}])
+            for entry in (lineup.get("startXI") or []) + (lineup.get("substitutes") or []):
+                player = entry.get("player") or {}
+                path = canonicalpath(f"/players/profiles?player={player.get('id')}")
+                if player.get("id") is not None and path not in payloads:
+                    firstname, _, lastname = (player.get("name") or "").rpartition(" ")
+                    payloads[path] = _wrap("players/profiles", {"player": str(player["id"])}, [
+                        {"player": {"id": player["id"], "name": player.get("name"), "firstname": firstname or None,
+                                    "lastname": lastname or None,
+                                    "birth": {"date": None, "place": None, "country": None},
+                                    "nationality": None, "height": None, "weight": None}}])
+
+
+def seedreferencedata(conn, payloads, fixtureids):
+    """Insert the leagues and venues multiplemain would otherwise ask for interactively."""
+    leagues = {}
+    venues = {}
+    for fixture in fixtureids:
+        for item in payloads[canonicalpath(f"/fixtures?id={fixture}")].get("response") or []:
+            league = item.get("league") or {}
+            leagues[league.get("id")] = league.get("name")
+            venue = (item.get("fixture") or {}).get("venue") or {}
+            venues[(venue.get("id"), venue.get("name"))] = venue.get("city")
+    with conn:
+        with conn.cursor() as cur:
+            for apiid, name in leagues.items():
+                cur.execute("INSERT INTO public.league (apifootballid, name) VALUES (%s, %s)", (apiid, name))
+            for (apiid, name), city in venues.items():
+                cur.execute("INSERT INTO public.venue (apifootballid, name, city, timezone) VALUES (%s, %s, %s, %s)",
+                            (apiid, name, city, SEEDVENUETIMEZONE))
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def checkcounts(fixtureids, perfixture):
+    """Every commit ends a transaction that ran at least one statement, so more commits means miscounting."""
+    for fixture, totals in zip(fixtureids, perfixture):
+        if totals["commits"] > totals["statements"]:
+            raise RuntimeError(f"fixture {fixture}: {totals['commits']} commits counted against only "
+                               f"{totals['statements']} statements; the ingest counters are wrong")
+
+
+def summarize(fixtureids, elapsed):
+    perfixture = [stats.fixturetotals(f) for f in fixtureids]
+    checkcounts(fixtureids, perfixture)
+    stagewall = {stage: [stats.fixtures.get(f, {}).get(stage, {}).get("wall", 0.0) for f in fixtureids]
+                 for stage in STAGES}
+    n = len(fixtureids)
+    return {
+        "fixtures": n,
+        "elapsed": elapsed,
+        "fixturespersecond": n / elapsed if elapsed else 0.0,
+        "statementsperfixture": sum(t["statements"] for t in perfixture) / n if n else 0.0,
+        "commitsperfixture": sum(t["commits"] for t in perfixture) / n if n else 0.0,
+        "firstfixture": perfixture[0] if perfixture else {},
+        "stages": {
+            stage: {"p50": percentile(walls, 50), "p95": percentile(walls, 95), "total": sum(walls)}
+            for stage, walls in stagewall.items()
+        },
+    }
+
+
+def formatsummary(summary):
+    lines = [
+        f"{summary['fixtures']} fixtures in {summary['elapsed']:.2f}s ({summary['fixturespersecond']:.2f} fixtures/s)",
+        f"{summary['statementsperfixture']:.1f} statements and {summary['commitsperfixture']:.1f} commits per fixture "
+        f"(first fixture: {summary['firstfixture'].get('statements', 0)} statements)",
+        f"{'stage':<18}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}",
+    ]
+    for stage, s in summary["stages"].items():
+        lines.append(f"{stage:<18}{s['p50'] * 1000:>10.1f}{s['p95'] * 1000:>10.1f}{s['total']:>10.2f}")
+    return "\n".join(lines)
+
+
+def createdatabase(dsn, dbname):
+    admin = psycopg2.connect(dsn)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(dbname)))
+    admin.close()
+
+
+def dropdatabase(dsn, dbname):
+    admin = psycopg2.connect(dsn)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(dbname)))
+    admin.close()
+
+
+def parseargs(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ingest path offline against a throwaway database.")
+    parser.add_argument("--dsn", default="dbname=postgres",
+                        help="libpq connection string for a server where a scratch database may be created "
+                             "(default: dbname=postgres)")
+    parser.add_argument("--payloads", default=os.path.join(BENCHDIR, "benchmarks", "fixtures"),
+                        help="directory of recorded payloads (default: benchmarks/fixtures)")
+    parser.add_argument("--fixtures", type=int, default=None,
+                        help="total fixtures to ingest; recorded fixtures are cloned to reach it")
+    parser.add_argument("--synthetic-seasons", type=int, default=None,
+                        help=f"shorthand for --fixtures N*{FIXTURESPERSEASON}")
+    parser.add_argument("--lineups", choices=sorted(multiplemain.LINEUPTABLES), default="wide",
+                        help="lineup storage to benchmark (default: wide)")
+    parser.add_argument("--json", default=None, metavar="PATH", help="also write the summary to this JSON file")
+    parser.add_argument("--keep", action="store_true", help="don't drop the scratch database afterwards")
+    parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parseargs()
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    multiplemain.setlineupstorage(args.lineups)
+
+    payloads = loadpayloads(args.payloads)
+    fixtureids = recordedfixtures(payloads)
+    if not fixtureids:
+        raise SystemExit(f"No complete recorded fixtures found in {args.payloads}.")
+    total = args.fixtures or (args.synthetic_seasons * FIXTURESPERSEASON if args.synthetic_seasons else None)
+    if total and total > len(fixtureids):
+        fixtureids += synthesize(payloads, fixtureids, total - len(fixtureids))
+    elif total:
+        fixtureids = fixtureids[:total]
+    synthesizeprofiles(payloads, fixtureids)
+
+    dbname = f"atlutdbench_{os.getpid()}"
+    createdatabase(args.dsn, dbname)
+    try:
+        with tempfile.TemporaryDirectory() as cachedir:
+            cache = ResponseCache(cachedir, ttl=math.inf)
+            for path, payload in payloads.items():
+                cache.put(path, payload)
+            apiclient = getclient({}, poolsize=len(multiplemain.FIXTUREENDPOINTS), cache=cache, offline=True)
+
+            conn = psycopg2.connect(make_dsn(args.dsn, dbname=dbname), connection_factory=CountingConnection)
+            with conn:
+                with conn.cursor() as cur:
+                    for schemafile in SCHEMAFILES:
+                        with open(schemafile, "r", encoding="utf-8") as f:
+                            cur.execute(f.read())
+            seedreferencedata(conn, payloads, fixtureids)
+
+            with ThreadPoolExecutor(max_workers=len(multiplemain.FIXTUREENDPOINTS)) as executor:
+                start = time.perf_counter()
+                for fixture in fixtureids:
+                    futures = multiplemain.submitfixturefetch(executor, apiclient, fixture)
+                    multiplemain.ingestfixture(fixture, futures, conn, {}, apiclient)
+                elapsed = time.perf_counter() - start
+            conn.close()
+            apiclient.close()
+    finally:
+        if not args.keep:
+            dropdatabase(args.dsn, dbname)
+
+    summary = summarize(fixtureids, elapsed)
+    print(formatsummary(summary))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+-- Minimal schema for benchmark.py: just the tables and columns the ingest path in
+-- multiplemain.py reads and writes. Loaded into a throwaway database; not a copy
+-- of the production schema (no triggers, audit columns or unrelated tables).
+
+CREATE TABLE public.country (
+    id   serial PRIMARY KEY,
+    name text NOT NULL,
+    code text NOT NULL
+);
+
+CREATE TABLE public.league (
+    id            serial PRIMARY KEY,
+    apifootballid integer,
+    name          text
+);
+
+CREATE TABLE public.venue (
+    id            serial PRIMARY KEY,
+    apifootballid integer,
+    name          text,
+    address       text,
+    city          text,
+    state         text,
+    countrycode   text,
+    capacity      text,
+    surface       text,
+    latitude      double precision,
+    longitude     double precision,
+    timezone      text,
+    data_source   text,
+    created_by    text
+);
+
+CREATE TABLE public.referee (
+    id          serial PRIMARY KEY,
+    firstname   text,
+    lastname    text,
+    countrycode text,
+    data_source text,
+    created_by  text
+);
+
+CREATE TABLE public.team (
+    id            serial PRIMARY KEY,
+    apifootballid integer,
+    name          text,
+    countrycode   text,
+    foundeddate   date,
+    data_source   text,
+    created_by    text
+);
+
+CREATE TABLE public.coach (
+    id               serial PRIMARY KEY,
+    apifootballid    integer,
+    firstname        text,
+    lastname         text,
+    birthdate        date,
+    birthplace       text,
+    birthcountrycode text,
+    nationality      text,
+    data_source      text,
+    created_by       text
+);
+
+CREATE TABLE public.player (
+    id               serial PRIMARY KEY,
+    apifootballid    integer,
+    firstname        text,
+    lastname         text,
+    birthdate        date,
+    birthplace       text,
+    birthcountrycode text,
+    nationality      text,
+    heightcm         integer,
+    weightkg         integer,
+    data_source      text,
+    created_by       text
+);
+
+CREATE TABLE public.position (
+    id          serial PRIMARY KEY,
+    position    text,
+    data_source text,
+    created_by  text
+);
+
+CREATE TABLE public.formation (
+    id          serial PRIMARY KEY,
+    formation   text,
+    data_source text,
+    created_by  text
+);
+
+CREATE TABLE public.eventtype (
+    id          serial PRIMARY KEY,
+    type        text,
+    eventdetail text,
+    data_source text,
+    created_by  text
+);
+
+CREATE TABLE public.apifixturelist (
+    id          serial PRIMARY KEY,
+    apisportsid integer,
+    fixturedate timestamp
+);
+
+CREATE TABLE public.fixture (
+    id                 serial PRIMARY KEY,
+    apisportsid        integer,
+    referee            integer,
+    utcdatetime        timestamp,
+    localdatetime      timestamp,
+    venue              integer,
+    league             integer,
+    hometeam           integer,
+    awayteam           integer,
+    fixturestatus      integer,
+    fixturewinner      integer,
+    homegoal           integer,
+    awaygoal           integer,
+    halftimehomescore  integer,
+    halftimeawayscore  integer,
+    fulltimehomescore  integer,
+    fulltimeawayscore  integer,
+    extratimehomescore integer,
+    extratimeawayscore integer,
+    penaltyhome        integer,
+    penaltyaway        integer,
+    atlantatime        timestamp,
+    data_source        text,
+    created_by         text
+);
+
+CREATE TABLE public.fixtureevent (
+    id               serial PRIMARY KEY,
+    fixtureid        integer,
+    eventtype        integer,
+    eventcomments    text,
+    timeelapsed      integer,
+    extratimeelapsed integer,
+    team             integer,
+    player           integer,
+    assist           integer,
+    data_source      text,
+    created_by       text
+);
+
+CREATE TABLE public.fixturestatistics (
+    id              serial PRIMARY KEY,
+    dbfixtureid     integer,
+    dbteamid        integer,
+    shotsongoal     integer,
+    shotsoffgoal    integer,
+    totalshots      integer,
+    blockedshots    integer,
+    goalkeepersaves integer,
+    shotsinsidebox  integer,
+    shotsoutsidebox integer,
+    cornerkicks     integer,
+    offsides        integer,
+    ballpossession  numeric,
+    totalpasses     integer,
+    passesaccurate  integer,
+    fouls           integer,
+    yellowcards     integer,
+    redcards        integer,
+    data_source     text,
+    created_by      text
+);
+
+CREATE TABLE public.fixtureplayerstatistics (
+    id                 serial PRIMARY KEY,
+    dbfixtureid        integer,
+    dbteamid           integer,
+    dbplayerid         integer,
+    minutes            integer,
+    number             integer,
+    positionid         integer,
+    rating             numeric,
+    captain            boolean,
+    substitute         boolean,
+    offsides           integer,
+    totalshots         integer,
+    shotsongoal        integer,
+    goals              integer,
+    goalsconceded      integer,
+    assists            integer,
+    saves              integer,
+    totalpasses        integer,
+    keypasses          integer,
+    passesaccuracy     numeric,
+    tackles            integer,
+    blocks             integer,
+    interceptions      integer,
+    duels              integer,
+    duelswon           integer,
+    dribblesattempts   integer,
+    dribblessuccess    integer,
+    dribblespast       integer,
+    foulscommitted     integer,
+    foulsdrawn         integer,
+    yellowcards        integer,
+    redcards           integer,
+    penaltieswon       integer,
+    penaltiescommitted integer,
+    penaltiesscored    integer,
+    penaltiesmissed    integer,
+    penaltiessaved     integer,
+    data_source        text,
+    created_by         text
+);
+
+CREATE TABLE public.fixturelineups (
+    id           serial PRIMARY KEY,
+    fixtureid    integer,
+    teamid       integer,
+    coachid      integer,
+    formationid  integer,
+    starter1     integer,
+    starter2     integer,
+    starter3     integer,
+    starter4     integer,
+    starter5     integer,
+    starter6     integer,
+    starter7     integer,
+    starter8     integer,
+    starter9     integer,
+    starter10    integer,
+    starter11    integer,
+    substitute1  integer,
+    substitute2  integer,
+    substitute3  integer,
+    substitute4  integer,
+    substitute5  integer,
+    substitute6  integer,
+    substitute7  integer,
+    substitute8  integer,
+    substitute9  integer,
+    substitute10 integer,
+    substitute11 integer,
+    substitute12 integer,
+    data_source  text,
+    created_by   text
+);
+
+-- Reference rows the ingest path expects to exist already
+INSERT INTO public.country (name, code) VALUES
+    ('USA', 'US'), ('United States', 'US'), ('Canada', 'CA'), ('Mexico', 'MX'), ('Argentina', 'AR'),
+    ('Brazil', 'BR'), ('Colombia', 'CO'), ('England', 'GB-ENG'), ('Germany', 'DE'), ('Ireland', 'IE'),
+    ('Georgia', 'GE'), ('Greece', 'GR'), ('Portugal', 'PT'), ('Poland', 'PL'), ('Norway', 'NO'),
+    ('France', 'FR'), ('Romania', 'RO'), ('Uruguay', 'UY'), ('Cameroon', 'CM'), ('Denmark', 'DK'),
+    ('Senegal', 'SN'), ('Venezuela', 'VE'), ('Jamaica', 'JM'), ('Ghana', 'GH'), ('Spain', 'ES');
+
+-- Referee id 1 is what refereework() returns when a fixture has no referee
+INSERT INTO public.referee (id, firstname, lastname) VALUES (1, NULL, 'Unknown');
+SELECT setval('public.referee_id_seq', 1);
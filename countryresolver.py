@@ -0,0 +1,94 @@
+import threading
+import unicodedata
+from functools import lru_cache
+
+
+def countrylookupcandidates(name):
+    """Return the normalized spellings a country name may be stored under in public.country."""
+    if not name:
+        return []
+    s = str(name).strip()
+    candidates = set()
+
+    def add(v):
+        if v and v.strip():
+            candidates.add(" ".join(v.strip().lower().split()))
+
+    # Base
+    add(s)
+    # Hyphen/space variants
+    add(s.replace("-", " "))
+    add(s.replace(" ", "-"))
+    # Remove punctuation except hyphens
+    s_no_punct = "".join(ch for ch in s if ch.isalnum() or ch.isspace() or ch == "-")
+    add(s_no_punct)
+    add(s_no_punct.replace("-", " "))
+    add(s_no_punct.replace(" ", "-"))
+    # Accent fold
+    s_ascii = unicodedata.normalize("NFKD", s)
+    s_ascii = "".join(ch for ch in s_ascii if not unicodedata.combining(ch))
+    add(s_ascii)
+    add(s_ascii.replace("-", " "))
+    add(s_ascii.replace(" ", "-"))
+
+    # Special-case: Republic of Ireland -> also match Ireland
+    s_lower_spaces = " ".join(s.strip().lower().replace("-", " ").split())
+    if "republic of ireland" in s_lower_spaces:
+        add("ireland")
+
+    return sorted(candidates)
+
+
+class CountryResolver:
+    """
+    In-memory country name -> code lookup built from a single read of public.country.
+
+    Every country name is indexed under its lowercased name and under each of
+    its countrylookupcandidates() variants, so a name from the API resolves
+    without a query. An exact (lowercased) name always wins over a variant of
+    another country. Resolved names are memoized.
+    """
+
+    def __init__(self, conn, cachesize=1024):
+        with conn.cursor() as cur:
+            cur.execute("SELECT name, code FROM public.country WHERE name IS NOT NULL ORDER BY name")
+            rows = cur.fetchall()
+        self.index = {}
+        for name, code in rows:
+            self.index.setdefault(name.lower(), code)
+        for name, code in rows:
+            for alias in countrylookupcandidates(name):
+                self.index.setdefault(alias, code)
+        self.match = lru_cache(maxsize=cachesize)(self._match)
+
+    def _match(self, country):
+        for candidate in countrylookupcandidates(country):
+            if candidate in self.index:
+                return candidate, self.index[candidate]
+        return None
+
+    def resolve(self, country):
+        """Return the country code for a name, or None if it does not match."""
+        match = self.match(country) if country else None
+        return match[1] if match else None
+
+    def resolvemany(self, countries):
+        """Return {name: code} for every name that matches."""
+        resolved = {}
+        for country in set(countries):
+            code = self.resolve(country)
+            if code is not None:
+                resolved[country] = code
+        return resolved
+
+
+_resolvers = {}
+_resolverslock = threading.Lock()
+
+
+def countries(conn):
+    """Return the CountryResolver for this connection, loading public.country on first use."""
+    with _resolverslock:
+        if conn not in _resolvers:
+            _resolvers[conn] = CountryResolver(conn)
+        return _resolvers[conn]
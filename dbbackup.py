@@ -1,10 +1,20 @@
 from azure.identity import DefaultAzureCredential
 from azure.storage.blob import BlobServiceClient
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
+import hashlib
 import os
+import re
+import shutil
+import sys
 import json
+import threading
 from datetime import datetime
 
+# pg_dump -v -j N logs this as each worker finishes a TOC entry, e.g.
+# "pg_dump: finished item 3401 TABLE DATA fixture"
+FINISHED_ITEM = re.compile(r"finished item (\d+) (.+)$")
+
 
 def load_backup_config(config_path="backupconfig.json"):
     """Load backup configuration from JSON file"""
@@ -82,6 +92,261 @@ def upload_to_blob_storage(local_file, config):
         return False
 
 
+def get_container_client(config):
+    """Container client for the backup container, created if it doesn't exist yet"""
+    if 'storage_connection_string' in config and config['storage_connection_string']:
+        blob_service_client = BlobServiceClient.from_connection_string(config['storage_connection_string'])
+    else:
+        credential = DefaultAzureCredential()
+        account_url = f"https://{config['storage_account_name']}.blob.core.windows.net"
+        blob_service_client = BlobServiceClient(account_url, credential=credential)
+
+    container_client = blob_service_client.get_container_client(config['container_name'])
+    try:
+        container_client.create_container()
+        print(f"Container '{config['container_name']}' created")
+    except Exception:
+        print(f"Container '{config['container_name']}' already exists")
+    return container_client
+
+
+class DirectoryUploader:
+    """
+    Uploads the files of a pg_dump directory-format dump while it is written.
+
+    Each file becomes the blob <prefix>/<file name> and is deleted locally once
+    uploaded, so the staging directory only ever holds files still waiting for
+    a slot. Up to `concurrency` files upload at once, each in blocks sent
+    `block_concurrency` at a time.
+    """
+
+    def __init__(self, container_client, prefix, directory, concurrency=4, block_concurrency=4):
+        self.container_client = container_client
+        self.prefix = prefix
+        self.directory = directory
+        self.block_concurrency = block_concurrency
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.futures = []
+        self.submitted = set()
+        self.uploaded_bytes = 0
+        self.lock = threading.Lock()
+
+    def _put(self, path, blob_name):
+        with open(path, "rb") as data:
+            self.container_client.upload_blob(
+                name=blob_name,
+                data=data,
+                overwrite=True,
+                max_concurrency=self.block_concurrency
+            )
+
+    def _upload(self, path, name):
+        size = os.path.getsize(path)
+        self._put(path, f"{self.prefix}/{name}")
+        os.remove(path)
+        with self.lock:
+            self.uploaded_bytes += size
+        print(f"Uploaded {name} ({size / (1024 * 1024):.2f} MB)")
+
+    def submit(self, name):
+        if name in self.submitted:
+            return
+        self.submitted.add(name)
+        self.futures.append(self.executor.submit(self._upload, os.path.join(self.directory, name), name))
+
+    def submit_item(self, dump_id, description):
+        """Queue the data files of a TOC entry pg_dump has just finished writing"""
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith(f"{dump_id}.") or (description.startswith("BLOBS") and name.startswith("blob")):
+                self.submit(name)
+
+    def submit_remaining(self, exclude=()):
+        for name in sorted(os.listdir(self.directory)):
+            if name not in exclude:
+                self.submit(name)
+
+    def wait(self):
+        """Wait for everything queued so far; raises the first upload error"""
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class IncrementalUploader(DirectoryUploader):
+    """
+    DirectoryUploader that stores each distinct file content only once.
+
+    Every file is hashed and kept as the blob <prefix>/objects/<sha256>. If an
+    earlier backup already stored that content, nothing is uploaded. Either
+    way, the file name and its object are recorded in `files` for the manifest.
+    """
+
+    def __init__(self, container_client, prefix, directory, known_objects, concurrency=4, block_concurrency=4):
+        super().__init__(container_client, prefix, directory, concurrency, block_concurrency)
+        self.known_objects = set(known_objects)
+        self.files = {}
+        self.reused_bytes = 0
+
+    def _upload(self, path, name):
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as data:
+            for chunk in iter(lambda: data.read(1024 * 1024), b""):
+                digest.update(chunk)
+                size += len(chunk)
+        object_name = f"{self.prefix}/objects/{digest.hexdigest()}"
+        with self.lock:
+            new_object = object_name not in self.known_objects
+            self.known_objects.add(object_name)
+        if new_object:
+            self._put(path, object_name)
+        os.remove(path)
+        with self.lock:
+            self.files[name] = {"object": object_name, "sha256": digest.hexdigest(), "size": size}
+            if new_object:
+                self.uploaded_bytes += size
+            else:
+                self.reused_bytes += size
+        print(f"{'Uploaded' if new_object else 'Unchanged'} {name} ({size / (1024 * 1024):.2f} MB)")
+
+
+def pg_dump_directory_command(config, staging_dir):
+    return [
+        'pg_dump',
+        '-h', config['postgres_host'],
+        '-U', config['postgres_user'],
+        '-d', config['postgres_db'],
+        '-F', 'd',  # Directory format: one file per table, required for parallel dumps
+        '-j', str(int(config.get('dump_jobs', 4))),
+        '-b',  # Include large objects
+        '-v',  # Verbose mode; also reports each finished table
+        '-f', staging_dir
+    ]
+
+
+def dump_and_upload(config, staging_dir, uploader):
+    """Run a parallel directory-format pg_dump, handing each finished file to the uploader
+
+    Returns True once every file, toc.dat last, is uploaded.
+    """
+    # Set password environment variable for pg_dump
+    env = os.environ.copy()
+    env['PGPASSWORD'] = config['postgres_password']
+
+    process = subprocess.Popen(pg_dump_directory_command(config, staging_dir), env=env,
+                               stderr=subprocess.PIPE, text=True)
+    for line in process.stderr:
+        sys.stderr.write(line)
+        match = FINISHED_ITEM.search(line.strip())
+        if match and os.path.isdir(staging_dir):
+            uploader.submit_item(match.group(1), match.group(2))
+    returncode = process.wait()
+    if returncode != 0:
+        print(f"Error creating backup: pg_dump exited with code {returncode}")
+        return False
+
+    # Whatever wasn't reported as finished (schema-only entries, a -j 1 dump), then the TOC
+    uploader.submit_remaining(exclude={"toc.dat"})
+    uploader.wait()
+    uploader.submit("toc.dat")
+    uploader.wait()
+    return True
+
+
+def create_streaming_backup(config):
+    """Dump with pg_dump -F d -j N and upload each finished file to blob storage while the dump runs
+
+    Returns the blob prefix of the backup, or None on failure. toc.dat is
+    uploaded last, so a backup prefix without it is incomplete.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_name = f"backup_{config['postgres_db']}_{timestamp}"
+    staging_dir = os.path.join(config.get('staging_dir', '.'), backup_name)
+    jobs = int(config.get('dump_jobs', 4))
+
+    print(f"Creating parallel backup: {backup_name} ({jobs} dump jobs)")
+
+    container_client = get_container_client(config)
+    uploader = DirectoryUploader(
+        container_client,
+        backup_name,
+        staging_dir,
+        concurrency=int(config.get('upload_concurrency', 4)),
+        block_concurrency=int(config.get('block_concurrency', 4))
+    )
+    try:
+        if not dump_and_upload(config, staging_dir, uploader):
+            return None
+        print(f"Backup uploaded successfully: {backup_name}/ "
+              f"({uploader.uploaded_bytes / (1024 * 1024):.2f} MB)")
+        return backup_name
+    except Exception as e:
+        print(f"Error creating or uploading backup: {e}")
+        return None
+    finally:
+        uploader.close()
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def create_incremental_backup(config):
+    """Parallel directory-format backup that only uploads files whose content changed
+
+    Each dump file is stored once under <incremental_prefix>/objects/ by its
+    sha256, so tables that haven't changed since an earlier backup (old
+    seasons) cost nothing. The backup itself is the manifest written to
+    <incremental_prefix>/manifests/<backup name>.json, mapping every file of
+    the dump to its object; it is written last and marks the backup complete.
+
+    Returns the manifest blob name, or None on failure.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_name = f"backup_{config['postgres_db']}_{timestamp}"
+    staging_dir = os.path.join(config.get('staging_dir', '.'), backup_name)
+    prefix = config.get('incremental_prefix', 'incremental')
+    manifest_name = f"{prefix}/manifests/{backup_name}.json"
+
+    print(f"Creating incremental backup: {backup_name} ({int(config.get('dump_jobs', 4))} dump jobs)")
+
+    container_client = get_container_client(config)
+    known_objects = [blob.name for blob in container_client.list_blobs(name_starts_with=f"{prefix}/objects/")]
+    print(f"{len(known_objects)} objects already stored by earlier backups")
+
+    uploader = IncrementalUploader(
+        container_client,
+        prefix,
+        staging_dir,
+        known_objects,
+        concurrency=int(config.get('upload_concurrency', 4)),
+        block_concurrency=int(config.get('block_concurrency', 4))
+    )
+    try:
+        if not dump_and_upload(config, staging_dir, uploader):
+            return None
+        manifest = {
+            "backup": backup_name,
+            "database": config['postgres_db'],
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "format": "directory",
+            "files": dict(sorted(uploader.files.items())),
+        }
+        container_client.upload_blob(name=manifest_name, data=json.dumps(manifest, indent=2), overwrite=True)
+
+        total = uploader.uploaded_bytes + uploader.reused_bytes
+        print(f"Backup manifest written: {manifest_name}")
+        print(f"Uploaded {uploader.uploaded_bytes / (1024 * 1024):.2f} MB of {total / (1024 * 1024):.2f} MB; "
+              f"the rest is unchanged since earlier backups")
+        return manifest_name
+    except Exception as e:
+        print(f"Error creating or uploading backup: {e}")
+        return None
+    finally:
+        uploader.close()
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
 def cleanup_local_backup(filename):
     """Remove local backup file after upload"""
     try:
@@ -102,6 +367,15 @@ def main():
     print("...backup configuration loaded.")
     print("")
 
+    # Directory and incremental modes dump in parallel and upload as they go; nothing is left to clean up
+    if config.get('backup_mode', 'custom') in ('directory', 'incremental'):
+        create = create_incremental_backup if config['backup_mode'] == 'incremental' else create_streaming_backup
+        if create(config):
+            print("Backup completed successfully!")
+        else:
+            print("Failed to create backup")
+        return
+
     # Create backup
     backup_file = create_backup(config)
 
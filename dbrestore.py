@@ -1,7 +1,10 @@
 from azure.identity import DefaultAzureCredential
 from azure.storage.blob import BlobServiceClient
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
+import threading
 import os
+import shutil
 import json
 
 
@@ -11,19 +14,34 @@ def load_backup_config(config_path="backupConfig.json"):
         return json.load(f)
 
 
+def get_blob_service_client(config):
+    """Blob service client for the backup storage account
+
+    Downloads are fetched as ranged GETs of `download_chunk_mb` MB each, so a
+    download holds at most one chunk per concurrent request in memory.
+    """
+    chunk_size = int(config.get('download_chunk_mb', 4)) * 1024 * 1024
+    # Check if using connection string or credential
+    if 'storage_connection_string' in config and config['storage_connection_string']:
+        return BlobServiceClient.from_connection_string(
+            config['storage_connection_string'],
+            max_single_get_size=chunk_size,
+            max_chunk_get_size=chunk_size
+        )
+    credential = DefaultAzureCredential()
+    account_url = f"https://{config['storage_account_name']}.blob.core.windows.net"
+    return BlobServiceClient(
+        account_url,
+        credential=credential,
+        max_single_get_size=chunk_size,
+        max_chunk_get_size=chunk_size
+    )
+
+
 def list_available_backups(config):
     """List all backup files available in blob storage"""
     try:
-        # Check if using connection string or credential
-        if 'storage_connection_string' in config and config['storage_connection_string']:
-            blob_service_client = BlobServiceClient.from_connection_string(
-                config['storage_connection_string']
-            )
-        else:
-            credential = DefaultAzureCredential()
-            account_url = f"https://{config['storage_account_name']}.blob.core.windows.net"
-            blob_service_client = BlobServiceClient(account_url, credential=credential)
-
+        blob_service_client = get_blob_service_client(config)
         container_client = blob_service_client.get_container_client(config['container_name'])
 
         print(f"Available backups in container '{config['container_name']}':")
@@ -31,21 +49,43 @@ def list_available_backups(config):
 
         blobs = list(container_client.list_blobs())
 
-        if not blobs:
+        # Directory-format backups are a prefix of per-table blobs; list each as one
+        # backup, named with a trailing '/', once its toc.dat (uploaded last) is there.
+        # Incremental backups are listed by their manifest; their shared objects aren't backups.
+        incremental_prefix = config.get('incremental_prefix', 'incremental')
+        backups = {}
+        complete = set()
+        for blob in blobs:
+            if blob.name.startswith(f"{incremental_prefix}/"):
+                if blob.name.startswith(f"{incremental_prefix}/manifests/") and blob.name.endswith(".json"):
+                    backups[blob.name] = {"size": blob.size, "last_modified": blob.last_modified}
+            elif '/' in blob.name:
+                prefix, _, member = blob.name.partition('/')
+                name = f"{prefix}/"
+                entry = backups.setdefault(name, {"size": 0, "last_modified": blob.last_modified})
+                entry["size"] += blob.size
+                entry["last_modified"] = max(entry["last_modified"], blob.last_modified)
+                if member == "toc.dat":
+                    complete.add(name)
+            else:
+                backups[blob.name] = {"size": blob.size, "last_modified": blob.last_modified}
+        backups = {name: entry for name, entry in backups.items() if not name.endswith('/') or name in complete}
+
+        if not backups:
             print("No backups found!")
             return []
 
         # Sort by last modified (newest first)
-        blobs.sort(key=lambda x: x.last_modified, reverse=True)
+        ordered = sorted(backups.items(), key=lambda item: item[1]["last_modified"], reverse=True)
 
         backup_list = []
-        for idx, blob in enumerate(blobs, 1):
-            size_mb = blob.size / (1024 * 1024)
-            print(f"{idx}. {blob.name}")
+        for idx, (name, entry) in enumerate(ordered, 1):
+            size_mb = entry["size"] / (1024 * 1024)
+            print(f"{idx}. {name}")
             print(f"   Size: {size_mb:.2f} MB")
-            print(f"   Last Modified: {blob.last_modified}")
+            print(f"   Last Modified: {entry['last_modified']}")
             print()
-            backup_list.append(blob.name)
+            backup_list.append(name)
 
         return backup_list
 
@@ -54,30 +94,80 @@ def list_available_backups(config):
         return []
 
 
+def is_manifest(blob_name, config):
+    """Whether a listed backup is an incremental backup manifest written by dbbackup.py"""
+    prefix = config.get('incremental_prefix', 'incremental')
+    return blob_name.startswith(f"{prefix}/manifests/") and blob_name.endswith(".json")
+
+
+def download_to_file(container_client, blob_name, local_path, block_concurrency=4):
+    """Download one blob straight to disk as parallel ranged reads
+
+    Up to `block_concurrency` chunks are fetched at once and each is written at
+    its offset in the file, so memory stays bounded however big the blob is.
+    """
+    with open(local_path, "wb") as download_file:
+        container_client.download_blob(blob_name, max_concurrency=block_concurrency).readinto(download_file)
+
+
+def download_files(container_client, files, config):
+    """Download (blob name, local path) pairs, `download_concurrency` files at a time"""
+    block_concurrency = int(config.get('block_concurrency', 4))
+    with ThreadPoolExecutor(max_workers=int(config.get('download_concurrency', 4))) as executor:
+        futures = [
+            executor.submit(download_to_file, container_client, name, local_path, block_concurrency)
+            for name, local_path in files
+        ]
+        for future in futures:
+            future.result()
+
+
 def download_backup(blob_name, config):
     """Download a backup file from Azure Blob Storage"""
     try:
-        # Check if using connection string or credential
-        if 'storage_connection_string' in config and config['storage_connection_string']:
-            blob_service_client = BlobServiceClient.from_connection_string(
-                config['storage_connection_string']
-            )
-        else:
-            credential = DefaultAzureCredential()
-            account_url = f"https://{config['storage_account_name']}.blob.core.windows.net"
-            blob_service_client = BlobServiceClient(account_url, credential=credential)
+        blob_service_client = get_blob_service_client(config)
+        container_client = blob_service_client.get_container_client(config['container_name'])
 
-        blob_client = blob_service_client.get_blob_client(
-            container=config['container_name'],
-            blob=blob_name
-        )
+        # Incremental backup: rebuild the dump directory from the objects its manifest lists
+        if is_manifest(blob_name, config):
+            manifest = json.loads(container_client.download_blob(blob_name).readall())
+            local_dir = manifest["backup"]
+            os.makedirs(local_dir, exist_ok=True)
+            print(f"Downloading {len(manifest['files'])} files of {manifest['backup']} from its manifest...")
+            download_files(
+                container_client,
+                [(entry["object"], os.path.join(local_dir, name)) for name, entry in manifest["files"].items()],
+                config
+            )
+            print(f"Downloaded successfully: {local_dir}")
+            return local_dir
+
+        # Directory-format backup: fetch every file under the prefix into a local directory
+        if blob_name.endswith('/'):
+            local_dir = blob_name.rstrip('/')
+            os.makedirs(local_dir, exist_ok=True)
+            print(f"Downloading {blob_name}...")
+            download_files(
+                container_client,
+                [
+                    (blob.name, os.path.join(local_dir, blob.name[len(blob_name):]))
+                    for blob in container_client.list_blobs(name_starts_with=blob_name)
+                ],
+                config
+            )
+            print(f"Downloaded successfully: {local_dir}")
+            return local_dir
 
         # Download to current directory
         local_filename = blob_name
         print(f"Downloading {blob_name}...")
 
-        with open(local_filename, "wb") as download_file:
-            download_file.write(blob_client.download_blob().readall())
+        download_to_file(
+            container_client,
+            blob_name,
+            local_filename,
+            block_concurrency=int(config.get('block_concurrency', 4))
+        )
 
         print(f"Downloaded successfully: {local_filename}")
         return local_filename
@@ -87,7 +177,73 @@ def download_backup(blob_name, config):
         return None
 
 
-def restore_backup(backup_file, target_db, config, schema_only=False):
+def can_stream_restore(blob_name, config):
+    """Whether a backup can be piped into pg_restore instead of downloaded first
+
+    Only single-file custom-format dumps qualify: directory-format dumps are
+    many files, and pg_restore needs them on disk.
+    """
+    return bool(config.get('stream_restore')) and not blob_name.endswith('/') and not is_manifest(blob_name, config)
+
+
+def open_backup_stream(blob_name, config):
+    """Iterator over a backup blob's bytes, one ranged chunk at a time"""
+    blob_service_client = get_blob_service_client(config)
+    blob_client = blob_service_client.get_blob_client(
+        container=config['container_name'],
+        blob=blob_name
+    )
+    return blob_client.download_blob().chunks()
+
+
+def run_piped(command, env, chunks):
+    """Run a command with `chunks` fed to its stdin, returning a CompletedProcess like subprocess.run
+
+    stdout and stderr are drained on their own threads so a chatty pg_restore
+    can't stall the pipe while we are still writing to it.
+    """
+    process = subprocess.Popen(
+        command,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    output = {}
+    readers = [
+        threading.Thread(target=lambda name=name, pipe=pipe: output.__setitem__(name, pipe.read()))
+        for name, pipe in (("stdout", process.stdout), ("stderr", process.stderr))
+    ]
+    for reader in readers:
+        reader.start()
+
+    try:
+        for chunk in chunks:
+            process.stdin.write(chunk)
+    except BrokenPipeError:
+        # pg_restore exited early; its exit code and stderr say why
+        pass
+    except Exception:
+        process.kill()
+        raise
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        process.wait()
+        for reader in readers:
+            reader.join()
+
+    return subprocess.CompletedProcess(
+        command,
+        process.returncode,
+        output.get("stdout", b"").decode(errors="replace"),
+        output.get("stderr", b"").decode(errors="replace")
+    )
+
+
+def restore_backup(backup_file, target_db, config, schema_only=False, source_chunks=None):
     """Restore a PostgreSQL backup to a target database using pg_restore
 
     Args:
@@ -95,6 +251,8 @@ def restore_backup(backup_file, target_db, config, schema_only=False):
         target_db: Target database name
         config: Configuration dictionary
         schema_only: If True, restore only schema (no data)
+        source_chunks: Optional iterator of the dump's bytes; pg_restore then reads
+            it from stdin while it downloads and backup_file is only a label
     """
     restore_type = "schema only" if schema_only else "full (schema + data)"
     print(f"Restoring {backup_file} to database '{target_db}' ({restore_type})...")
@@ -174,7 +332,12 @@ def restore_backup(backup_file, target_db, config, schema_only=False):
     if schema_only:
         restore_command_lenient.append('--schema-only')
 
-    restore_command_lenient.append(backup_file)
+    # Directory-format dumps can be restored in parallel; a piped dump is read from stdin,
+    # which pg_restore can only do with a single job
+    if source_chunks is None:
+        if os.path.isdir(backup_file):
+            restore_command_lenient.extend(['-j', str(config.get('restore_jobs', 4))])
+        restore_command_lenient.append(backup_file)
 
     print(f"Starting restore (this may take a while)...")
     if schema_only:
@@ -183,12 +346,15 @@ def restore_backup(backup_file, target_db, config, schema_only=False):
 
     try:
         # Use lenient mode - capture output to show details
-        result = subprocess.run(
-            restore_command_lenient,
-            env=env,
-            capture_output=True,
-            text=True
-        )
+        if source_chunks is not None:
+            result = run_piped(restore_command_lenient, env, source_chunks)
+        else:
+            result = subprocess.run(
+                restore_command_lenient,
+                env=env,
+                capture_output=True,
+                text=True
+            )
 
         # Show output
         if result.stdout:
@@ -279,7 +445,10 @@ def restore_backup(backup_file, target_db, config, schema_only=False):
 def cleanup_local_file(filename):
     """Remove downloaded backup file"""
     try:
-        if os.path.exists(filename):
+        if os.path.isdir(filename):
+            shutil.rmtree(filename)
+            print(f"Local directory {filename} removed")
+        elif os.path.exists(filename):
             os.remove(filename)
             print(f"Local file {filename} removed")
     except Exception as e:
@@ -356,6 +525,17 @@ def main():
 
     print()
 
+    # Custom-format dumps can be piped into pg_restore as they download
+    if can_stream_restore(selected_backup, config):
+        print(f"Streaming {selected_backup} into pg_restore...")
+        try:
+            source_chunks = open_backup_stream(selected_backup, config)
+        except Exception as e:
+            print(f"Error opening backup: {e}")
+            return
+        restore_backup(selected_backup, target_db, config, schema_only=schema_only, source_chunks=source_chunks)
+        return
+
     # Download backup
     local_file = download_backup(selected_backup, config)
 
@@ -0,0 +1,132 @@
+import threading
+
+
+# Dimension name -> (query, number of leading key columns). The remaining columns
+# are the cached value; multi-column keys and values are stored as tuples. Rows
+# are ordered by id so that when a key appears more than once the oldest row wins.
+_DIMENSIONQUERIES = {
+    "team": ("SELECT apifootballid, id FROM public.team WHERE apifootballid IS NOT NULL ORDER BY id", 1),
+    "player": ("SELECT apifootballid, id FROM public.player WHERE apifootballid IS NOT NULL ORDER BY id", 1),
+    "coach": ("SELECT apifootballid, id FROM public.coach WHERE apifootballid IS NOT NULL ORDER BY id", 1),
+    "league": ("SELECT apifootballid, id FROM public.league WHERE apifootballid IS NOT NULL ORDER BY id", 1),
+    "position": ("SELECT position, id FROM public.position WHERE position IS NOT NULL ORDER BY id", 1),
+    "formation": ("SELECT formation, id FROM public.formation WHERE formation IS NOT NULL ORDER BY id", 1),
+    "eventtype": ("SELECT type, eventdetail, id FROM public.eventtype ORDER BY id", 2),
+    "referee": ("SELECT concat_ws(' ', left(firstname, 1), lastname), id FROM public.referee ORDER BY id", 1),
+    "venue": ("SELECT name, id, timezone FROM public.venue WHERE name IS NOT NULL ORDER BY id", 1),
+    "apivenue": ("SELECT apifootballid, id, timezone FROM public.venue WHERE apifootballid IS NOT NULL ORDER BY id", 1),
+}
+
+# Dimensions that grow with the history and are resolved a batch of keys at a
+# time instead of being read whole.
+_BATCHQUERIES = {
+    "team": "SELECT apifootballid, id FROM public.team WHERE apifootballid = ANY(%s) ORDER BY id",
+    "player": "SELECT apifootballid, id FROM public.player WHERE apifootballid = ANY(%s) ORDER BY id",
+    "coach": "SELECT apifootballid, id FROM public.coach WHERE apifootballid = ANY(%s) ORDER BY id",
+}
+
+
+class DimensionCache:
+    """
+    Per-run, in-memory copy of the lookup tables used during ingest.
+
+    Each dimension is read with a single query the first time it is needed and
+    kept as a dict keyed by apifootballid or natural key:
+
+        team, player, coach, league   apifootballid -> id
+        position, formation           name -> id
+        eventtype                     (type, eventdetail) -> id
+        referee                       "F Lastname" -> id
+        venue                         name -> (id, timezone)
+        apivenue                      apifootballid -> (id, timezone)
+
+    team, player and coach can also be filled on demand with resolvemany(),
+    which fetches every not-yet-cached key of a batch in one = ANY query; get()
+    and has() on those dimensions go through it rather than reading the table.
+
+    Code that inserts a new row must call add() so later lookups in the same
+    run see it without going back to the database.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._tables = {}
+        self._complete = set()
+        self._missing = {}
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        """Return the whole key -> value map for a dimension, loading it on first use."""
+        with self._lock:
+            if name not in self._complete:
+                query, keycolumns = _DIMENSIONQUERIES[name]
+                with self.conn.cursor() as cur:
+                    cur.execute(query)
+                    rows = cur.fetchall()
+                loaded = {}
+                for row in rows:
+                    key = row[0] if keycolumns == 1 else tuple(row[:keycolumns])
+                    value = row[keycolumns] if len(row) == keycolumns + 1 else tuple(row[keycolumns:])
+                    loaded.setdefault(key, value)
+                loaded.update(self._tables.get(name, {}))
+                self._tables[name] = loaded
+                self._complete.add(name)
+                self._missing.pop(name, None)
+            return self._tables[name]
+
+    def resolvemany(self, name, keys):
+        """
+        Return {key: value} for every key of the batch that exists in the database.
+
+        Keys not seen before are fetched together with a single = ANY(%s) query.
+        """
+        keys = {k for k in keys if k is not None}
+        if name not in _BATCHQUERIES or name in self._complete:
+            table = self.table(name)
+            return {k: table[k] for k in keys if k in table}
+        with self._lock:
+            table = self._tables.setdefault(name, {})
+            missing = self._missing.setdefault(name, set())
+            unknown = [k for k in keys if k not in table and k not in missing]
+            if unknown:
+                with self.conn.cursor() as cur:
+                    cur.execute(_BATCHQUERIES[name], (unknown,))
+                    rows = cur.fetchall()
+                for key, value in rows:
+                    table.setdefault(key, value)
+                missing.update(k for k in unknown if k not in table)
+            return {k: table[k] for k in keys if k in table}
+
+    def get(self, name, key, default=None):
+        if name in _BATCHQUERIES and name not in self._complete:
+            return self.resolvemany(name, [key]).get(key, default)
+        return self.table(name).get(key, default)
+
+    def has(self, name, key):
+        if name in _BATCHQUERIES and name not in self._complete:
+            return key in self.resolvemany(name, [key])
+        return key in self.table(name)
+
+    def add(self, name, key, value):
+        """Record a row inserted during this run."""
+        with self._lock:
+            self._tables.setdefault(name, {})[key] = value
+            self._missing.get(name, set()).discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self._complete.clear()
+            self._missing.clear()
+
+
+_caches = {}
+_cacheslock = threading.Lock()
+
+
+def dimensions(conn):
+    """Return the DimensionCache bound to this connection, creating it on first use."""
+    with _cacheslock:
+        if conn not in _caches:
+            _caches[conn] = DimensionCache(conn)
+        return _caches[conn]
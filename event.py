@@ -1,7 +1,12 @@
 import json
-import http.client
+import logging
 import sys
 import psycopg2
+from apiclient import getclient
+
+# Raw payload and table dumps are logged at DEBUG; raise the level to see them
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 
 def loadHeaders(headersPath="headers.json"):
@@ -27,7 +32,7 @@ def eventtypework(c, et, ed):
     with c.cursor() as cur:
         cur.execute("SELECT id, type, eventdetail FROM public.eventtype")
         rows = cur.fetchall()
-    print(f"Rows of eventtype: {rows}")
+    logger.debug("Rows of eventtype: %s", rows)
 
     # Check to see if the event type exists in the database
     eventtypeexists = False
@@ -76,12 +81,9 @@ apifixtureid = int(input("Enter the fixture ID:  "))
 path = f"/fixtures/events?fixture={apifixtureid}"
 
 ## Get api info on fixture, store it as a variable, payload
-apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-apiconn.request("GET", path, headers=headers)
-res = apiconn.getresponse()
-raw = res.read()
-payload = json.loads(raw.decode("utf-8"))
-print(payload)
+apiclient = getclient(headers)
+payload = apiclient.getjson(path)
+logger.debug("%s", payload)
 
 ## Connect once to postgres for lookups and load
 conn = psycopg2.connect(
@@ -97,7 +99,7 @@ with conn.cursor() as cur:
     cur.execute("SELECT apisportsid, id from public.fixture where apisportsid = %s", (apifixtureid,))
     existingfixtures = cur.fetchall()
 existingfixturesdict = {existingfixture[0]: existingfixture[1] for existingfixture in existingfixtures if existingfixture[0] is not None}
-print(f"Existing fixtures: {existingfixturesdict}")
+logger.debug("Existing fixtures: %s", existingfixturesdict)
 databasefixtureid = ""
 if apifixtureid in existingfixturesdict:
     databasefixtureid = existingfixturesdict[apifixtureid]
@@ -108,7 +110,7 @@ with conn.cursor() as cur:
     cur.execute("SELECT fixtureid from public.fixtureevent")
     existingfixtureevents = cur.fetchall()
 existingids = {row[0] for row in existingfixtureevents}  # Extract first column into a set
-print(f"Existing fixture events: {existingids}")
+logger.debug("Existing fixture events: %s", existingids)
 if databasefixtureid in existingids:
     print(f"The fixture {databasefixtureid} already has events in the database.")
     sys.exit(0)
@@ -120,8 +122,8 @@ print(f"The API tells us there are {apiresults} events.")
 
 # Ge the events into a list of dictionaries
 response = payload.get("response") or {}
-print(response)
-print(f"There are {len(response)} events in the response.")
+logger.debug("%s", response)
+logger.debug("There are %s events in the response.", len(response))
 if len(response) == apiresults:
     print("The number of events in the response matches the number of events the API initially tells us there are.")
 else:
@@ -131,7 +133,7 @@ count = 0
 for event in response:
     count += 1
     print(f"Event {count}:")
-    print(event)
+    logger.debug("%s", event)
 
     ## Event type work
     # Get type, detail, and comments into variables
@@ -1,15 +1,16 @@
 import json
-import http.client
+import logging
 import sys
 import psycopg2
 import unicodedata
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError, GeocoderUnavailable
-from timezonefinderL import TimezoneFinder
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from datetime import datetime, timezone, date
-from typing import Optional
+from apiclient import getclient
+from venuegeo import venuegeo
+
+# Raw payload and table dumps are logged at DEBUG; raise the level to see them
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 
 # Minimal alias mapping for common names and Windows zones to IANA
@@ -143,7 +144,7 @@ def applyCountryCodes(conn, country):
         return sorted(candidates)
 
     candidates = country_lookup_candidates(country)
-    print(f"Looking up candidates: {candidates!r}")
+    logger.debug("Looking up candidates: %r", candidates)
 
     if not candidates:
         return {}
@@ -201,7 +202,7 @@ def refereeWork(f, conn):
             cur.execute("SELECT concat_ws(' ', firstname, lastname) as fullname, id FROM public.referee")
             rows = cur.fetchall()
         existingReferees = {row[0]: row[1] for row in rows if row[0] is not None}
-        print(existingReferees)
+        logger.debug("%s", existingReferees)
         # If referee is in db, get referee id
         if referee in existingReferees:
             refId = existingReferees[referee]
@@ -213,7 +214,7 @@ def refereeWork(f, conn):
             firstname, lastname = splitFullName(referee)
             print(f"Firstname: {firstname} Lastname: {lastname}")
             refereeCountryCodeMap = applyCountryCodes(conn, refereeCountry)
-            print(refereeCountryCodeMap)
+            logger.debug("%s", refereeCountryCodeMap)
             refereeCountryCode = None
             if refereeCountryCodeMap:
                 refereeCountryCode = next(iter(refereeCountryCodeMap.values()))
@@ -290,7 +291,7 @@ def venueWork(f, conn): # f is fixture
             rows = cur.fetchall()
         # getting just the names of the venues into a dictionary
         existingNoneVenues = {row[0]: row[1] for row in rows if row[0] is not None}
-        print(f"All existing venues w/o api id:  {existingNoneVenues}")
+        logger.debug("All existing venues w/o api id:  %s", existingNoneVenues)
         if venueName in existingNoneVenues: # running through the list to see if venue name is in the list
             print(f"Venue {venueName} is already in the database, no need to proceed.")
             print(f"Venue id: {existingNoneVenues[venueName]}")
@@ -310,59 +311,12 @@ def venueWork(f, conn): # f is fixture
             capacity = input(f"Enter the capacity for {venueName}: ")
             surface = input(f"Enter the surface for {venueName}: ")
 
-            # create a function that finds and inserts lat and long based on address
-            def geocode_address(a: str) -> Optional[tuple[float, float]]:
-                """
-                Returns (latitude, longitude) in decimal degrees for the given address,
-                or None if not found or on transient network errors.
-                """
-                address = (a or "").strip()
-                if not address:
-                    return None
-
-                # Configure a descriptive user agent and a sensible timeout per request
-                geolocator = Nominatim(user_agent="atlutdhistory-app/1.0 (contact: youremail@example.com)", timeout=10)
-
-                # RateLimiter helps respect Nominatim usage policy; add retries and error swallowing
-                geocode = RateLimiter(
-                    geolocator.geocode,
-                    min_delay_seconds=1.0,
-                    max_retries=3,  # retry transient failures
-                    error_wait_seconds=2.0,  # wait between retries on errors
-                    swallow_exceptions=False,  # propagate so we can handle specific cases below
-                )
-
-                try:
-                    # exactly_one True returns a single Location or None
-                    location = geocode(address, exactly_one=True, addressdetails=False)
-                except (GeocoderTimedOut, GeocoderUnavailable) as e:
-                    # Network/service transient issue: return None gracefully
-                    return None
-                except GeocoderServiceError:
-                    # Other geopy service errors (e.g., bad response)
-                    return None
-                except Exception:
-                    # Any unexpected error: fail gracefully
-                    return None
-
-                if location is None:
-                    return None
-                return location.latitude, location.longitude
-
-
-            geocodeaddr = f"{address}, {city}, {state}"
-            coords = geocode_address(geocodeaddr)
-            if coords:
-                lat, lon = coords
+            # geocode and timezone lookups go through the shared service and its on-disk cache
+            lat, lon, tz = venuegeo().locate(f"{address}, {city}, {state}")
+            if lat is not None:
                 print(f"Latitude: {lat}, Longitude: {lon}")
             else:
-                lat = None
-                lon = None
                 print("Address not found.")
-
-            # create a function that finds and inserts timezone based on lat/long
-            tf = TimezoneFinder()
-            tz = tf.timezone_at(lng=lon, lat=lat)
             print(f"The timezone is {tz}.")
 
             # call insertVenue
@@ -462,7 +416,7 @@ def leaguework(lid, conn, lr):
         rows = cur.fetchall()
     existingleaguesdict = {row[0]: row[1] for row in rows if row[0] is not None}
     existingleagues = list(existingleaguesdict.values())
-    print(f"All existing leagues: {existingleagues}")
+    logger.debug("All existing leagues: %s", existingleagues)
     databaseid = ""
     if lid in existingleagues:
         print(f"Yes, {lid}")
@@ -514,15 +468,10 @@ def teamwork(tid, conn, headers):
         print(f"API Team ID {tid} is not in your database.")
         # do some fancy stuff to put team in database
         path = f"/teams?id={tid}"
-        apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-        apiconn.request("GET", path, headers=headers)
-        res = apiconn.getresponse()
-        raw = res.read()
-        payload = json.loads(raw.decode("utf-8"))
+        payload = getclient(headers).getjson(path)
         teaminfo = ""
         for item in payload.get("response", []):
             teaminfo = item.get("team") or {}
-        apiconn.close()
         print(f"API Team ID {tid}: {teaminfo}")
         name = teaminfo.get("name")
         country = teaminfo.get("country")
@@ -620,12 +569,9 @@ fixtureId = int(input("Enter the fixture ID:  "))
 path = f"/fixtures?id={fixtureId}"
 
 # Get api info on fixture, store it as a variable, payload
-apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-apiconn.request("GET", path, headers=headers)
-res = apiconn.getresponse()
-raw = res.read()
-payload = json.loads(raw.decode("utf-8"))
-print(payload)
+apiclient = getclient(headers)
+payload = apiclient.getjson(path)
+logger.debug("%s", payload)
 # Strip out just the fixture info
 fixture = ""
 leagueinfo = ""
@@ -635,8 +581,7 @@ for item in payload.get("response", []):
     teamsinfo = item.get("teams") or {}
     goalsinfo = item.get("goals") or {}
     scoreinfo = item.get("score") or {}
-apiconn.close()
-print(fixture)
+logger.debug("%s", fixture)
 
 # Connect once for lookups and load
 conn = psycopg2.connect(
@@ -652,7 +597,7 @@ with conn.cursor() as cur:
     cur.execute("SELECT apisportsid, id from public.fixture where apisportsid = %s", (fixtureId,))
     existingfixtures = cur.fetchall()
 existingfixturesdict = {existingfixture[0]: existingfixture[1] for existingfixture in existingfixtures if existingfixture[0] is not None}
-print(f"Existing fixtures: {existingfixturesdict}")
+logger.debug("Existing fixtures: %s", existingfixturesdict)
 if fixtureId in existingfixturesdict:
     print(f"Fixture {fixtureId} is already in the database.")
     print(f"Fixture id is {existingfixturesdict[fixtureId]}.")
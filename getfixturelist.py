@@ -1,9 +1,12 @@
 import json
-import http.client
+import logging
 import sys
 import psycopg2
-from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
+import psycopg2.extras
+from apiclient import getclient
+from tzconvert import ATLANTATIMEZONE, walltimes
+
+logger = logging.getLogger(__name__)
 
 def loadheaders(headersPath="headers.json"):
     with open(headersPath, "r", encoding="utf-8") as f:
@@ -22,146 +25,101 @@ def loaddbconfig(configPath="dbconfig.json"):
     }
 
 
-def _parse_api_utc(s: str) -> datetime:
-    s = s.strip()
-    if s.endswith("Z"):
-        s = s[:-1] + "+00:00"
-    dt = datetime.fromisoformat(s)
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt
+ATLUTDTEAMID = 1608
 
+# Fixture statuses that mean the match was played and has full data to ingest
+PLAYEDSTATUSES = {"FT", "AET", "PEN"}
 
-def to_tz_from_utc(utc_dt):
-    """
-    Convert a UTC datetime (str or datetime) to the given IANA timezone.
 
-    - utc_dt can be:
-      - ISO 8601 string (e.g., "2025-09-27T14:30:00Z" or "2025-09-27T14:30:00+00:00")
-      - naive datetime assumed to be UTC
-      - aware datetime (will be converted from its timezone to target)
+def getseasonfixtures(apiclient, team, season):
+    """
+    Fetch a team's fixture list for one season with a single api call.
 
-    Returns an aware datetime in the target timezone. If the requested timezone
-    cannot be loaded on this system, falls back to the local timezone.
+    Returns a list of (api fixture id, utc date string, status short) tuples.
     """
-    target_tz = "America/New_York"
-    if isinstance(utc_dt, str):
-        s = utc_dt.strip()
-        if not s:
-            raise ValueError("utc_dt string is empty")
-        if s.endswith("Z"):
-            s = s[:-1] + "+00:00"
-        try:
-            dt = datetime.fromisoformat(s)
-        except Exception as e:
-            raise ValueError(f"Unable to parse datetime string: {utc_dt!r}") from e
-    elif isinstance(utc_dt, datetime):
-        dt = utc_dt
-    else:
-        raise TypeError("utc_dt must be a str or datetime")
-
-    # If naive, assume UTC
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-        print(f"naive testing, dt is {dt}")
-
-
-    # Convert string timezone to ZoneInfo object
-    try:
-        tz = ZoneInfo(target_tz)
-    except Exception:
-        # Fallback to local timezone if ZoneInfo fails
-        return dt.astimezone()
-
-    return dt.astimezone(tz)
-
-
-## Initializing
-# Load headers from json file for use in api requests
-print("Loading headers...")
-headers = loadheaders("headers.json")
-print("...headers loaded.")
-print("")
-
-# Load DB config from json file for use in connecting to database
-print("Loading DB config...")
-db = loaddbconfig("dbconfig.json")
-print("...DB config loaded.")
-print("")
-
-# Get what season you want the fixture list for
-print("Getting the season...")
-#season = int(input("Enter the season:  "))
-season = 2025
-print(f"...season is {season}.")
-print("Storing the path to the api in a path variable...")
-path = f"/fixtures?team=1608&season={season}"
-print("...path stored.")
-print("")
-
-# Get api info on fixture, store it as a variable, payload
-print("Making the request to the api...")
-apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-apiconn.request("GET", path, headers=headers)
-res = apiconn.getresponse()
-raw = res.read()
-payload = json.loads(raw.decode("utf-8"))
-print(payload)
-print("...done, and raw payload data stored.")
-print("")
-
-## Connect once to postgres for lookups and load
-print("Establishing connection to the database...")
-conn = psycopg2.connect(
-    host=db["host"],
-    port=db["port"],
-    dbname=db["dbname"],
-    user=db["user"],
-    password=db["password"],
-)
-print("...connection established.")
-print("")
-
-## Get the response into a list of dictionaries and comparing length to results
-# Get the number of results the api tells us there are
-results = payload.get("results")
-print(f"The API tells us there are {results} results.")
-print("Getting the response into a list of dictionaries...")
-response = payload.get("response") or {}
-print("Making sure the number of results matches the number of responses...")
-if len(response) != results:
-    print("Something is wrong, the number of responses doesn't match the number of results the API tells us there are.")
-    sys.exit(0)
-print(f"There are {len(response)} responses in the payload, everything is good.")
-print(response)
-
-## Loop through each fixture and get api fixutre id and the date
-print("Looping through each fixture and getting the fixture id and the date...")
-count = 0
-for fixture in response:
-    count += 1
-    print(f"Fixture {count}:")
-    print(fixture)
-
-    # Getting fixture info
-    fixtureinfo = fixture.get("fixture") or {}
-    apifixtureid = fixtureinfo.get("id")
-    print(f"The api fixture id is {apifixtureid}.")
-
-    fixturedateaware = fixtureinfo.get("date")
-    print(f"The fixture date is {fixturedateaware} utc time.")
-    atlantatimeaware = to_tz_from_utc(fixturedateaware)
-    print(f"The fixture date is {atlantatimeaware} atlanta time.")
-    # For timestamp (without time zone) columns, use naive "wall times"
-    fixturedate = atlantatimeaware.replace(tzinfo=None)
-    print(f"The fixture date is {fixturedate} atlanta time.")
-
-    # Insert fixture into table
+    path = f"/fixtures?team={team}&season={season}"
+    logger.debug("Making the request to the api for %s...", path)
+    payload = apiclient.getjson(path)
+
+    ## Get the response into a list of dictionaries and comparing length to results
+    results = payload.get("results")
+    logger.debug("The API tells us there are %s results.", results)
+    response = payload.get("response") or {}
+    if len(response) != results:
+        logger.error("Something is wrong, the number of responses doesn't match the number of results the API tells us there are.")
+        sys.exit(0)
+
+    fixtures = []
+    for fixture in response:
+        fixtureinfo = fixture.get("fixture") or {}
+        status = (fixtureinfo.get("status") or {}).get("short")
+        fixtures.append((fixtureinfo.get("id"), fixtureinfo.get("date"), status))
+    logger.info("...%s fixtures in season %s.", len(fixtures), season)
+    return fixtures
+
+
+def storefixturelist(conn, fixtures):
+    """Insert the fixtures not already in public.apifixturelist in one transaction; returns how many were new."""
+    # For timestamp (without time zone) columns, use naive Atlanta "wall times", converted in one batch
+    converted = walltimes([fixturedate for _, fixturedate, _ in fixtures], ATLANTATIMEZONE)
+    rows = [(apifixtureid, atlantatime) for (apifixtureid, _, _), (_, _, atlantatime) in zip(fixtures, converted)]
+
     with conn:
         with conn.cursor() as cur:
-            cur.execute(
-                "INSERT INTO public.apifixturelist (apifixtureid, atlantatime) VALUES (%s, %s)",
-                (apifixtureid, fixturedate),
+            # execute_values sends one statement per page, so cur.rowcount would only
+            # cover the last page; the RETURNING rows of every page are collected instead
+            inserted = psycopg2.extras.execute_values(
+                cur,
+                """
+                INSERT INTO public.apifixturelist (apifixtureid, atlantatime)
+                SELECT v.apifixtureid, v.atlantatime
+                FROM (VALUES %s) AS v (apifixtureid, atlantatime)
+                WHERE NOT EXISTS (SELECT 1 FROM public.apifixturelist a WHERE a.apifixtureid = v.apifixtureid)
+                RETURNING apifixtureid
+                """,
+                rows,
+                template="(%s, %s::timestamp)",
+                fetch=True,
             )
-            print(f"Fixture has been inserted into the database.")
-            print("")
\ No newline at end of file
+    logger.info("%s fixtures have been inserted into the database.", len(inserted))
+    return len(inserted)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    ## Initializing
+    # Load headers from json file for use in api requests
+    logger.debug("Loading headers...")
+    headers = loadheaders("headers.json")
+    logger.debug("...headers loaded.")
+
+    # Load DB config from json file for use in connecting to database
+    logger.debug("Loading DB config...")
+    db = loaddbconfig("dbconfig.json")
+    logger.debug("...DB config loaded.")
+
+    # Get what season you want the fixture list for
+    logger.debug("Getting the season...")
+    #season = int(input("Enter the season:  "))
+    season = 2025
+    logger.debug("...season is %s.", season)
+
+    apiclient = getclient(headers)
+    fixtures = getseasonfixtures(apiclient, ATLUTDTEAMID, season)
+
+    ## Connect once to postgres for lookups and load
+    logger.debug("Establishing connection to the database...")
+    conn = psycopg2.connect(
+        host=db["host"],
+        port=db["port"],
+        dbname=db["dbname"],
+        user=db["user"],
+        password=db["password"],
+    )
+    logger.debug("...connection established.")
+
+    storefixturelist(conn, fixtures)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+# Stages of ingestfixture(), in the order they run
+STAGES = ("players", "fixture", "events", "statistics", "playerstatistics", "lineups")
+
+# Counters kept per (fixture, stage). Times are in seconds.
+COUNTERS = (
+    "wall",         # wall-clock time spent in the stage on the writer thread
+    "apicalls",     # requests that went to the network
+    "apibytes",     # response bytes downloaded
+    "apitime",      # time spent in those requests (may overlap with other stages when prefetched)
+    "cachehits",    # requests answered from the response cache
+    "statements",   # SQL statements executed
+    "commits",      # transactions committed
+    "geocodes",     # geocoder / timezone lookups
+    "geocodetime",  # time spent in them
+)
+
+
+def _emptybucket():
+    return dict.fromkeys(COUNTERS, 0)
+
+
+class IngestStats:
+    """
+    Per-fixture, per-stage counters for an ingest run.
+
+    Work is attributed to the stage currently open on the writer thread
+    (see stage()), unless the calling thread has been pinned to a fixture and
+    stage with attribute(), as the prefetch workers are. Anything outside a
+    stage is booked under fixture None, stage "setup".
+    """
+
+    def __init__(self):
+        self.fixtures = {}
+        self.started = time.perf_counter()
+        self._current = (None, "setup")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _add(self, fixture, stage, counter, amount):
+        with self._lock:
+            bucket = self.fixtures.setdefault(fixture, {}).setdefault(stage, _emptybucket())
+            bucket[counter] += amount
+
+    def add(self, counter, amount=1):
+        fixture, stage = getattr(self._local, "where", None) or self._current
+        self._add(fixture, stage, counter, amount)
+
+    @contextmanager
+    def stage(self, fixture, name):
+        """Time a stage of a fixture and attribute untagged work done meanwhile to it."""
+        previous = self._current
+        self._current = (fixture, name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(fixture, name, "wall", time.perf_counter() - start)
+            self._current = previous
+
+    @contextmanager
+    def attribute(self, fixture, name):
+        """Attribute work done on this thread to a fixture and stage without timing it."""
+        previous = getattr(self._local, "where", None)
+        self._local.where = (fixture, name)
+        try:
+            yield
+        finally:
+            self._local.where = previous
+
+    @contextmanager
+    def timer(self, counter):
+        """Add the time spent in the block to a counter."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(counter, time.perf_counter() - start)
+
+    def fixturetotals(self, fixture):
+        totals = _emptybucket()
+        for bucket in self.fixtures.get(fixture, {}).values():
+            for counter, value in bucket.items():
+                totals[counter] += value
+        return totals
+
+    def stagetotals(self):
+        """Counters summed over every fixture, per stage."""
+        totals = {}
+        for stages in self.fixtures.values():
+            for stage, bucket in stages.items():
+                total = totals.setdefault(stage, _emptybucket())
+                for counter, value in bucket.items():
+                    total[counter] += value
+        return totals
+
+    def asdict(self):
+        elapsed = time.perf_counter() - self.started
+        fixtures = [f for f in self.fixtures if f is not None]
+        return {
+            "elapsed": elapsed,
+            "fixtures": len(fixtures),
+            "fixturespersecond": len(fixtures) / elapsed if elapsed else 0.0,
+            "stages": self.stagetotals(),
+            "perfixture": {str(f): stages for f, stages in self.fixtures.items() if f is not None},
+            "setup": self.fixtures.get(None, {}),
+        }
+
+    def fixturesummary(self, fixture):
+        """One line summing up a finished fixture."""
+        t = self.fixturetotals(fixture)
+        return (f"fixture {fixture}: {t['wall']:.2f}s, {t['apicalls']} api calls "
+                f"({t['apibytes'] / 1024:.1f} kB, {t['cachehits']} cached), "
+                f"{t['statements']} statements, {t['commits']} commits")
+
+    def report(self):
+        """Human-readable per-fixture and per-stage report."""
+        data = self.asdict()
+        lines = [f"{data['fixtures']} fixtures in {data['elapsed']:.1f}s "
+                 f"({data['fixturespersecond']:.2f} fixtures/s)"]
+        header = f"{'stage':<18}{'wall s':>10}{'api':>7}{'kB':>10}{'api s':>9}{'cached':>8}" \
+                 f"{'sql':>8}{'commits':>9}{'geo s':>8}"
+        lines.append(header)
+        stages = data["stages"]
+        order = ("setup",) + STAGES
+        for stage in sorted(stages, key=lambda s: order.index(s) if s in order else len(order)):
+            b = stages[stage]
+            lines.append(f"{stage:<18}{b['wall']:>10.2f}{b['apicalls']:>7}{b['apibytes'] / 1024:>10.1f}"
+                         f"{b['apitime']:>9.2f}{b['cachehits']:>8}{b['statements']:>8}{b['commits']:>9}"
+                         f"{b['geocodetime']:>8.2f}")
+        for fixture in self.fixtures:
+            if fixture is not None:
+                lines.append(self.fixturesummary(fixture))
+        return "\n".join(lines)
+
+    def writejson(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.asdict(), f, indent=2)
+
+
+stats = IngestStats()
+
+
+class CountingCursor(psycopg2.extensions.cursor):
+    """Cursor that books every statement it runs in the run's IngestStats."""
+
+    def execute(self, query, vars=None):
+        stats.add("statements")
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        stats.add("statements")
+        return super().executemany(query, vars_list)
+
+
+class CountingConnection(psycopg2.extensions.connection):
+    """
+    Connection that hands out CountingCursors and counts commits.
+
+    Pass as psycopg2.connect(..., connection_factory=CountingConnection).
+    psycopg2 ends a `with conn:` block by calling self.commit(), so commits made
+    that way are counted here too.
+    """
+
+    def cursor(self, *args, **kwargs):
+        kwargs.setdefault("cursor_factory", CountingCursor)
+        return super().cursor(*args, **kwargs)
+
+    def commit(self):
+        stats.add("commits")
+        return super().commit()
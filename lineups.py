@@ -1,8 +1,13 @@
 import json
-import http.client
+import logging
 import sys
 import psycopg2
 import unicodedata
+from apiclient import getclient
+
+# Raw payload and table dumps are logged at DEBUG; raise the level to see them
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 def loadheaders(headersPath="headers.json"):
     with open(headersPath, "r", encoding="utf-8") as f:
@@ -57,7 +62,7 @@ def applycountrycodes(c1, country):
         return sorted(candidates)
 
     candidates = country_lookup_candidates(country)
-    print(f"Looking up candidates: {candidates!r}")
+    logger.debug("Looking up candidates: %r", candidates)
 
     if not candidates:
         return {}
@@ -80,11 +85,8 @@ def coachwork(ac, h, aid, c):
     # Set the api path
     coachespath = f"/coachs?id={aid}"
     print("Making the request to the api...")
-    ac.request("GET", coachespath, headers=h)
-    cres = ac.getresponse()
-    craw = cres.read()
-    cpayload = json.loads(craw.decode("utf-8"))
-    print(f"coach payload: {cpayload}")
+    cpayload = ac.getjson(coachespath)
+    logger.debug("coach payload: %s", cpayload)
 
     ## Get coach info into variables
     # Initialize variables
@@ -107,7 +109,7 @@ def coachwork(ac, h, aid, c):
         cresponse = cresponselist[0]
     else:
         cresponse = {}
-    print(f"coach response:  {cresponse}.")
+    logger.debug("coach response:  %s.", cresponse)
 
     # Get the names
     firstname = cresponse.get("firstname")
@@ -194,12 +196,9 @@ print("")
 
 ## Get api info on fixture, store it as a variable, payload
 print("Making the request to the api...")
-apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-apiconn.request("GET", path, headers=headers)
-res = apiconn.getresponse()
-raw = res.read()
-payload = json.loads(raw.decode("utf-8"))
-print(payload)
+apiclient = getclient(headers)
+payload = apiclient.getjson(path)
+logger.debug("%s", payload)
 print("...done, and raw payload data stored.")
 print("")
 
@@ -242,12 +241,12 @@ print("")
 # Get the response into a list of dictionaries
 print("Getting the response into a list of dictionaries...")
 response = payload.get("response") or {}
-print(response)
+logger.debug("%s", response)
 if len(response) != 2:
     print("Something is wrong, the number of responses is not 2.")
     sys.exit(0)
 else:
-    print(f"There are {len(response)} responses, and there should be 2.")
+    logger.debug("There are %s responses, and there should be 2.", len(response))
     print("")
 
 print("---------------------------")
@@ -260,7 +259,7 @@ count = 0
 for event in response:
     count += 1
     print(f"Loop {count}:")
-    print(f"This loop's information:  {event}.")
+    logger.debug("This loop's information:  %s.", event)
     print("")
 
     ## Get the database team id
@@ -304,7 +303,7 @@ for event in response:
     else:
         print(f"API Coach ID {apicoachid} is not in your database.")
         print("Adding coach to database...")
-        coachid = coachwork(apiconn, headers, apicoachid, conn)
+        coachid = coachwork(apiclient, headers, apicoachid, conn)
         print(f"The coach id is {coachid}.")
         print("")
 
@@ -356,7 +355,7 @@ for event in response:
     count1 = 0
     for starter in starters:
         count1 += 1
-        print(f"This starter is {starter}.")
+        logger.debug("This starter is %s.", starter)
         player = starter.get("player") or {}
         apiplayerid = player.get("id")
         print(f"The api player id is {apiplayerid}.")
@@ -423,7 +422,7 @@ for event in response:
     count2 = 0
     for substitute in substitutes:
         count2 += 1
-        print(f"This substitute is {substitute}.")
+        logger.debug("This substitute is %s.", substitute)
         player = substitute.get("player") or {}
         apiplayerid = player.get("id")
         print(f"The api player id is {apiplayerid}.")
@@ -1,45 +1,88 @@
+import argparse
 import http.client
+import itertools
 import json
+import logging
 import sys
 import psycopg2
-import unicodedata
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError, GeocoderUnavailable
-from timezonefinderL import TimezoneFinder
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
-from datetime import datetime, timezone, date
-from typing import Optional
-
-
-# Minimal alias mapping for common names and Windows zones to IANA
-_TZ_ALIAS_MAP = {
-    # Canonical pass-through
-    "america/new_york": "America/New_York",
-    # US aliases
-    "us/eastern": "America/New_York",
-    "us/central": "America/Chicago",
-    "us/mountain": "America/Denver",
-    "us/pacific": "America/Los_Angeles",
-    # Abbreviations (ambiguous; pick common US mappings)
-    "est": "America/New_York",
-    "edt": "America/New_York",
-    "cst": "America/Chicago",
-    "cdt": "America/Chicago",
-    "mst": "America/Denver",
-    "mdt": "America/Denver",
-    "pst": "America/Los_Angeles",
-    "pdt": "America/Los_Angeles",
-    # Common Windows display names -> IANA
-    "(utc-05:00) eastern time (us & canada)": "America/New_York",
-    "(utc-06:00) central time (us & canada)": "America/Chicago",
-    "(utc-07:00) mountain time (us & canada)": "America/Denver",
-    "(utc-08:00) pacific time (us & canada)": "America/Los_Angeles",
-    "eastern standard time": "America/New_York",
-    "central standard time": "America/Chicago",
-    "mountain standard time": "America/Denver",
-    "pacific standard time": "America/Los_Angeles",
-}
+import psycopg2.extras
+from datetime import date
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from apiclient import getclient
+from ratelimiter import DailyQuotaExhausted, RateLimiter
+from apicache import ResponseCache
+from dimensioncache import dimensions
+from countryresolver import countries
+from venuegeo import venuegeo
+from tzconvert import walltimes
+from ingeststats import CountingConnection, stats
+from getfixturelist import ATLUTDTEAMID, PLAYEDSTATUSES, getseasonfixtures
+
+logger = logging.getLogger(__name__)
+
+# With HEADLESS set, nothing prompts on stdin: unresolved venues and leagues park
+# the fixture and unresolved players park the row, in public.pendingresolution
+# (sql/pendingresolution.sql), for resolvepending.py to finish later.
+HEADLESS = False
+
+
+class PendingResolution(Exception):
+    """A fixture needs a human to resolve an entity before it can be ingested."""
+
+    def __init__(self, kind, apikey, detail=None):
+        super().__init__(f"unresolved {kind} {apikey!r}" + (f" ({detail})" if detail else ""))
+        self.kind = kind
+        self.apikey = apikey
+        self.detail = detail
+
+
+def setheadless(enabled):
+    """Switch between prompting for unresolved entities and parking them."""
+    global HEADLESS
+    HEADLESS = enabled
+
+
+def parkpending(conn, apifixtureid, stage, kind, apikey, rowkey="", payload=None, detail=None):
+    """Queue an unresolved entity in public.pendingresolution; parking the same item twice is a no-op."""
+    with conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO public.pendingresolution (apifixtureid, stage, kind, apikey, rowkey, payload, detail)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (apifixtureid, stage, kind, apikey, rowkey) DO NOTHING
+            """, (apifixtureid, stage, kind, str(apikey), rowkey,
+                  psycopg2.extras.Json(payload) if payload is not None else None, detail))
+    logger.warning("Parked %s %s for fixture %s (%s).", kind, apikey, apifixtureid, stage)
+
+
+_haspendingtable = None
+
+
+def resolvewritten(conn, apifixtureid, stage, parkedrowkeys=()):
+    """
+    Mark a fixture stage's pending items resolved once a normal run has written that stage.
+
+    The stage is written from the full payload, so every parked row is now in the
+    database except the ones parked again on this run (parkedrowkeys). Leaving the
+    rest pending would have resolvepending.py insert them a second time.
+    """
+    global _haspendingtable
+    if _haspendingtable is None:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('public.pendingresolution') IS NOT NULL")
+            _haspendingtable = cur.fetchone()[0]
+    if not _haspendingtable:
+        return
+    with conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                UPDATE public.pendingresolution SET status = 'resolved', resolved_at = now()
+                WHERE apifixtureid = %s AND stage = %s AND status = 'pending' AND NOT (rowkey = ANY(%s))
+            """, (apifixtureid, stage, list(parkedrowkeys)))
+            if cur.rowcount:
+                logger.info("Resolved %s parked %s items for fixture %s; the stage has been written.",
+                            cur.rowcount, stage, apifixtureid)
 
 
 def splitfullname(fullname: str) -> tuple[str | None, str | None]:
@@ -113,14 +156,14 @@ def insertref(first, last, code, c):
         with c.cursor() as cur:
             cur.execute(sql, params)
             newid = cur.fetchone()[0]
-            print(f"Ref inserted with id {newid}.")
+            logger.info("Ref inserted with id %s.", newid)
     return newid
 
 
 def refereework(f, conn):
     # Get the raw referee info
     refereeraw = f.get("referee")
-    print(f"Referee raw info:  {refereeraw}")
+    logger.debug("Referee raw info:  %s", refereeraw)
     # If there is no information for referee in api, setting variables for None
     referee = None
     refereecountry = None
@@ -130,13 +173,9 @@ def refereework(f, conn):
         parts = [p.strip() for p in refereeraw.split(",")]
         referee = parts[0] if len(parts) > 0 and parts[0] else None
         refereecountry = parts[1] if len(parts) > 1 and parts[1] else None
-        print(f"Referee: {referee}, Country: {refereecountry}")
+        logger.debug("Referee: %s, Country: %s", referee, refereecountry)
         # See if referee is in db
-        with conn.cursor() as cur:
-            cur.execute("SELECT concat_ws(' ', left(firstname, 1), lastname) as fullname, id FROM public.referee")
-            rows = cur.fetchall()
-        existingreferees = {row[0]: row[1] for row in rows if row[0] is not None}
-        print(existingreferees)
+        existingreferees = dimensions(conn).table("referee")
 
         # Normalize referee name by removing period after initial for comparison
         referee_normalized = referee.replace('.', '') if referee else None
@@ -144,26 +183,27 @@ def refereework(f, conn):
         # If referee is in db, get referee id
         if referee_normalized in existingreferees:
             refid = existingreferees[referee_normalized]
-            print(f"Referee {referee} is already in the database, referee id: {refid}")
+            logger.debug("Referee %s is already in the database, referee id: %s", referee, refid)
         else:
             ##if referee is not in db, add referee to db
-            print(f"Referee {referee} is not in the database, adding referee to db.")
+            logger.debug("Referee %s is not in the database, adding referee to db.", referee)
             ##split full name into two
             firstname, lastname = splitfullname(referee)
-            print(f"Firstname: {firstname} Lastname: {lastname}")
+            logger.debug("Firstname: %s Lastname: %s", firstname, lastname)
             refereecountrycodemap = applycountrycodes(conn, refereecountry)
-            print(refereecountrycodemap)
+            logger.debug("%s", refereecountrycodemap)
             refereecountrycode = None
             if refereecountrycodemap:
                 refereecountrycode = next(iter(refereecountrycodemap.values()))
-                print(f"Referee Country Code: {refereecountrycode}")
+                logger.debug("Referee Country Code: %s", refereecountrycode)
             refid = insertref(firstname, lastname, refereecountrycode, conn)
+            dimensions(conn).add("referee", referee_normalized, refid)
         ##switch out country w/ countrycode
 
     else:
-        print("No referee information, referee will be \'None\'.")
+        logger.debug("No referee information, referee will be 'None'.")
 
-    print(f"refid = {refid}.")
+    logger.debug("refid = %s.", refid)
     return refid
 
 
@@ -207,18 +247,39 @@ def insertvenue(apiid, name, address, city, state, countrycode, capacity, surfac
         with c.cursor() as cur:
             cur.execute(sql, params)
             newid = cur.fetchone()[0]
-            print(f"Venue inserted with id {newid}.")
+            logger.info("Venue inserted with id %s.", newid)
 
     return newid
 
 
+def venuelocation(address):
+    """
+    Latitude, longitude and timezone of a new venue's address.
+
+    Lookups go through the shared venuegeo() service and its on-disk cache. If
+    the address can't be geocoded, the timezone is asked for instead.
+    """
+    lat, lon, tz = venuegeo().locate(address)
+    if lat is not None:
+        logger.debug("Latitude: %s, Longitude: %s", lat, lon)
+        logger.debug("The timezone is %s.", tz)
+    else:
+        logger.warning("Address not found.")
+        logger.warning("Cannot determine timezone without valid coordinates.")
+        tz = input(f"Please enter the timezone manually (e.g., 'America/New_York'): ")
+        if not tz or not tz.strip():
+            tz = None
+            logger.debug("No timezone provided, setting to None.")
+    return lat, lon, tz
+
+
 def venuework(f, conn): # f is fixture
     #Get venue api id
     venueraw = f.get("venue")
-    print(f"Venue: {venueraw}")
+    logger.debug("Venue: %s", venueraw)
     # single out the venue name
     venuename = venueraw['name']
-    print(f"Venue name: {venuename}")
+    logger.debug("Venue name: %s", venuename)
     # some initializing
     apiid = None
     address = ""
@@ -229,25 +290,20 @@ def venuework(f, conn): # f is fixture
     surface = ""
     tz = ""
     if venueraw['id'] is None: # most venues in apifootball don't have an api id, at least for the first few matches
-        print("Venue is None.")
+        logger.debug("Venue is None.")
         # Check to see if Venue already exists anyway
-        with conn.cursor() as cur: # creating a list (or dictionary?  tuple?) of all venues where api id is none
-            cur.execute("SELECT name, id from public.venue")
-            rows = cur.fetchall()
-        # getting just the names of the venues into a dictionary
-        existingnonevenues = {row[0]: row[1] for row in rows if row[0] is not None}
-        print(f"All existing venues:  {existingnonevenues}")
+        existingnonevenues = dimensions(conn).table("venue")  # venue name -> (id, timezone)
         if venuename in existingnonevenues: # running through the list to see if venue name is in the list
-            print(f"Venue {venuename} is already in the database, no need to proceed.")
-            print(f"Venue id: {existingnonevenues[venuename]}")
-            with conn.cursor() as cur: # getting the timezone of the already existing venue
-                cur.execute("SELECT timezone FROM public.venue WHERE id = %s", (existingnonevenues[venuename],))
-                tz = cur.fetchone()[0]
-            return existingnonevenues[venuename], tz # if it is, we're done, return the id
+            logger.debug("Venue %s is already in the database, no need to proceed.", venuename)
+            existingvenueid, tz = existingnonevenues[venuename]
+            logger.debug("Venue id: %s", existingvenueid)
+            return existingvenueid, tz # if it is, we're done, return the id
         elif venuename == 'Mercedes-Benz Stadium (Atlanta, Georgia)':
             return 4, "America/New_York"
         else:  # else we have some work to do
-            print("not in db, going to add it in")
+            logger.debug("not in db, going to add it in")
+            if HEADLESS:
+                raise PendingResolution("venue", venuename, "venue without an api id is not in the database")
             # solicit information
             yesno = input("Is this venue an already existing venue that has been renamed? (y/n): ")
             if yesno == "y":
@@ -256,6 +312,7 @@ def venuework(f, conn): # f is fixture
                 with conn.cursor() as cur:
                     cur.execute("SELECT timezone FROM public.venue WHERE id = %s", (changedvenueid,))
                     tz = cur.fetchone()[0]
+                dimensions(conn).add("venue", venuename, (changedvenueid, tz))
                 return changedvenueid, tz
             address = input(f"Enter the street address for {venuename}: ")
             city = input(f"Enter the city for {venuename}: ")
@@ -264,99 +321,36 @@ def venuework(f, conn): # f is fixture
             capacity = input(f"Enter the capacity for {venuename}: ")
             surface = input(f"Enter the surface for {venuename}: ")
 
-            # create a function that finds and inserts lat and long based on address
-            def geocode_address(a: str) -> Optional[tuple[float, float]]:
-                """
-                Returns (latitude, longitude) in decimal degrees for the given address,
-                or None if not found or on transient network errors.
-                """
-                address = (a or "").strip()
-                if not address:
-                    return None
-
-                # Configure a descriptive user agent and a sensible timeout per request
-                geolocator = Nominatim(user_agent="atlutdhistory-app/1.0 (contact: youremail@example.com)", timeout=10)
-
-                # RateLimiter helps respect Nominatim usage policy; add retries and error swallowing
-                geocode = RateLimiter(
-                    geolocator.geocode,
-                    min_delay_seconds=1.0,
-                    max_retries=3,  # retry transient failures
-                    error_wait_seconds=2.0,  # wait between retries on errors
-                    swallow_exceptions=False,  # propagate so we can handle specific cases below
-                )
-
-                try:
-                    # exactly_one True returns a single Location or None
-                    location = geocode(address, exactly_one=True, addressdetails=False)
-                except (GeocoderTimedOut, GeocoderUnavailable) as e:
-                    # Network/service transient issue: return None gracefully
-                    return None
-                except GeocoderServiceError:
-                    # Other geopy service errors (e.g., bad response)
-                    return None
-                except Exception:
-                    # Any unexpected error: fail gracefully
-                    return None
-
-                if location is None:
-                    return None
-                return location.latitude, location.longitude
-
-
-            geocodeaddr = f"{address}, {city}, {state}"
-            coords = geocode_address(geocodeaddr)
-            if coords:
-                lat, lon = coords
-                print(f"Latitude: {lat}, Longitude: {lon}")
-            else:
-                lat = None
-                lon = None
-                print("Address not found.")
-
-            # create a function that finds and inserts timezone based on lat/long
-            # FIXED: Only attempt timezone lookup if we have valid coordinates
-            if lat is not None and lon is not None:
-                tf = TimezoneFinder()
-                tz = tf.timezone_at(lng=lon, lat=lat)
-                print(f"The timezone is {tz}.")
-            else:
-                print("Cannot determine timezone without valid coordinates.")
-                tz = input(f"Please enter the timezone manually (e.g., 'America/New_York'): ")
-                if not tz or not tz.strip():
-                    tz = None
-                    print("No timezone provided, setting to None.")
+            lat, lon, tz = venuelocation(f"{address}, {city}, {state}")
 
             # call insertvenue
             thevenueid = insertvenue(apiid, venuename, address, city, state, countrycode, capacity, surface, lat, lon,
                                      tz, conn)
+            dimensions(conn).add("venue", venuename, (thevenueid, tz))
             return thevenueid, tz
     else:
-        print("Venue has an id in the api!!")
+        logger.debug("Venue has an id in the api!!")
 
         # Check to see if the venuid is already in the database
-        with conn.cursor() as cur:
-            cur.execute("select id, apifootballid from public.venue where apifootballid is not null")
-            rows = cur.fetchall()
-        existingapivenues = {row[1]: row[0] for row in rows if row[1] is not None}
-        print(f"All existing apivenues: {existingapivenues}")
+        existingapivenues = dimensions(conn).table("apivenue")  # api venue id -> (id, timezone)
         if venueraw['id'] in existingapivenues:
-            print(f"Venue {venueraw['id']} is already in the database, no need to proceed.")
-            print(f"Venue databaseid = {existingapivenues[venueraw['id']]}.")
-            with conn.cursor() as cur:
-                cur.execute("SELECT timezone FROM public.venue WHERE id = %s", (existingapivenues[venueraw['id']],))
-                tz = cur.fetchone()[0]
-            return existingapivenues[venueraw['id']], tz
+            logger.debug("Venue %s is already in the database, no need to proceed.", venueraw['id'])
+            existingvenueid, tz = existingapivenues[venueraw['id']]
+            logger.debug("Venue databaseid = %s.", existingvenueid)
+            return existingvenueid, tz
         else:
+            if HEADLESS:
+                raise PendingResolution("venue", venueraw['id'], venuename)
             yesno = input(f"Is this a venue already in the database without an api id? (y/n): ")
             if yesno == 'y':
                 thevenueid = int(input("Enter the database id of the venue: "))
                 with conn.cursor() as cur:
                     cur.execute("SELECT timezone FROM public.venue WHERE id = %s", (thevenueid,))
                     tz = cur.fetchone()[0]
+                dimensions(conn).add("apivenue", venueraw['id'], (thevenueid, tz))
                 return thevenueid, tz
             else:
-                print("We must create a new venue.")
+                logger.debug("We must create a new venue.")
                 apiid = int(input("Enter the api id for the venue: "))
                 venuename = input("Enter the venue name: ")
                 address = input("Enter the street address: ")
@@ -366,155 +360,18 @@ def venuework(f, conn): # f is fixture
                 capacity = input("Enter the capacity: ")
                 surface = input("Enter the surface: ")
 
-                # create a function that finds and inserts lat and long based on address
-                def geocode_address(a: str) -> Optional[tuple[float, float]]:
-                    """
-                    Returns (latitude, longitude) in decimal degrees for the given address,
-                    or None if not found or on transient network errors.
-                    """
-                    address = (a or "").strip()
-                    if not address:
-                        return None
-
-                    # Configure a descriptive user agent and a sensible timeout per request
-                    geolocator = Nominatim(user_agent="atlutdhistory-app/1.0 (contact: youremail@example.com)",
-                                           timeout=10)
-
-                    # RateLimiter helps respect Nominatim usage policy; add retries and error swallowing
-                    geocode = RateLimiter(
-                        geolocator.geocode,
-                        min_delay_seconds=1.0,
-                        max_retries=3,  # retry transient failures
-                        error_wait_seconds=2.0,  # wait between retries on errors
-                        swallow_exceptions=False,  # propagate so we can handle specific cases below
-                    )
-
-                    try:
-                        # exactly_one True returns a single Location or None
-                        location = geocode(address, exactly_one=True, addressdetails=False)
-                    except (GeocoderTimedOut, GeocoderUnavailable) as e:
-                        # Network/service transient issue: return None gracefully
-                        return None
-                    except GeocoderServiceError:
-                        # Other geopy service errors (e.g., bad response)
-                        return None
-                    except Exception:
-                        # Any unexpected error: fail gracefully
-                        return None
-
-                    if location is None:
-                        return None
-                    return location.latitude, location.longitude
-
-                geocodeaddr = f"{address}, {city}, {state}"
-                coords = geocode_address(geocodeaddr)
-                if coords:
-                    lat, lon = coords
-                    print(f"Latitude: {lat}, Longitude: {lon}")
-                else:
-                    lat = None
-                    lon = None
-                    print("Address not found.")
-
-                # create a function that finds and inserts timezone based on lat/long
-                # FIXED: Only attempt timezone lookup if we have valid coordinates
-                if lat is not None and lon is not None:
-                    tf = TimezoneFinder()
-                    tz = tf.timezone_at(lng=lon, lat=lat)
-                    print(f"The timezone is {tz}.")
-                else:
-                    print("Cannot determine timezone without valid coordinates.")
-                    tz = input(f"Please enter the timezone manually (e.g., 'America/New_York'): ")
-                    if not tz or not tz.strip():
-                        tz = None
-                        print("No timezone provided, setting to None.")
+                lat, lon, tz = venuelocation(f"{address}, {city}, {state}")
 
                 thevenueid = insertvenue(apiid, venuename, address, city, state, countrycode, capacity, surface, lat,
                                          lon,
                                          tz, conn)
+                dimensions(conn).add("apivenue", apiid, (thevenueid, tz))
+                dimensions(conn).add("venue", venuename, (thevenueid, tz))
+                if apiid != venueraw['id']:
+                    dimensions(conn).add("apivenue", venueraw['id'], (thevenueid, tz))
                 return thevenueid, tz
 
 
-def _normalize_tz_key(key: str | None) -> str | None:
-    if not key or not str(key).strip():
-        return None
-    s = str(key).strip()
-    # If it's already an IANA-like path with slash, leave case as-is for ZoneInfo
-    if "/" in s:
-        return s
-    # Otherwise normalize for alias lookup
-    return " ".join(s.lower().split())
-
-
-def _alias_to_iana(key: str) -> str:
-    norm = _normalize_tz_key(key)
-    if not norm:
-        return key
-    # If looks like IANA (contains '/'), return as-is
-    if "/" in key:
-        return key
-    return _TZ_ALIAS_MAP.get(norm, key)
-
-
-def _safe_zoneinfo(key: str) -> ZoneInfo | None:
-    iana = _alias_to_iana(key)
-    print(f"in the second function, iana is {iana}")
-    # Validate that iana is not empty or None before creating ZoneInfo
-    if not iana or not iana.strip():
-        print("Invalid timezone: empty or None, returning None")
-        return None
-    try:
-        return ZoneInfo(iana)
-    except ZoneInfoNotFoundError:
-        print("zoneinfonotfounderror")
-        return None
-
-
-def to_tz_from_utc(utc_dt, target_tz: str) -> datetime:
-    """
-    Convert a UTC datetime (str or datetime) to the given IANA timezone.
-
-    - utc_dt can be:
-      - ISO 8601 string (e.g., "2025-09-27T14:30:00Z" or "2025-09-27T14:30:00+00:00")
-      - naive datetime assumed to be UTC
-      - aware datetime (will be converted from its timezone to target)
-
-    Returns an aware datetime in the target timezone. If the requested timezone
-    cannot be loaded on this system, falls back to the local timezone.
-    """
-    print(f"function testing, look here, utc_dt is {utc_dt}")
-    print(f"function testing, look here, target_tz is {target_tz}")
-    if isinstance(utc_dt, str):
-        s = utc_dt.strip()
-        print(f"loop testing, look here, s is {s}")
-        if not s:
-            raise ValueError("utc_dt string is empty")
-        if s.endswith("Z"):
-            s = s[:-1] + "+00:00"
-            print("z thingy")
-        try:
-            dt = datetime.fromisoformat(s)
-            print(f"loop, try testing, dt is {dt}")
-        except Exception as e:
-            raise ValueError(f"Unable to parse datetime string: {utc_dt!r}") from e
-    elif isinstance(utc_dt, datetime):
-        dt = utc_dt
-    else:
-        raise TypeError("utc_dt must be a str or datetime")
-
-    # If naive, assume UTC
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-        print(f"naive testing, dt is {dt}")
-
-    tz = _safe_zoneinfo(target_tz)
-    print(f"tz testing, after save zone thingy, tz is {tz}")
-    if tz is None:
-        # Graceful fallback: system local timezone
-        return dt.astimezone()  # converts to local time
-    return dt.astimezone(tz)
-
-
 def key_for_value(d, value):
     for k, v in d.items():
         if v == value:
@@ -523,16 +380,11 @@ def key_for_value(d, value):
 
 
 def leaguework(lid, conn, lr):
-    with conn.cursor() as cur:
-        cur.execute("SELECT id, apifootballid from public.league")
-        rows = cur.fetchall()
-    existingleaguesdict = {row[0]: row[1] for row in rows if row[0] is not None}
-    existingleagues = list(existingleaguesdict.values())
-    print(f"All existing leagues: {existingleagues}")
+    existingleagues = dimensions(conn).table("league")  # api league id -> id
     databaseid = None
     if lid in existingleagues:
-        print(f"Yes, {lid}")
-        databaseid = key_for_value(existingleaguesdict, lid)
+        logger.debug("Yes, %s", lid)
+        databaseid = existingleagues[lid]
         if lid == 253 and lr == 'Play-In Round - Finals':
             databaseid = 3
         if lid == 253 and lr == 'MLS Cup - Conference Semi-finals':
@@ -546,9 +398,12 @@ def leaguework(lid, conn, lr):
         if lid == 253 and lr == 'MLS Cup - Round 1':
             databaseid = 3
     else:
-        print(f"API League ID {lid} is not in your database.")
-        print("Please insert it and then give me the number.")
+        logger.warning("API League ID %s is not in your database.", lid)
+        if HEADLESS:
+            raise PendingResolution("league", lid, lr)
+        logger.warning("Please insert it and then give me the number.")
         databaseid = int(input("Enter the league ID:  "))
+        dimensions(conn).add("league", lid, databaseid)
     return databaseid
 
 
@@ -577,43 +432,33 @@ def insertteam(aid, name, code, fdate, c):
         with c.cursor() as cur:
             cur.execute(sql, params)
             newid = cur.fetchone()[0]
-            print(f"Team inserted with id {newid}.")
+            logger.info("Team inserted with id %s.", newid)
     return newid
 
 
 def teamwork(tid, conn, headers):
-    with conn.cursor() as cur:
-        cur.execute("SELECT id, apifootballid from public.team")
-        rows = cur.fetchall()
-    existingteamsdict = {row[0]: row[1] for row in rows if row[0] is not None}
-    existingteams = list(existingteamsdict.values())
-    #print(f"All existing teams: {existingteams}")
+    existingteams = dimensions(conn).resolvemany("team", [tid])  # api team id -> id
     databaseid = ""
     if tid in existingteams:
-        print("Team already exists in database.")
-        databaseid = key_for_value(existingteamsdict, tid)
+        logger.debug("Team already exists in database.")
+        databaseid = existingteams[tid]
     else:
-        print(f"API Team ID {tid} is not in your database.")
+        logger.debug("API Team ID %s is not in your database.", tid)
         # do some fancy stuff to put team in database
         path = f"/teams?id={tid}"
-        apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-        apiconn.request("GET", path, headers=headers)
-        res = apiconn.getresponse()
-        raw = res.read()
-        payload = json.loads(raw.decode("utf-8"))
+        payload = getclient(headers).getjson(path)
         teaminfo = ""
         for item in payload.get("response", []):
             teaminfo = item.get("team") or {}
-        apiconn.close()
-        print(f"API Team ID {tid}: {teaminfo}")
+        logger.debug("API Team ID %s: %s", tid, teaminfo)
         name = teaminfo.get("name")
         country = teaminfo.get("country")
         teamcountrycodemap = applycountrycodes(conn, country)
         teamcountrycode = None
         if teamcountrycodemap:
             teamcountrycode = next(iter(teamcountrycodemap.values()))
-        print(f"Team name: {name}")
-        print(f"Team countrycode: {teamcountrycode}")
+        logger.debug("Team name: %s", name)
+        logger.debug("Team countrycode: %s", teamcountrycode)
         teamfounded = str(teaminfo.get("founded"))
         # Normalize founded year
         def coerce_founded_to_date(value):
@@ -627,62 +472,53 @@ def teamwork(tid, conn, headers):
             return None
         foundeddate = coerce_founded_to_date(teamfounded)
         databaseid = insertteam(tid, name, teamcountrycode, foundeddate, conn)
+        dimensions(conn).add("team", tid, databaseid)
     return databaseid
 
 
 def fixturestatuswork(fs):
     long = fs.get("long")
-    print(f"long: {long}")
+    logger.debug("long: %s", long)
     short = fs.get("short")
-    print(f"short: {short}")
+    logger.debug("short: %s", short)
     elapsed = fs.get("elapsed")
-    print(f"elapsed: {elapsed}")
+    logger.debug("elapsed: %s", elapsed)
     extra = fs.get("extra")
-    print(f"extra: {extra}")
+    logger.debug("extra: %s", extra)
 
     fsboolean = True
     if long != "Match Finished":
         fsboolean = False
-        print("Fixture status long doesn't match.")
+        logger.debug("Fixture status long doesn't match.")
     if short != "FT":
         fsboolean = False
-        print("Fixture status short doesn't match.")
+        logger.debug("Fixture status short doesn't match.")
     if elapsed != 90:
         fsboolean = False
-        print("Fixture status elapsed doesn't match.")
+        logger.debug("Fixture status elapsed doesn't match.")
     if extra is not None:
         fsboolean = False
-        print("Fixture status extra doesn't match.")
+        logger.debug("Fixture status extra doesn't match.")
     if fsboolean:
         return 1
 
     fsboolean1 = True
     if long != "Match Finished":
         fsboolean1 = False
-        print("Fixture status long doesn't match.")
+        logger.debug("Fixture status long doesn't match.")
     if short != "PEN":
         fsboolean1 = False
-        print("Fixture status short doesn't match.")
+        logger.debug("Fixture status short doesn't match.")
     if elapsed != 120:
         fsboolean1 = False
-        print("Fixture status elapsed doesn't match.")
+        logger.debug("Fixture status elapsed doesn't match.")
     if extra is not None:
         fsboolean1 = False
-        print("Fixture status extra doesn't match.")
+        logger.debug("Fixture status extra doesn't match.")
     if fsboolean1:
         return 2
 
 
-def _parse_api_utc(s: str) -> datetime:
-    s = s.strip()
-    if s.endswith("Z"):
-        s = s[:-1] + "+00:00"
-    dt = datetime.fromisoformat(s)
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt
-
-    
 def loadheaders(headerspath="headers.json"):
     with open(headerspath, "r", encoding="utf-8") as f:
         return json.load(f)
@@ -721,24 +557,16 @@ def getplayers(payload, playerids):
 
 
 def getplayerprofile(headers, playerid):
-    import time
-
+    # Pacing and 429 handling live in the shared client's rate limiter; only
+    # transient connection failures are retried here.
     max_retries = 3
-    timeout = 30  # 30 seconds timeout
-    retry_delay = 2  # Initial delay in seconds
 
     for attempt in range(max_retries):
-        playerconn = None
         try:
-            playerconn = http.client.HTTPSConnection("v3.football.api-sports.io", timeout=timeout)
             playerpath = f"/players/profiles?player={playerid}"
             normalized = {}
 
-            playerconn.request("GET", playerpath, headers=headers)
-            playerres = playerconn.getresponse()
-            playerraw = playerres.read()
-
-            playerpayload = json.loads(playerraw.decode("utf-8"))
+            playerpayload = getclient(headers).getjson(playerpath)
 
             for item in playerpayload.get("response", []):
                 p = item.get("player") or {}
@@ -760,26 +588,18 @@ def getplayerprofile(headers, playerid):
                     "weightkg": parseheightweight(p.get("weight")),
                 }
 
-            if playerconn:
-                playerconn.close()
             return normalized
 
         except (TimeoutError, ConnectionError, http.client.HTTPException) as e:
-            if playerconn:
-                playerconn.close()
-
             if attempt < max_retries - 1:
-                wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
-                print(
-                    f"Connection attempt {attempt + 1} failed for player {playerid}. Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
+                logger.warning("Connection attempt %s failed for player %s. Retrying...", attempt + 1, playerid)
             else:
-                print(f"Failed to fetch player {playerid} after {max_retries} attempts. Error: {e}")
+                logger.error("Failed to fetch player %s after %s attempts. Error: %s", playerid, max_retries, e)
                 return {}
+        except DailyQuotaExhausted:
+            raise
         except Exception as e:
-            if playerconn:
-                playerconn.close()
-            print(f"Unexpected error fetching player {playerid}: {e}")
+            logger.error("Unexpected error fetching player %s: %s", playerid, e)
             return {}
 
     return {}
@@ -795,57 +615,15 @@ def parseheightweight(str):
 
 
 def applycountrycodes(conn, country):
-    def country_lookup_candidates(name):
-        if not name:
-            return []
-        s = str(name).strip()
-        candidates = set()
-
-        def add(v):
-            if v and v.strip():
-                candidates.add(" ".join(v.strip().lower().split()))
-
-        # Base
-        add(s)
-        # Hyphen/space variants
-        add(s.replace("-", " "))
-        add(s.replace(" ", "-"))
-        # Remove punctuation except hyphens
-        s_no_punct = "".join(ch for ch in s if ch.isalnum() or ch.isspace() or ch == "-")
-        add(s_no_punct)
-        add(s_no_punct.replace("-", " "))
-        add(s_no_punct.replace(" ", "-"))
-        # Accent fold
-        s_ascii = unicodedata.normalize("NFKD", s)
-        s_ascii = "".join(ch for ch in s_ascii if not unicodedata.combining(ch))
-        add(s_ascii)
-        add(s_ascii.replace("-", " "))
-        add(s_ascii.replace(" ", "-"))
-
-        # Special-case: Republic of Ireland -> also match Ireland
-        s_lower_spaces = " ".join(s.strip().lower().replace("-", " ").split())
-        if "republic of ireland" in s_lower_spaces:
-            add("ireland")
-
-        return sorted(candidates)
-
-    candidates = country_lookup_candidates(country)
-    print(f"Looking up candidates: {candidates!r}")
-
-    if not candidates:
-        return {}
+    # Returns {matched name: code}, empty if the country is unknown
+    match = countries(conn).match(country) if country else None
+    logger.debug("Country %r matched %r.", country, match)
+    return dict([match]) if match else {}
 
-    with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT LOWER(name) AS lname, code
-            FROM public.country
-            WHERE LOWER(name) = ANY(%s)
-            """,
-            (candidates,)
-        )
-        rows = cur.fetchall()
-    return {lname: code for lname, code in rows}
+
+def applycountrycodesmany(conn, countrynames):
+    """Resolve several country names to codes; returns {name: code} for every name that matched."""
+    return countries(conn).resolvemany(name for name in countrynames if name)
 
 
 def normalizename(s: str | None) -> str | None:
@@ -855,27 +633,14 @@ def normalizename(s: str | None) -> str | None:
 
 
 def getpositionid(conn, positionname):
-    print(f"Looking up {positionname}...")
+    logger.debug("Looking up %s...", positionname)
 
-    with conn.cursor() as cur:
-        cur.execute("SELECT position FROM public.position")
-        rows = cur.fetchall()
-    existingpositions = {row[0] for row in rows if row[0] is not None}
+    existingpositions = dimensions(conn).table("position")  # position -> id
     if positionname in existingpositions:
-        print(f"Position {positionname} is already in the database.")
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT id
-                FROM public.position
-                WHERE position = %s
-                """,
-                (positionname,)
-            )
-            positionId = cur.fetchone()[0]
-            return positionId
+        logger.debug("Position %s is already in the database.", positionname)
+        return existingpositions[positionname]
     else:
-        print(f"Position {positionname} is not in the database.")
+        logger.debug("Position %s is not in the database.", positionname)
         ds = 'API-Football'
         cb = 'gislobo'
         with conn.cursor() as cur:
@@ -884,114 +649,86 @@ def getpositionid(conn, positionname):
                 (positionname, ds, cb,),
             )
             positionId = cur.fetchone()[0]
-            return positionId
-
-
-def playerlookup(headers, conn, playerid):
-    with conn.cursor() as cur:
-        cur.execute("SELECT apifootballid FROM public.player")
-        rows = cur.fetchall()
-    existingplayers = {row[0] for row in rows if row[0] is not None}
-
-    if playerid in existingplayers:
-        print(f"Player {playerid} is already in the database, no need to proceed.")
-        return
-    else:
-        print(f"Player {playerid} is not in the database, proceeding.")
-        builddictionary(headers, conn, playerid)
+        dimensions(conn).add("position", positionname, positionId)
+        return positionId
 
 
-def builddictionary(headers, conn, playerid):
-    print(f"Building the dictionary for {playerid}...")
-    player = getplayerprofile(headers, playerid)
-    print("...dictionary built.")
+PLAYERCOLUMNS = (
+    "apifootballid", "firstname", "lastname", "birthdate", "birthplace", "birthcountrycode",
+    "nationality", "heightcm", "weightkg", "data_source", "created_by",
+)
 
-    # Validate that player data was retrieved successfully
-    if not player or playerid not in player or player.get(playerid) is None:
-        print(f"ERROR: Failed to retrieve player data for player ID {playerid}. Skipping...")
-        return
-
-    print("Replacing birthcountry and nationality with codes from database...")
-    birthcountryname = player.get(playerid).get("birthcountrycode")
-    nationalityname = player.get(playerid).get("nationality")
-    print(f"Birth country name:  {birthcountryname}.")
-    print(f"Nationality name:  {nationalityname}.")
 
-    with conn:
-        # Map birthcountry name to code in database and replace dict value
-        print("Map birthcountry name to code in database and replace dict value...")
-        birthcountrycodemap = applycountrycodes(conn, birthcountryname)
-        if birthcountrycodemap:
-            birthcountrycode = next(iter(birthcountrycodemap.values()))
-        else:
-            birthcountrycode = None  # keep NULL if not found
-            print(f"Warning: No match found for birth country '{birthcountryname}'. Leaving NULL.")
-        player[playerid]["birthcountrycode"] = birthcountrycode
-        print("...done.")
-        # Map nationality name to code in database and replace dict value
-        print("Map nationality name to code in database and replace dict value...")
-        nationalitycodemap = applycountrycodes(conn, nationalityname)
-        if nationalitycodemap:
-            nationalitycountrycode = next(iter(nationalitycodemap.values()))
-        else:
-            nationalitycountrycode = None  # keep NULL if not found
-            print(f"Warning: No match found for nationality '{nationalityname}'. Leaving NULL.")
-        player[playerid]["nationality"] = nationalitycountrycode
-        print("...done.")
-
-        # positionId = getpositionid(conn, positionname)
-        # print(positionId)
-        # player[playerid]["position"] = positionId
-        print(player)
+def insertplayers(conn, profiles):
+    """
+    Insert the normalized player profiles from getplayerprofile() in one statement.
 
-    sql = """
-        INSERT INTO public.player (apifootballid, \
-                                   firstname, \
-                                   lastname, \
-                                   birthdate, \
-                                   birthplace, \
-                                   birthcountrycode, \
-                                   nationality, \
-                                   heightcm, \
-                                   weightkg, \
-                                   data_source, \
-                                   created_by) 
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id
+    Birth country and nationality names are mapped to country codes first, with a
+    single lookup for the whole batch. Returns {apifootballid: id}.
     """
+    if not profiles:
+        return {}
+    countrycodes = applycountrycodesmany(
+        conn, [p["birthcountrycode"] for p in profiles] + [p["nationality"] for p in profiles]
+    )
     ds = 'API-Football'
     cb = 'gislobo'
-    params = (
-        playerid,
-        player[playerid]["firstname"],
-        player[playerid]["lastname"],
-        player[playerid]["birthdate"],
-        player[playerid]["birthplace"],
-        player[playerid]["birthcountrycode"],
-        player[playerid]["nationality"],
-        player[playerid]["heightcm"],
-        player[playerid]["weightkg"],
-        ds,
-        cb,
-    )
+    rows = []
+    for p in profiles:
+        for field in ("birthcountrycode", "nationality"):
+            if p[field] and p[field] not in countrycodes:
+                logger.warning("No match found for %s '%s' of player %s. Leaving NULL.", field, p[field], p['apifootballid'])
+        rows.append((
+            p["apifootballid"],
+            p["firstname"],
+            p["lastname"],
+            p["birthdate"],
+            p["birthplace"],
+            countrycodes.get(p["birthcountrycode"]),
+            countrycodes.get(p["nationality"]),
+            p["heightcm"],
+            p["weightkg"],
+            ds,
+            cb,
+        ))
 
+    sql = f"INSERT INTO public.player ({', '.join(PLAYERCOLUMNS)}) VALUES %s RETURNING apifootballid, id"
     with conn:
         with conn.cursor() as cur:
-            cur.execute(sql, params)
-            newid = cur.fetchone()[0]
-            print(f"Player {playerid} inserted with id {newid}.")
+            inserted = psycopg2.extras.execute_values(cur, sql, rows, fetch=True)
+    newids = dict(inserted)
+    for apifootballid, newid in newids.items():
+        dimensions(conn).add("player", apifootballid, newid)
+    logger.info("Inserted %s new players: %s.", len(newids), newids)
+    return newids
 
 
 def players(payload, headers, conn):
-    import time
-
     playerids = []
-    print(f"Getting player IDs...")
+    logger.debug("Getting player IDs...")
     getplayers(payload, playerids)
-    print(f"Player IDs:  {playerids}.")
+    logger.debug("Player IDs:  %s.", playerids)
 
-    for playerid in playerids:
-        playerlookup(headers, conn, playerid)
-        time.sleep(0.5)  # Add 500ms delay between requests
+    # One query tells us which of the fixture's players are already in the database
+    known = dimensions(conn).resolvemany("player", playerids)
+    unknown = [pid for pid in playerids if pid not in known]
+    if not unknown:
+        logger.debug("All players are already in the database.")
+        return
+    logger.debug("Players not in the database:  %s.", unknown)
+
+    # Fetch the missing profiles concurrently; the client's rate limiter does the pacing
+    apiclient = getclient(headers)
+    with ThreadPoolExecutor(max_workers=min(apiclient.poolsize, len(unknown))) as executor:
+        fetched = list(executor.map(lambda pid: getplayerprofile(headers, pid), unknown))
+
+    profiles = []
+    for playerid, player in zip(unknown, fetched):
+        if player.get(playerid) is None:
+            logger.error("Failed to retrieve player data for player ID %s. Skipping...", playerid)
+            continue
+        profiles.append(player[playerid])
+    insertplayers(conn, profiles)
 
 
 def fixturefunction(payload, f, headers, conn):
@@ -1006,11 +743,11 @@ def fixturefunction(payload, f, headers, conn):
         teamsinfo = item.get("teams") or {}
         goalsinfo = item.get("goals") or {}
         scoreinfo = item.get("score") or {}
-    print(f"Fixture:  {fixtureinfo}.")
-    print(f"League:  {leagueinfo}.")
-    print(f"Teams:  {teamsinfo}.")
-    print(f"Goals:  {goalsinfo}.")
-    print(f"Score:  {scoreinfo}.")
+    logger.debug("Fixture:  %s.", fixtureinfo)
+    logger.debug("League:  %s.", leagueinfo)
+    logger.debug("Teams:  %s.", teamsinfo)
+    logger.debug("Goals:  %s.", goalsinfo)
+    logger.debug("Score:  %s.", scoreinfo)
 
     # Run a check to see if that fixture id is already in the database, if it is, exit the function
     with conn.cursor() as cur:
@@ -1018,114 +755,102 @@ def fixturefunction(payload, f, headers, conn):
         existingfixtures = cur.fetchall()
     existingfixturesdict = {existingfixture[0]: existingfixture[1] for existingfixture in existingfixtures if
                             existingfixture[0] is not None}
-    print(f"Existing fixtures: {existingfixturesdict}")
+    logger.debug("Existing fixtures: %s", existingfixturesdict)
     if f in existingfixturesdict:
-        print(f"Fixture {f} is already in the database.")
-        print(f"Fixture id is {existingfixturesdict[f]}.")
+        logger.info("Fixture %s is already in the database.", f)
+        logger.debug("Fixture id is %s.", existingfixturesdict[f])
         return
 
     # Referee info
     refereeId = refereework(fixtureinfo, conn)
-    print(f"The referee id is {refereeId}.")
+    logger.debug("The referee id is %s.", refereeId)
 
     # Venue info
     venueId, fixturetimezone = venuework(fixtureinfo, conn)
-    print(f"The venue id is {venueId}.")
-    print(f"The timezone is {fixturetimezone}.")
+    logger.debug("The venue id is %s.", venueId)
+    logger.debug("The timezone is %s.", fixturetimezone)
 
     # Date and time info
     utcdatetime_str = fixtureinfo.get("date")
-    localtime_aware = to_tz_from_utc(utcdatetime_str, fixturetimezone)
-    atlantatimezone = "America/New_York"
-    atlantatime_aware = localtime_aware if fixturetimezone == atlantatimezone else to_tz_from_utc(utcdatetime_str,
-                                                                                                  atlantatimezone)
+    # For timestamp (without time zone) columns, use naive "wall times" in UTC, the venue tz and Atlanta
+    utcdatetime, localtime, atlantatime = walltimes([utcdatetime_str], fixturetimezone)[0]
 
     # League info
     leagueapiid = leagueinfo.get("id")
     leagueround = leagueinfo.get("round")
-    print(f"API League ID: {leagueapiid}.")
-    print(f"Round: {leagueround}.")
+    logger.debug("API League ID: %s.", leagueapiid)
+    logger.debug("Round: %s.", leagueround)
     leagueid = leaguework(leagueapiid, conn, leagueround)
-    print(f"The league id is {leagueid}.")
+    logger.debug("The league id is %s.", leagueid)
 
     # Team info
     homeinfo = teamsinfo.get("home") or {}
     awayinfo = teamsinfo.get("away") or {}
     hometeamapiid = homeinfo.get("id")
     awayteamapiid = awayinfo.get("id")
-    print(f"Home team api id: {hometeamapiid}.")
-    print(f"Away team api id: {awayteamapiid}.")
+    logger.debug("Home team api id: %s.", hometeamapiid)
+    logger.debug("Away team api id: %s.", awayteamapiid)
     hometeamid = teamwork(hometeamapiid, conn, headers)
     awayteamid = teamwork(awayteamapiid, conn, headers)
-    print(f"Home team id:  {hometeamid}.")
-    print(f"Away team id:  {awayteamid}.")
+    logger.debug("Home team id:  %s.", hometeamid)
+    logger.debug("Away team id:  %s.", awayteamid)
 
     # Fixturestatus
     fixturestatus = fixtureinfo.get("status")
-    print(f"Fixture status: {fixturestatus}.")
+    logger.debug("Fixture status: %s.", fixturestatus)
     fixturestatusid = fixturestatuswork(fixturestatus)
-    print(f"Fixture status id is {fixturestatusid}.")
+    logger.debug("Fixture status id is %s.", fixturestatusid)
 
     # Goals info
     homegoals = goalsinfo.get("home")
     awaygoals = goalsinfo.get("away")
-    print(f"home goals = {homegoals}.")
-    print(f"away goals = {awaygoals}.")
+    logger.debug("home goals = %s.", homegoals)
+    logger.debug("away goals = %s.", awaygoals)
 
     # Fixturewinner
-    print(f"home info {homeinfo}.")
-    print(f"away info {awayinfo}.")
+    logger.debug("home info %s.", homeinfo)
+    logger.debug("away info %s.", awayinfo)
     homewinner = homeinfo.get("winner")
     awaywinner = awayinfo.get("winner")
-    print(f"homewinner = {homewinner}.")
-    print(f"awaywinner = {awaywinner}.")
+    logger.debug("homewinner = %s.", homewinner)
+    logger.debug("awaywinner = %s.", awaywinner)
     fixturewinner = None
     if homewinner:
-        print("home won")
+        logger.debug("home won")
         fixturewinner = hometeamid
     elif awaywinner:
-        print("away won")
+        logger.debug("away won")
         fixturewinner = awayteamid
     else:
-        print("Ended in a draw")
+        logger.debug("Ended in a draw")
         fixturewinner = 8
-    print(f"fixturewinner = {fixturewinner}.")
+    logger.debug("fixturewinner = %s.", fixturewinner)
 
     # Score info
     halftimeinfo = scoreinfo.get("halftime")
     halftimehome = halftimeinfo.get("home")
     halftimeaway = halftimeinfo.get("away")
-    print(f"halftimehome = {halftimehome}.")
-    print(f"halftimeaway = {halftimeaway}.")
+    logger.debug("halftimehome = %s.", halftimehome)
+    logger.debug("halftimeaway = %s.", halftimeaway)
 
     fulltimeinfo = scoreinfo.get("fulltime")
     fulltimehome = fulltimeinfo.get("home")
     fulltimeaway = fulltimeinfo.get("away")
-    print(f"fulltimehome = {fulltimehome}.")
-    print(f"fulltimeaway = {fulltimeaway}.")
+    logger.debug("fulltimehome = %s.", fulltimehome)
+    logger.debug("fulltimeaway = %s.", fulltimeaway)
 
     extratimeinfo = scoreinfo.get("extratime")
     extratimehome = extratimeinfo.get("home")
     extratimeaway = extratimeinfo.get("away")
-    print(f"extratimehome = {extratimehome}.")
-    print(f"extratimeaway = {extratimeaway}.")
+    logger.debug("extratimehome = %s.", extratimehome)
+    logger.debug("extratimeaway = %s.", extratimeaway)
 
     penaltyinfo = scoreinfo.get("penalty")
     penaltyhome = penaltyinfo.get("home")
     penaltyaway = penaltyinfo.get("away")
-    print(f"penaltyhome = {penaltyhome}.")
-    print(f"penaltyaway = {penaltyaway}.")
-
-    # For timestamp (without time zone) columns, use naive "wall times"
-    utcdatetime = _parse_api_utc(utcdatetime_str).replace(tzinfo=None)  # wall time in UTC
-    localtime = localtime_aware.replace(tzinfo=None)  # wall time in venue tz
-    atlantatime = atlantatime_aware.replace(tzinfo=None)  # wall time in Atlanta
-
-    print(f"before insert, utcdatetime_str is {utcdatetime_str}")
-    print(f"before insert, localtime is {localtime}")
-    print(f"before insert, atlantatime is {atlantatime}")
-    utcdatetime = _parse_api_utc(utcdatetime_str)
-    print(f"after parsing thingy, utcdatetime is {utcdatetime}")
+    logger.debug("penaltyhome = %s.", penaltyhome)
+    logger.debug("penaltyaway = %s.", penaltyaway)
+
     # Insert fixture record
     sql = """
           INSERT INTO public.fixture (apisportsid, \
@@ -1186,39 +911,84 @@ def fixturefunction(payload, f, headers, conn):
         with conn.cursor() as cursor:
             cursor.execute(sql, params)
             databasefixtureid = cursor.fetchone()[0]
-            print(f"Database fixture id: {databasefixtureid}.")
+            logger.info("Database fixture id: %s.", databasefixtureid)
 
-    print("and you're done")
+    logger.debug("and you're done")
+
+
+# Per-fixture history tables and the column in each that references public.fixture.id
+INGESTEDTABLES = {
+    "fixtureevent": "fixtureid",
+    "fixturestatistics": "dbfixtureid",
+    "fixtureplayerstatistics": "dbfixtureid",
+    "fixturelineups": "fixtureid",
+}
+
+# Filled by preloadingested(): database fixture id -> set of tables that already have its rows
+_ingestedfixtures = {}
+
+
+def preloadingested(conn, apifixtureids):
+    """
+    Find out in one query which of the requested fixtures already have rows in each history table.
+
+    Returns {api fixture id: set of table names}; fixtures that aren't in
+    public.fixture yet are left out. The answer is remembered so the per-stage
+    fixturehasrows() checks for these fixtures don't go back to the database.
+    """
+    probes = ",\n".join(
+        f"EXISTS (SELECT 1 FROM public.{table} t WHERE t.{column} = f.id)"
+        for table, column in INGESTEDTABLES.items()
+    )
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT f.apisportsid, f.id, {probes} FROM public.fixture f WHERE f.apisportsid = ANY(%s)",
+                    (list(apifixtureids),))
+        rows = cur.fetchall()
+    ingested = {}
+    for row in rows:
+        tables = {table for table, present in zip(INGESTEDTABLES, row[2:]) if present}
+        _ingestedfixtures[row[1]] = tables
+        ingested[row[0]] = tables
+    return ingested
+
+
+def fixturehasrows(conn, table, dbfixtureid):
+    """Indexed EXISTS probe: does this fixture already have rows in the given history table?"""
+    if dbfixtureid is None:
+        return False
+    if dbfixtureid in _ingestedfixtures:
+        return table in _ingestedfixtures[dbfixtureid]
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT EXISTS (SELECT 1 FROM public.{table} WHERE {INGESTEDTABLES[table]} = %s)",
+                    (dbfixtureid,))
+        return cur.fetchone()[0]
+
+
+def markingested(table, dbfixtureid):
+    """Record that a stage has written rows for this fixture."""
+    if dbfixtureid in _ingestedfixtures:
+        _ingestedfixtures[dbfixtureid].add(table)
 
 
 def eventtypework(c, et, ed):
     # Get the event type information into a list of dictionaries
-    print("Starting the eventypework function.")
+    logger.debug("Starting the eventypework function.")
 
     # Handle NULL eventdetail by providing a default value
     if ed is None or (isinstance(ed, str) and not ed.strip()):
         ed = "None"
-        print(f"Event detail was None or empty, using default value: {ed}")
-
-    with c.cursor() as cur:
-        cur.execute("SELECT id, type, eventdetail FROM public.eventtype")
-        rows = cur.fetchall()
-    print(f"Rows of eventtype: {rows}")
+        logger.debug("Event detail was None or empty, using default value: %s", ed)
 
     # Check to see if the event type exists in the database
     eventtypeexists = False
-    dbeventtypeid = ""
-    for row in rows:
-        print(f"Row id {row[0]}, type {row[1]}, eventdetail {row[2]}")
-        if row[1] == et and row[2] == ed:
-            print(f"Found event type {et} and event detail {ed}.")
-            dbeventtypeid = row[0]
-            eventtypeexists = True
-            break
+    dbeventtypeid = dimensions(c).get("eventtype", (et, ed), "")
+    if dbeventtypeid != "":
+        logger.debug("Found event type %s and event detail %s.", et, ed)
+        eventtypeexists = True
 
     # If not in the database, add them in as a new row in public.eventtype
     if not eventtypeexists:
-        print(f"Event type {et} and event detail {ed} not found in database.")
+        logger.debug("Event type %s and event detail %s not found in database.", et, ed)
         ds = 'API-Football'
         cb = 'gislobo'
         with c:
@@ -1228,106 +998,129 @@ def eventtypework(c, et, ed):
                     (et, ed, ds, cb),
                 )
                 dbeventtypeid = cur.fetchone()[0]
-                print(f"Event type {et} and event detail {ed} inserted with id {dbeventtypeid}.")
+                logger.info("Event type %s and event detail %s inserted with id %s.", et, ed, dbeventtypeid)
+        dimensions(c).add("eventtype", (et, ed), dbeventtypeid)
 
-    print("Ending the eventypework function.")
+    logger.debug("Ending the eventypework function.")
     return dbeventtypeid
 
 
-def eventfunction(payload, f, conn):
+FIXTUREEVENTCOLUMNS = (
+    "fixtureid", "eventtype", "eventcomments", "timeelapsed", "extratimeelapsed", "team", "player", "assist",
+    "data_source", "created_by",
+)
+
+
+def insertfixtureeventrows(conn, rows):
+    """Bulk insert fixtureevent rows (tuples in FIXTUREEVENTCOLUMNS order) in one transaction."""
+    if not rows:
+        logger.debug("No events to insert.")
+        return []
+    sql = f"INSERT INTO public.fixtureevent ({', '.join(FIXTUREEVENTCOLUMNS)}) VALUES %s RETURNING id"
+    with conn:
+        with conn.cursor() as cur:
+            newids = psycopg2.extras.execute_values(cur, sql, rows, page_size=len(rows), fetch=True)
+    logger.info("Inserted %s events.", len(newids))
+    return [row[0] for row in newids]
+
+
+def eventfunction(payload, f, conn, parked=False):
+    """
+    Ingest /fixtures/events for one fixture.
+
+    parked=True is for resolvepending.py re-ingesting events that a headless run
+    parked: the payload holds only those events, and the fixture already having
+    events doesn't stop them being written. A normal run that writes the events
+    resolves whatever was parked for them, so they aren't written twice.
+    """
     ## Grab the database fixtureid
     with conn.cursor() as cur:
         cur.execute("SELECT apisportsid, id from public.fixture where apisportsid = %s", (f,))
         existingfixtures = cur.fetchall()
     existingfixturesdict = {existingfixture[0]: existingfixture[1] for existingfixture in existingfixtures if
                             existingfixture[0] is not None}
-    print(f"Existing fixtures: {existingfixturesdict}")
-    databasefixtureid = ""
+    logger.debug("Existing fixtures: %s", existingfixturesdict)
+    databasefixtureid = None
     if f in existingfixturesdict:
         databasefixtureid = existingfixturesdict[f]
-        print(f"The database fixture id is {databasefixtureid}.")
+        logger.debug("The database fixture id is %s.", databasefixtureid)
 
     ## Check to see if the fixture has events already in the table
-    with conn.cursor() as cur:
-        cur.execute("SELECT fixtureid from public.fixtureevent")
-        existingfixtureevents = cur.fetchall()
-    existingids = {row[0] for row in existingfixtureevents}  # Extract first column into a set
-    print(f"Existing fixture events: {existingids}")
-    if databasefixtureid in existingids:
-        print(f"The fixture {databasefixtureid} already has events in the database.")
+    if not parked and fixturehasrows(conn, "fixtureevent", databasefixtureid):
+        logger.debug("The fixture %s already has events in the database.", databasefixtureid)
         return
 
     ## Work out how to grab each event individually
     # API tells us how many events there are
     apiresults = payload.get("results") or {}
-    print(f"The API tells us there are {apiresults} events.")
+    logger.debug("The API tells us there are %s events.", apiresults)
 
     # Ge the events into a list of dictionaries
     response = payload.get("response") or {}
-    print(response)
-    print(f"There are {len(response)} events in the response.")
+    logger.debug("%s", response)
+    logger.debug("There are %s events in the response.", len(response))
     if len(response) == apiresults:
-        print("The number of events in the response matches the number of events the API initially tells us there are.")
+        logger.debug("The number of events in the response matches the number of events the API initially tells us there are.")
     else:
-        print(
-            "Something is wrong, the number of events in the response doesn't match the number of events the API tells us there are.")
+        logger.error("Something is wrong, the number of events in the response doesn't match the number of events the API tells us there are.")
         sys.exit(0)
+    # Resolve every team, player and assist api id in the fixture with one query per table
+    dims = dimensions(conn)
+    teamids = dims.resolvemany("team", [(event.get("team") or {}).get("id") for event in response])
+    playerids = dims.resolvemany("player", [
+        (event.get(role) or {}).get("id") for event in response for role in ("player", "assist")
+    ])
+
+    rows = []
+    parkedrowkeys = set()
     count = 0
     for event in response:
         count += 1
-        print(f"Event {count}:")
-        print(event)
+        logger.debug("Event %s:", count)
+        logger.debug("%s", event)
 
         ## Event type work
         # Get type, detail, and comments into variables
         eventtype = event.get("type")
         eventdetail = event.get("detail")
         eventcomments = event.get("comments")
-        print(f"Event type: {eventtype}")
-        print(f"Event detail: {eventdetail}")
-        print(f"Event comments: {eventcomments}")
+        logger.debug("Event type: %s", eventtype)
+        logger.debug("Event detail: %s", eventdetail)
+        logger.debug("Event comments: %s", eventcomments)
 
         # Write a function to get the database id for the event type
         eventypeid = eventtypework(conn, eventtype, eventdetail)
-        print(f"Event type id: {eventypeid}")
-        print("")
+        logger.debug("Event type id: %s", eventypeid)
 
         ## Time elapsed and extratimeelapsed
         # Get time info per event into their respective variables
         timeinfo = event.get("time") or {}
-        print(f"Time info: {timeinfo}")
+        logger.debug("Time info: %s", timeinfo)
         elapsed = timeinfo.get("elapsed")
         extra = timeinfo.get("extra")
-        print(f"Elapsed time: {elapsed}")
-        print(f"Extra time elapsed: {extra}")
-        print("")
+        logger.debug("Elapsed time: %s", elapsed)
+        logger.debug("Extra time elapsed: %s", extra)
 
         ## Get database team id
         teaminfo = event.get("team") or {}
         apiteamid = teaminfo.get("id")
-        print(f"apiteamid: {apiteamid}")
-        databaseteamid = ""
-        with conn.cursor() as cur:
-            cur.execute("SELECT id from public.team WHERE apifootballid = %s", (apiteamid,))
-            databaseteamid = cur.fetchone()[0]
-        print(f"Database team id: {databaseteamid}")
-        print("")
+        logger.debug("apiteamid: %s", apiteamid)
+        databaseteamid = teamids[apiteamid]
+        logger.debug("Database team id: %s", databaseteamid)
 
         ## Get database player id
         playerinfo = event.get("player") or {}
         apiplayerid = playerinfo.get("id")
-        print(f"apiplayerid: {apiplayerid}")
-        databaseplayerid = None
-        with conn.cursor() as cur:
-            cur.execute("SELECT id from public.player WHERE apifootballid = %s", (apiplayerid,))
-            playerresult = cur.fetchone()
-            if playerresult is None:
-                print(f"WARNING:  Player with apifootballid {apiplayerid} not found in database.")
-                databaseplayerid = int(input("Enter the database player id for the player: "))
-            else:
-                databaseplayerid = playerresult[0]
-        print(f"Database player id: {databaseplayerid}")
-        print("")
+        logger.debug("apiplayerid: %s", apiplayerid)
+        databaseplayerid = playerids.get(apiplayerid)
+        if databaseplayerid is None:
+            logger.warning("Player with apifootballid %s not found in database.", apiplayerid)
+            if HEADLESS:
+                parkpending(conn, f, "events", "player", apiplayerid, rowkey=str(count), payload=event)
+                parkedrowkeys.add(str(count))
+                continue
+            databaseplayerid = int(input("Enter the database player id for the player: "))
+        logger.debug("Database player id: %s", databaseplayerid)
 
         ## Assist work (database player id)
         assistinfo = event.get("assist") or {}
@@ -1335,36 +1128,21 @@ def eventfunction(payload, f, conn):
         databaseassistid = ""
         if apiassistid is None:
             databaseassistid = None
-            print(f"Assist id is None.")
+            logger.debug("Assist id is None.")
         else:
-            with conn.cursor() as cur:
-                cur.execute("SELECT id from public.player WHERE apifootballid = %s", (apiassistid,))
-                assistresult = cur.fetchone()
-                if assistresult is None:
-                    print(f"WARNING:  Assist with apifootballid {apiassistid} not found in database.")
-                    databaseassistid = int(input("Enter the database player id for the player: "))
-                else:
-                    databaseassistid = assistresult[0]
-            print(f"Database assist id: {databaseassistid}")
-
-        ## Load into database
-        sql = """
-              INSERT INTO public.fixtureevent (fixtureid, \
-                                               eventtype, \
-                                               eventcomments, \
-                                               timeelapsed, \
-                                               extratimeelapsed, \
-                                               team, \
-                                               player, \
-                                               assist, \
-                                               data_source, \
-                                               created_by)
-              VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) \
-              RETURNING id \
-              """
+            databaseassistid = playerids.get(apiassistid)
+            if databaseassistid is None:
+                logger.warning("Assist with apifootballid %s not found in database.", apiassistid)
+                if HEADLESS:
+                    parkpending(conn, f, "events", "player", apiassistid, rowkey=str(count), payload=event)
+                    parkedrowkeys.add(str(count))
+                    continue
+                databaseassistid = int(input("Enter the database player id for the player: "))
+            logger.debug("Database assist id: %s", databaseassistid)
+
         ds = 'API-Football'
         cb = 'gislobo'
-        params = (
+        rows.append((
             databasefixtureid,
             eventypeid,
             eventcomments,
@@ -1375,16 +1153,14 @@ def eventfunction(payload, f, conn):
             databaseassistid,
             ds,
             cb,
-        )
+        ))
 
-        with conn:
-            with conn.cursor() as cur:
-                cur.execute(sql, params)
-                eventid = cur.fetchone()[0]
-                print(f"Event inserted with id {eventid}.")
 
-        print("")
-        print("---------------------------------")
+    ## Load the whole event list into the database in one statement and one transaction
+    insertfixtureeventrows(conn, rows)
+    markingested("fixtureevent", databasefixtureid)
+    if not parked:
+        resolvewritten(conn, f, "events", parkedrowkeys)
 
 
 def percentstringtofloat(str):
@@ -1394,6 +1170,94 @@ def percentstringtofloat(str):
     return float(str.strip('%'))
 
 
+# API-Football team statistic name -> (fixturestatistics column, converter applied to the raw value)
+TEAMSTATCOLUMNS = {
+    "Shots on Goal": ("shotsongoal", None),
+    "Shots off Goal": ("shotsoffgoal", None),
+    "Total Shots": ("totalshots", None),
+    "Blocked Shots": ("blockedshots", None),
+    "Goalkeeper Saves": ("goalkeepersaves", None),
+    "Shots insidebox": ("shotsinsidebox", None),
+    "Shots outsidebox": ("shotsoutsidebox", None),
+    "Corner Kicks": ("cornerkicks", None),
+    "Offsides": ("offsides", None),
+    "Ball Possession": ("ballpossession", percentstringtofloat),
+    "Total passes": ("totalpasses", None),
+    "Passes accurate": ("passesaccurate", None),
+    "Fouls": ("fouls", None),
+    "Yellow Cards": ("yellowcards", None),
+    "Red Cards": ("redcards", None),
+}
+
+FIXTURESTATISTICSCOLUMNS = (
+    ("dbfixtureid", "dbteamid")
+    + tuple(column for column, _ in TEAMSTATCOLUMNS.values())
+    + ("data_source", "created_by")
+)
+
+# Stat name -> (position in the parsed tuple, converter)
+_TEAMSTATINDEX = {stattype: (i, converter) for i, (stattype, (_, converter)) in enumerate(TEAMSTATCOLUMNS.items())}
+
+
+def parseteamstatistics(apistats):
+    """Turn one team's API `statistics` list into a tuple of values in TEAMSTATCOLUMNS order."""
+    values = [None] * len(TEAMSTATCOLUMNS)
+    for stat in apistats or []:
+        entry = _TEAMSTATINDEX.get(stat.get("type"))
+        if entry is None:
+            continue
+        i, converter = entry
+        value = stat.get("value")
+        values[i] = converter(value) if converter else value
+    return tuple(values)
+
+
+def teamstatisticsrows(conn, fixtures):
+    """
+    Build fixturestatistics rows for many fixtures at once.
+
+    fixtures is an iterable of (dbfixtureid, /fixtures/statistics payload). Every
+    team id across the batch is resolved with one query. Returns tuples in
+    FIXTURESTATISTICSCOLUMNS order.
+    """
+    fixtures = list(fixtures)
+    apiteamids = [
+        ((teamstats.get("team") or {}).get("id"))
+        for _, payload in fixtures
+        for teamstats in (payload.get("response") or [])
+    ]
+    teamids = dimensions(conn).resolvemany("team", apiteamids)
+
+    ds = 'API-Football'
+    cb = 'gislobo'
+    rows = []
+    for databasefixtureid, payload in fixtures:
+        for teamstats in payload.get("response") or []:
+            apiteamid = (teamstats.get("team") or {}).get("id")
+            if apiteamid not in teamids:
+                logger.error("API Team ID %s is not in your database.", apiteamid)
+                sys.exit(0)
+            rows.append(
+                (databasefixtureid, teamids[apiteamid])
+                + parseteamstatistics(teamstats.get("statistics"))
+                + (ds, cb)
+            )
+    return rows
+
+
+def insertfixturestatisticsrows(conn, rows):
+    """Bulk insert fixturestatistics rows (tuples in FIXTURESTATISTICSCOLUMNS order) in one transaction."""
+    if not rows:
+        logger.debug("No team statistics rows to insert.")
+        return []
+    sql = f"insert into public.fixturestatistics ({', '.join(FIXTURESTATISTICSCOLUMNS)}) values %s returning id"
+    with conn:
+        with conn.cursor() as cur:
+            newids = psycopg2.extras.execute_values(cur, sql, rows, fetch=True)
+    logger.info("...inserted %s team statistics rows.", len(newids))
+    return [row[0] for row in newids]
+
+
 def statisticsfunction(payload, f, conn):
     ## Grab the database fixtureid
     with conn.cursor() as cur:
@@ -1401,196 +1265,83 @@ def statisticsfunction(payload, f, conn):
         existingfixtures = cur.fetchall()
     existingfixturesdict = {existingfixture[0]: existingfixture[1] for existingfixture in existingfixtures if
                             existingfixture[0] is not None}
-    print(f"Existing fixtures: {existingfixturesdict}")
+    logger.debug("Existing fixtures: %s", existingfixturesdict)
     databasefixtureid = None
     if f in existingfixturesdict:
         databasefixtureid = existingfixturesdict[f]
-        print(f"The database fixture id is {databasefixtureid}.")
+        logger.debug("The database fixture id is %s.", databasefixtureid)
 
     ## See if the fixture already has statistics
-    with conn.cursor() as cur:
-        cur.execute("select dbfixtureid from public.fixturestatistics")
-        existingfixturestatisticsidsfetchall = cur.fetchall()
-    existingfixturestatisticsids = {row[0] for row in existingfixturestatisticsidsfetchall}
-    if databasefixtureid in existingfixturestatisticsids:
-        print(f"The fixture {databasefixtureid} already has statistics in the database, exiting.")
+    if fixturehasrows(conn, "fixturestatistics", databasefixtureid):
+        logger.debug("The fixture %s already has statistics in the database, exiting.", databasefixtureid)
         return
 
     ## Work out how to grab each team's statistics individually
     # API tells us how many events there are
     apiresults = payload.get("results") or {}
-    print(f"The API tells us there are {apiresults} events.")
+    logger.debug("The API tells us there are %s events.", apiresults)
 
     # Get the events into a list of dictionaries
     response = payload.get("response") or {}
-    print(response)
-    print(f"There are {len(response)} events in the response.")
+    logger.debug("%s", response)
+    logger.debug("There are %s events in the response.", len(response))
     if len(response) == apiresults:
-        print("The number of events in the response matches the number of events the API initially tells us there are.")
+        logger.debug("The number of events in the response matches the number of events the API initially tells us there are.")
     else:
-        print(
-            "Something is wrong, the number of events in the response doesn't match the number of events the API tells us there are.")
+        logger.error("Something is wrong, the number of events in the response doesn't match the number of events the API tells us there are.")
         sys.exit(0)
 
-    count = 0
-    for event in response:
-        count += 1
-        print(f"Event {count}:")
-        print(event)
+    rows = teamstatisticsrows(conn, [(databasefixtureid, payload)])
+    insertfixturestatisticsrows(conn, rows)
 
-        ## Get db team id
-        teaminfo = event.get("team") or {}
-        apiteamid = teaminfo.get("id")
-        print(f"apiteamid: {apiteamid}")
-        with conn.cursor() as cur:
-            cur.execute("SELECT apifootballid, id from public.team where apifootballid = %s", (apiteamid,))
-            existingteams = cur.fetchall()
-        existingteamsdict = {existingteam[0]: existingteam[1] for existingteam in existingteams if
-                             existingteam[0] is not None}
-        databaseteamid = None
-        if apiteamid in existingteamsdict:
-            databaseteamid = existingteamsdict[apiteamid]
-            print(f"The database team id is {databaseteamid}.")
-        else:
-            print(f"API Team ID {apiteamid} is not in your database.")
-            sys.exit(0)
+    markingested("fixturestatistics", databasefixtureid)
 
-        ## Get stats into variables
-        # Initialize variables
-        shotsongoal = None
-        shotsoffgoal = None
-        totalshots = None
-        blockedshots = None
-        shotsinsidebox = None
-        shotsoutsidebox = None
-        fouls = None
-        cornerkicks = None
-        offsides = None
-        ballpossessionstr = None
-        ballpossession = None
-        yellowcards = None
-        redcards = None
-        goalkeepersaves = None
-        totalpasses = None
-        passesaccurate = None
-        apistats = event.get("statistics") or {}
-        print(f"Stats: {apistats}")
-        print(f"length of stats: {len(apistats)}")
-        for stat in apistats:
-            print(f"stat: {stat}")
-            stattype = stat.get("type")
-            statvalue = stat.get("value")
-            if stattype == 'Shots on Goal':
-                shotsongoal = statvalue
-                print(f"Shots on goal: {shotsongoal}")
-            if stattype == 'Shots off Goal':
-                shotsoffgoal = statvalue
-                print(f"Shots off goal: {shotsoffgoal}")
-            if stattype == 'Total Shots':
-                totalshots = statvalue
-                print(f"Total shots: {totalshots}")
-            if stattype == 'Blocked Shots':
-                blockedshots = statvalue
-                print(f"Blocked shots: {blockedshots}")
-            if stattype == 'Shots insidebox':
-                shotsinsidebox = statvalue
-                print(f"Shots inside box: {shotsinsidebox}")
-            if stattype == 'Shots outsidebox':
-                shotsoutsidebox = statvalue
-                print(f"Shots outside box: {shotsoutsidebox}")
-            if stattype == 'Fouls':
-                fouls = statvalue
-                print(f"Fouls: {fouls}")
-            if stattype == 'Corner Kicks':
-                cornerkicks = statvalue
-                print(f"Corner kicks: {cornerkicks}")
-            if stattype == 'Offsides':
-                offsides = statvalue
-                print(f"Offsides: {offsides}")
-            if stattype == 'Ball Possession':
-                ballpossessionstr = statvalue
-                print(f"Ball possession string: {ballpossessionstr}")
-                # Converting ballpossession to a float
-                print("Converting ballpossession to a float...")
-                ballpossession = percentstringtofloat(ballpossessionstr)
-                print(f"Ball possession percent: {ballpossession}")
-            if stattype == 'Yellow Cards':
-                yellowcards = statvalue
-                print(f"Yellow cards: {yellowcards}")
-            if stattype == 'Red Cards':
-                redcards = statvalue
-                print(f"Red cards: {redcards}")
-            if stattype == 'Goalkeeper Saves':
-                goalkeepersaves = statvalue
-                print(f"Goalkeeper saves: {goalkeepersaves}")
-            if stattype == 'Total passes':
-                totalpasses = statvalue
-                print(f"Total passes: {totalpasses}")
-            if stattype == 'Passes accurate':
-                passesaccurate = statvalue
-                print(f"Passes accurate: {passesaccurate}")
-
-        ## Load into database
-        sql = """
-              INSERT INTO public.fixturestatistics (dbfixtureid, \
-                                                    dbteamid, \
-                                                    shotsongoal, \
-                                                    shotsoffgoal, \
-                                                    totalshots, \
-                                                    blockedshots, \
-                                                    goalkeepersaves, \
-                                                    shotsinsidebox, \
-                                                    shotsoutsidebox, \
-                                                    cornerkicks, \
-                                                    offsides, \
-                                                    ballpossession, \
-                                                    totalpasses, \
-                                                    passesaccurate, \
-                                                    fouls, \
-                                                    yellowcards, \
-                                                    redcards, \
-                                                    data_source, \
-                                                    created_by)
-              VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) \
-              returning id \
-              """
-        ds = 'API-Football'
-        cb = 'gislobo'
-        params = (
-            databasefixtureid,
-            databaseteamid,
-            shotsongoal,
-            shotsoffgoal,
-            totalshots,
-            blockedshots,
-            goalkeepersaves,
-            shotsinsidebox,
-            shotsoutsidebox,
-            cornerkicks,
-            offsides,
-            ballpossession,
-            totalpasses,
-            passesaccurate,
-            fouls,
-            yellowcards,
-            redcards,
-            ds,
-            cb,
-        )
 
-        with conn:
-            with conn.cursor() as cur:
-                cur.execute(sql, params)
-                newid = cur.fetchone()[0]
-                print(f"New fixturestatistcs id: {newid}")
+PLAYERSTATISTICSCOLUMNS = (
+    "dbfixtureid", "dbteamid", "dbplayerid", "minutes", "number", "positionid", "rating", "captain",
+    "substitute", "offsides", "totalshots", "shotsongoal", "goals", "goalsconceded", "assists", "saves",
+    "totalpasses", "keypasses", "passesaccuracy", "tackles", "blocks", "interceptions", "duels", "duelswon",
+    "dribblesattempts", "dribblessuccess", "dribblespast", "foulscommitted", "foulsdrawn", "yellowcards",
+    "redcards", "penaltieswon", "penaltiescommitted", "penaltiesscored", "penaltiesmissed", "penaltiessaved",
+    "data_source", "created_by",
+)
 
-        print("")
-        print("---------------------------------")
 
+def insertplayerstatisticsrows(conn, rows, pagesize=500):
+    """
+    Bulk insert fixtureplayerstatistics rows (tuples in PLAYERSTATISTICSCOLUMNS order).
 
-def playerstatisticsfunction(payload, f, conn):
+    All rows go in a single transaction as multi-row INSERTs via execute_values,
+    so a fixture (or a batch of fixtures) costs one commit instead of one per player.
+    """
+    if not rows:
+        logger.debug("No player statistics rows to insert.")
+        return []
+    sql = f"insert into public.fixtureplayerstatistics ({', '.join(PLAYERSTATISTICSCOLUMNS)}) values %s returning id"
+    with conn:
+        with conn.cursor() as cur:
+            newids = psycopg2.extras.execute_values(cur, sql, rows, page_size=pagesize, fetch=True)
+    logger.info("...inserted %s player statistics rows.", len(newids))
+    return [row[0] for row in newids]
+
+
+def playerstatisticsfunction(payload, f, conn, rows=None, parked=False):
+    """
+    Ingest /fixtures/players for one fixture.
+
+    If rows is given, the parsed rows are appended to it and not written, so the
+    caller can insert a whole batch of fixtures with insertplayerstatisticsrows().
+    parked=True is for resolvepending.py re-ingesting players a headless run
+    parked; the fixture already having statistics doesn't stop them being written.
+    A normal run that writes the statistics itself resolves whatever was parked
+    for them. With rows given, the row keys parked on this call are returned for
+    the caller to pass to resolvewritten() once it has inserted the batch.
+    """
+    flush = rows is None
+    if rows is None:
+        rows = []
     ## Grab the database fixtureid
-    print("Grabbing the database fixture id...")
+    logger.debug("Grabbing the database fixture id...")
     with conn.cursor() as cur:
         cur.execute("SELECT apisportsid, id from public.fixture where apisportsid = %s", (f,))
         existingfixtures = cur.fetchall()
@@ -1599,116 +1350,103 @@ def playerstatisticsfunction(payload, f, conn):
     dbfixtureid = None
     if f in existingfixturesdict:
         dbfixtureid = existingfixturesdict[f]
-        print(f"The database fixture id is {dbfixtureid}.")
-        print("")
+        logger.debug("The database fixture id is %s.", dbfixtureid)
 
     ## See if the fixture already has player statistics
-    print("Checking if the fixture already has player statistics in the database...")
-    with conn.cursor() as cur:
-        cur.execute("select dbfixtureid from public.fixtureplayerstatistics")
-        existingfixturestatisticsidsfetchall = cur.fetchall()
-    existingfixturestatisticsids = {row[0] for row in existingfixturestatisticsidsfetchall}
-    if dbfixtureid in existingfixturestatisticsids:
-        print(f"The fixture {dbfixtureid} already has statistics in the database, exiting.")
-        return
-    print("...fixture does not have statistics in the database, proceeding.")
-    print("")
+    logger.debug("Checking if the fixture already has player statistics in the database...")
+    if not parked and fixturehasrows(conn, "fixtureplayerstatistics", dbfixtureid):
+        logger.debug("The fixture %s already has statistics in the database, exiting.", dbfixtureid)
+        return set()
+    logger.debug("...fixture does not have statistics in the database, proceeding.")
 
     ## Work out how to grab each team's statistics individually
     # API tells us how many events there are
-    print("Getting the number of results from the api...")
+    logger.debug("Getting the number of results from the api...")
     apiresults = payload.get("results") or {}
-    print(f"The API tells us there are {apiresults} results.")
-    print("")
+    logger.debug("The API tells us there are %s results.", apiresults)
 
     # Get the events into a list of dictionaries
-    print("Getting the responses into a list of dictionaries...")
+    logger.debug("Getting the responses into a list of dictionaries...")
     response = payload.get("response") or {}
-    print(f"Response:  {response}.")
-    print(f"There are {len(response)} events in the response.")
+    logger.debug("Response:  %s.", response)
+    logger.debug("There are %s events in the response.", len(response))
     if len(response) == apiresults:
-        print(
-            "The number of events in the response matches the number of events the API initially tells us there are.  Proceeding.")
-        print("")
+        logger.debug("The number of events in the response matches the number of events the API initially tells us there are.  Proceeding.")
     else:
-        print(
-            "Something is wrong, the number of events in the response doesn't match the number of events the API tells us there are.")
+        logger.error("Something is wrong, the number of events in the response doesn't match the number of events the API tells us there are.")
         sys.exit(0)
 
-    print("---------------------------")
-    print("")
+
+    # Resolve every player in the payload up front with one query
+    dimensions(conn).resolvemany("player", [
+        (player.get("player") or {}).get("id")
+        for event in response for player in (event.get("players") or [])
+    ])
 
     ## Start a for loop to grab info per player and store as variables
-    print("Starting the for loop to grab info per player...")
-    print("")
+    logger.debug("Starting the for loop to grab info per player...")
+    parkedrowkeys = set()
     count = 0
     for event in response:
         count += 1
-        print(f"Loop {count}:")
-        print(f"This loop's information:  {event}.")
+        logger.debug("Loop %s:", count)
+        logger.debug("This loop's information:  %s.", event)
 
         ## Get the database team id
-        print("Getting the database team id...")
+        logger.debug("Getting the database team id...")
         teaminfo = event.get("team") or {}
         apiteamid = teaminfo.get("id")
-        print(f"The api team id is {apiteamid}.")
-        print("")
+        logger.debug("The api team id is %s.", apiteamid)
 
         # Get a list of existing db team ids
-        print("Getting a list of existing db team ids...")
-        with conn.cursor() as cur:
-            cur.execute("SELECT apifootballid, id from public.team where apifootballid = %s", (apiteamid,))
-            existingteams = cur.fetchall()
-        existingteamsdict = {existingteam[0]: existingteam[1] for existingteam in existingteams if
-                             existingteam[0] is not None}
+        logger.debug("Getting a list of existing db team ids...")
+        existingteamsdict = dimensions(conn).resolvemany("team", [apiteamid])
         dbteamid = None
         if apiteamid in existingteamsdict:
             dbteamid = existingteamsdict[apiteamid]
-            print(f"The database team id is {dbteamid}.")
-            print("")
+            logger.debug("The database team id is %s.", dbteamid)
         else:
-            print(f"API Team ID {apiteamid} is not in your database.")
+            logger.error("API Team ID %s is not in your database.", apiteamid)
             sys.exit(0)
 
         ## Get the players into a list of dictionaries
         # API tells us how many players there are
-        print("Getting the number of players from the api...")
+        logger.debug("Getting the number of players from the api...")
         playersresults = event.get("players") or {}
-        print(f"The API tells us there are {len(playersresults)} players.")
-        print("")
+        logger.debug("The API tells us there are %s players.", len(playersresults))
 
         ## Loop through each player for individual stats
-        print("Looping through each player for individual stats...")
+        logger.debug("Looping through each player for individual stats...")
         count2 = 0
         for player in playersresults:
             count2 += 1
-            print(f"Player {count2} of {len(playersresults)}.")
-            print(f"This player's information:  {player}.")
+            logger.debug("Player %s of %s.", count2, len(playersresults))
+            logger.debug("This player's information:  %s.", player)
 
             ## Get db player id
-            print("Getting the database player id...")
+            logger.debug("Getting the database player id...")
             playerinfo = player.get("player") or {}
             apiplayerid = playerinfo.get("id")
-            print(f"This player's api player id is {apiplayerid}.")
+            logger.debug("This player's api player id is %s.", apiplayerid)
 
             # Get a list of existing db player ids
-            print("Getting a list of existing db player ids...")
-            with conn.cursor() as cur:
-                cur.execute("SELECT apifootballid, id from public.player where apifootballid = %s", (apiplayerid,))
-                existingplayers = cur.fetchall()
-            existingplayersdict = {existingplayer[0]: existingplayer[1] for existingplayer in existingplayers if
-                                   existingplayer[0] is not None}
+            logger.debug("Getting a list of existing db player ids...")
+            existingplayersdict = dimensions(conn).resolvemany("player", [apiplayerid])
             dbplayerid = None
             if apiplayerid in existingplayersdict:
                 dbplayerid = existingplayersdict[apiplayerid]
-                print(f"The database player id is {dbplayerid}.")
-                print("")
+                logger.debug("The database player id is %s.", dbplayerid)
             else:
-                print(f"API Player ID {apiplayerid} is not in your database.")
+                logger.warning("API Player ID %s is not in your database.", apiplayerid)
+                if HEADLESS:
+                    parkpending(conn, f, "playerstatistics", "player", apiplayerid, rowkey=str(apiplayerid),
+                                payload={"team": teaminfo, "players": [player]})
+                    parkedrowkeys.add(str(apiplayerid))
+                    continue
                 dbplayerid = int(input("Enter the database player id for this player:  "))
 
             ## Initialize statistics variables
-            print("Initializing statistics variables...")
+            logger.debug("Initializing statistics variables...")
             minutes = None
             number = None
             positionid = None
@@ -1742,11 +1480,10 @@ def playerstatisticsfunction(payload, f, conn):
             penaltiesscored = None
             penaltiesmissed = None
             penaltiessaved = None
-            print("...variables initialized.")
-            print("")
+            logger.debug("...variables initialized.")
 
             ## Loop through the player's statistics to get them into variables
-            print("Looping through the player's statistics to get them into the variables...")
+            logger.debug("Looping through the player's statistics to get them into the variables...")
             statisticslist = player.get("statistics") or []
 
             # Convert list to dictionary by taking the first element
@@ -1754,215 +1491,165 @@ def playerstatisticsfunction(payload, f, conn):
                 statistics = statisticslist[0]
             else:
                 statistics = {}
-            print(f"This player's stats:  {statistics}.")
-            print("")
+            logger.debug("This player's stats:  %s.", statistics)
 
             # Get the minutes played
-            print("Getting the minutes played...")
+            logger.debug("Getting the minutes played...")
             games = statistics.get("games") or {}
             minutes = games.get("minutes")
-            print(f"This player's minutes:  {minutes}.")
+            logger.debug("This player's minutes:  %s.", minutes)
 
             # Get the player's number worn:
-            print("Getting the player's number worn...")
+            logger.debug("Getting the player's number worn...")
             number = games.get("number")
-            print(f"This player's number:  {number}.")
+            logger.debug("This player's number:  %s.", number)
 
             # Get the player's position information, turn it into db position id
-            print("Getting the player's position information, and turning it into a db position id...")
+            logger.debug("Getting the player's position information, and turning it into a db position id...")
             apiposition = games.get("position")
-            print(f"Api position:  {apiposition}.")
-            # Query the database for position id, if it's not there, insert it
-            with conn.cursor() as cur:
-                cur.execute("select position, id from public.position")
-                existingpositions = cur.fetchall()
-            existingpositionsdict = {existingposition[0]: existingposition[1] for existingposition in existingpositions
-                                     if existingposition[0] is not None}
+            logger.debug("Api position:  %s.", apiposition)
+            # Look up the position id, if it's not there, insert it
+            existingpositionsdict = dimensions(conn).table("position")
             if apiposition in existingpositionsdict:
                 positionid = existingpositionsdict[apiposition]
-                print(f"The position already exists in the database, position id:  {positionid}.")
+                logger.debug("The position already exists in the database, position id:  %s.", positionid)
             else:
-                print(f"The position does not exist in the database, inserting it...")
+                logger.debug("The position does not exist in the database, inserting it...")
                 ds = 'API-Football'
                 cb = 'gislobo'
                 with conn:
                     with conn.cursor() as cur:
                         cur.execute("insert into public.position (position, data_source, created_by) values (%s, %s, %s) returning id", (apiposition, ds, cb,))
                         positionid = cur.fetchone()[0]
-                        print(f"...position inserted, position id:  {positionid}.")
+                        logger.info("...position inserted, position id:  %s.", positionid)
+                dimensions(conn).add("position", apiposition, positionid)
 
             # Get the player's rating, turn it from a string to numeric
-            print("Getting the player's rating, and turning it from a string to numeric...")
+            logger.debug("Getting the player's rating, and turning it from a string to numeric...")
             ratingstr = games.get("rating")
-            print(f"Api rating:  {ratingstr}.")
+            logger.debug("Api rating:  %s.", ratingstr)
             if ratingstr in ['-', '–', None, ''] or (
                     isinstance(ratingstr, str) and ratingstr.strip() in ['-', '–', '']):
-                print("This player has no rating, keeping rating as None.")
+                logger.debug("This player has no rating, keeping rating as None.")
                 pass  # keeps rating as None
             else:
                 try:
                     rating = float(ratingstr)
                 except (ValueError, TypeError):
-                    print(f"Warning: Could not convert rating '{ratingstr}' to float. Keeping as None.")
+                    logger.warning("Could not convert rating '%s' to float. Keeping as None.", ratingstr)
                     rating = None
-            print(f"This player's rating:  {rating}.")
+            logger.debug("This player's rating:  %s.", rating)
 
             # Get the player's captain status, it's a boolean
-            print("Getting the player's captain status, it's a boolean...")
+            logger.debug("Getting the player's captain status, it's a boolean...")
             captain = games.get("captain")
-            print(f"This player's captain status:  {captain}.")
+            logger.debug("This player's captain status:  %s.", captain)
 
             # Get the player's substitute status, it's a boolean
-            print("Getting the player's substitute status, it's a boolean...")
+            logger.debug("Getting the player's substitute status, it's a boolean...")
             substitute = games.get("substitute")
-            print(f"This player's substitute status:  {substitute}.")
+            logger.debug("This player's substitute status:  %s.", substitute)
 
             # Get how many times the player was flagged for offsides
-            print("Getting how many times the player was flagged for offsides...")
+            logger.debug("Getting how many times the player was flagged for offsides...")
             offsides = statistics.get("offsides")
-            print(f"This player's offsides:  {offsides}.")
+            logger.debug("This player's offsides:  %s.", offsides)
 
             # Get the player's shots information
-            print("Getting the player's shots information...")
+            logger.debug("Getting the player's shots information...")
             shots = statistics.get("shots") or {}
             totalshots = shots.get("total")
             shotsongoal = shots.get("on")
-            print(f"This player's total shots:  {totalshots}.")
-            print(f"This player's shots on goal:  {shotsongoal}.")
+            logger.debug("This player's total shots:  %s.", totalshots)
+            logger.debug("This player's shots on goal:  %s.", shotsongoal)
 
             # Get the player's goals information
-            print("Getting the player's goals information...")
+            logger.debug("Getting the player's goals information...")
             goalsinfo = statistics.get("goals") or {}
             goals = goalsinfo.get("total")
             goalsconceded = goalsinfo.get("conceded")
             assists = goalsinfo.get("assists")
             saves = goalsinfo.get("saves")
-            print(f"This player's goals:  {goals}.")
-            print(f"This player's goals conceded:  {goalsconceded}.")
-            print(f"This player's assists:  {assists}.")
-            print(f"This player's saves:  {saves}.")
+            logger.debug("This player's goals:  %s.", goals)
+            logger.debug("This player's goals conceded:  %s.", goalsconceded)
+            logger.debug("This player's assists:  %s.", assists)
+            logger.debug("This player's saves:  %s.", saves)
 
             # Get the player's passes information
-            print("Getting the player's passes information...")
+            logger.debug("Getting the player's passes information...")
             passes = statistics.get("passes") or {}
             totalpasses = passes.get("total")
             keypasses = passes.get("key")
             passesaccuracystr = passes.get("accuracy")
-            print(f"This player's total passes:  {totalpasses}.")
-            print(f"This player's key passes:  {keypasses}.")
+            logger.debug("This player's total passes:  %s.", totalpasses)
+            logger.debug("This player's key passes:  %s.", keypasses)
             if passesaccuracystr is not None:
                 passesaccuracy = float(passesaccuracystr.strip('%'))
-            print(f"This player's passes accuracy:  {passesaccuracy}.")
+            logger.debug("This player's passes accuracy:  %s.", passesaccuracy)
 
             # Get the player's tackles information
-            print("Getting the player's tackles information...")
+            logger.debug("Getting the player's tackles information...")
             tacklesinfo = statistics.get("tackles") or {}
             tackles = tacklesinfo.get("total")
             blocks = tacklesinfo.get("blocks")
             interceptions = tacklesinfo.get("interceptions")
-            print(f"This player's tackles:  {tackles}.")
-            print(f"This player's blocks:  {blocks}.")
-            print(f"This player's interceptions:  {interceptions}.")
+            logger.debug("This player's tackles:  %s.", tackles)
+            logger.debug("This player's blocks:  %s.", blocks)
+            logger.debug("This player's interceptions:  %s.", interceptions)
 
             # Get the player's duels information
-            print("Getting the player's duels information...")
+            logger.debug("Getting the player's duels information...")
             duelsinfo = statistics.get("duels") or {}
             duels = duelsinfo.get("total")
             duelswon = duelsinfo.get("won")
-            print(f"This player's duels:  {duels}.")
-            print(f"This player's duels won:  {duelswon}.")
+            logger.debug("This player's duels:  %s.", duels)
+            logger.debug("This player's duels won:  %s.", duelswon)
 
             # Get the player's dribbles information
-            print("Getting the player's dribbles information...")
+            logger.debug("Getting the player's dribbles information...")
             dribblesinfo = statistics.get("dribbles") or {}
             dribblesattempts = dribblesinfo.get("attempts")
             dribblessuccess = dribblesinfo.get("success")
             dribblespast = dribblesinfo.get("past")
-            print(f"This player's dribbles attempts:  {dribblesattempts}.")
-            print(f"This player's dribbles success:  {dribblessuccess}.")
-            print(f"This player's dribbles past:  {dribblespast}.")
+            logger.debug("This player's dribbles attempts:  %s.", dribblesattempts)
+            logger.debug("This player's dribbles success:  %s.", dribblessuccess)
+            logger.debug("This player's dribbles past:  %s.", dribblespast)
 
             # Get the player's fouls information
-            print("Getting the player's fouls information...")
+            logger.debug("Getting the player's fouls information...")
             foulsinfo = statistics.get("fouls") or {}
             foulscommitted = foulsinfo.get("committed")
             foulsdrawn = foulsinfo.get("drawn")
-            print(f"This player's fouls committed:  {foulscommitted}.")
-            print(f"This player's fouls drawn:  {foulsdrawn}.")
+            logger.debug("This player's fouls committed:  %s.", foulscommitted)
+            logger.debug("This player's fouls drawn:  %s.", foulsdrawn)
 
             # Get the player's cards information
-            print("Getting the player's cards information...")
+            logger.debug("Getting the player's cards information...")
             cardsinfo = statistics.get("cards") or {}
             yellowcards = cardsinfo.get("yellow")
             redcards = cardsinfo.get("red")
-            print(f"This player's yellow cards:  {yellowcards}.")
-            print(f"This player's red cards:  {redcards}.")
+            logger.debug("This player's yellow cards:  %s.", yellowcards)
+            logger.debug("This player's red cards:  %s.", redcards)
 
             # Get the player's penalties information
-            print("Getting the player's penalties information...")
+            logger.debug("Getting the player's penalties information...")
             penaltiesinfo = statistics.get("penalty") or {}
             penaltieswon = penaltiesinfo.get("won")
             penaltiescommitted = penaltiesinfo.get("committed")
             penaltiesscored = penaltiesinfo.get("scored")
             penaltiesmissed = penaltiesinfo.get("missed")
             penaltiessaved = penaltiesinfo.get("saved")
-            print(f"This player's penalties won:  {penaltieswon}.")
-            print(f"This player's penalties committed:  {penaltiescommitted}.")
-            print(f"This player's penalties scored:  {penaltiesscored}.")
-            print(f"This player's penalties missed:  {penaltiesmissed}.")
-            print(f"This player's penalties saved:  {penaltiessaved}.")
-            print("")
-            print("We now have all of this player's stats into variables.")
-            print("")
-
-            # Now we insert this information into the database
-            print("Now we insert this information into the database...")
-            sql = """
-                  insert into public.fixtureplayerstatistics (dbfixtureid, \
-                                                              dbteamid, \
-                                                              dbplayerid, \
-                                                              minutes, \
-                                                              number, \
-                                                              positionid, \
-                                                              rating, \
-                                                              captain, \
-                                                              substitute, \
-                                                              offsides, \
-                                                              totalshots, \
-                                                              shotsongoal, \
-                                                              goals, \
-                                                              goalsconceded, \
-                                                              assists, \
-                                                              saves, \
-                                                              totalpasses, \
-                                                              keypasses, \
-                                                              passesaccuracy, \
-                                                              tackles, \
-                                                              blocks, \
-                                                              interceptions, \
-                                                              duels, \
-                                                              duelswon, \
-                                                              dribblesattempts, \
-                                                              dribblessuccess, \
-                                                              dribblespast, \
-                                                              foulscommitted, \
-                                                              foulsdrawn, \
-                                                              yellowcards, \
-                                                              redcards, \
-                                                              penaltieswon, \
-                                                              penaltiescommitted, \
-                                                              penaltiesscored, \
-                                                              penaltiesmissed, \
-                                                              penaltiessaved, \
-                                                              data_source, \
-                                                              created_by)
-                  values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, \
-                          %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) \
-                  returning id \
-                  """
+            logger.debug("This player's penalties won:  %s.", penaltieswon)
+            logger.debug("This player's penalties committed:  %s.", penaltiescommitted)
+            logger.debug("This player's penalties scored:  %s.", penaltiesscored)
+            logger.debug("This player's penalties missed:  %s.", penaltiesmissed)
+            logger.debug("This player's penalties saved:  %s.", penaltiessaved)
+            logger.debug("We now have all of this player's stats into variables.")
+
+            # Queue the row; the whole fixture is written in one statement below
             ds = 'API-Football'
             cb = 'gislobo'
-            params = (
+            rows.append((
                 dbfixtureid,
                 dbteamid,
                 dbplayerid,
@@ -2001,29 +1688,26 @@ def playerstatisticsfunction(payload, f, conn):
                 penaltiessaved,
                 ds,
                 cb,
-            )
+            ))
 
-            with conn:
-                with conn.cursor() as cur:
-                    cur.execute(sql, params)
-                    newid = cur.fetchone()[0]
-                    print(f"...insert successful, new id:  {newid}.")
 
-            print("")
-            print("---------------------------------")
-            print("")
+    # Write every player's row for this fixture in one statement and one transaction,
+    # unless the caller is collecting rows across a batch of fixtures
+    if flush:
+        insertplayerstatisticsrows(conn, rows)
+        markingested("fixtureplayerstatistics", dbfixtureid)
+        if not parked:
+            resolvewritten(conn, f, "playerstatistics", parkedrowkeys)
+    return parkedrowkeys
 
 
 def coachwork(ac, h, aid, c):
     ## Call the coach info from api
     # Set the api path
     coachespath = f"/coachs?id={aid}"
-    print("Making the request to the api...")
-    ac.request("GET", coachespath, headers=h)
-    cres = ac.getresponse()
-    craw = cres.read()
-    cpayload = json.loads(craw.decode("utf-8"))
-    print(f"coach payload: {cpayload}")
+    logger.debug("Making the request to the api...")
+    cpayload = ac.getjson(coachespath)
+    logger.debug("coach payload: %s", cpayload)
 
     ## Get coach info into variables
     # Initialize variables
@@ -2046,13 +1730,13 @@ def coachwork(ac, h, aid, c):
         cresponse = cresponselist[0]
     else:
         cresponse = {}
-    print(f"coach response:  {cresponse}.")
+    logger.debug("coach response:  %s.", cresponse)
 
     # Get the names
     firstname = cresponse.get("firstname")
     lastname = cresponse.get("lastname")
-    print(f"coach firstname:  {firstname}.")
-    print(f"coach lastname:  {lastname}.")
+    logger.debug("coach firstname:  %s.", firstname)
+    logger.debug("coach lastname:  %s.", lastname)
 
     # Get birth info
     birthinfo = cresponse.get("birth") or {}
@@ -2064,11 +1748,11 @@ def coachwork(ac, h, aid, c):
         birthcountrycode = next(iter(birthcountrycodemap.values()))
     else:
         birthcountrycode = None
-        print(f"Warning: No match found for birth country '{birthcountry}'. Leaving NULL.")
-    print(f"coach birthdate:  {birthdate}.")
-    print(f"coach birthplace:  {birthplace}.")
-    print(f"coach birthcountry:  {birthcountry}.")
-    print(f"coach birthcountrycode:  {birthcountrycode}.")
+        logger.warning("No match found for birth country '%s'. Leaving NULL.", birthcountry)
+    logger.debug("coach birthdate:  %s.", birthdate)
+    logger.debug("coach birthplace:  %s.", birthplace)
+    logger.debug("coach birthcountry:  %s.", birthcountry)
+    logger.debug("coach birthcountrycode:  %s.", birthcountrycode)
 
     # Get nationality info
     apinationality = cresponse.get("nationality")
@@ -2077,9 +1761,9 @@ def coachwork(ac, h, aid, c):
         nationality = next(iter(nationalitycodemap.values()))
     else:
         nationality = None
-        print(f"Warning: No match found for nationality '{apinationality}'. Leaving NULL.")
-    print(f"coach apinationality:  {apinationality}.")
-    print(f"coach nationality:  {nationality}.")
+        logger.warning("No match found for nationality '%s'. Leaving NULL.", apinationality)
+    logger.debug("coach apinationality:  %s.", apinationality)
+    logger.debug("coach nationality:  %s.", nationality)
 
     ## Load into database
     sql = """
@@ -2104,14 +1788,124 @@ def coachwork(ac, h, aid, c):
         with c.cursor() as cur:
             cur.execute(sql, params)
             newid = cur.fetchone()[0]
-            print(f"New coach id: {newid}.")
+            logger.info("New coach id: %s.", newid)
 
     return newid
 
 
-def lineupsfunction(payload, f, conn, headers, apiconn):
+# Placeholder player id the wide fixturelineups table uses for players missing from public.player
+UNKNOWNPLAYERID = 707
+
+# "wide" writes public.fixturelineups; "normalized" writes fixturelineupteam and
+# fixturelineupplayer (sql/fixturelineupplayer.sql). Set with setlineupstorage().
+LINEUPSTORAGE = "wide"
+LINEUPTABLES = {
+    "wide": "fixturelineups",
+    "normalized": "fixturelineupteam",
+}
+
+
+def setlineupstorage(mode):
+    """Switch lineup ingestion between the wide and normalized tables."""
+    global LINEUPSTORAGE
+    INGESTEDTABLES.pop(LINEUPTABLES[LINEUPSTORAGE], None)
+    INGESTEDTABLES[LINEUPTABLES[mode]] = "fixtureid"
+    LINEUPSTORAGE = mode
+
+
+def lineupapiplayerids(response):
+    """Every api player id in the startXI and substitutes of a /fixtures/lineups response."""
+    return [
+        (entry.get("player") or {}).get("id")
+        for event in response
+        for entry in (event.get("startXI") or []) + (event.get("substitutes") or [])
+    ]
+
+
+def getformationid(conn, formation):
+    existingformationsdict = dimensions(conn).table("formation")
+    if formation in existingformationsdict:
+        return existingformationsdict[formation]
+    logger.debug("Formation %s is not in your database.", formation)
+    logger.debug("Adding formation to database...")
+    ds = 'API-Football'
+    cb = 'gislobo'
+    with conn:
+        with conn.cursor() as cur:
+            cur.execute("insert into public.formation (formation, data_source, created_by) values (%s, %s, %s) returning id", (formation, ds, cb,))
+            formationid = cur.fetchone()[0]
+    dimensions(conn).add("formation", formation, formationid)
+    return formationid
+
+
+LINEUPTEAMCOLUMNS = ("fixtureid", "teamid", "coachid", "formationid", "data_source", "created_by")
+LINEUPPLAYERCOLUMNS = (
+    "fixtureid", "teamid", "playerid", "apiplayerid", "slot", "role", "grid", "position",
+    "data_source", "created_by",
+)
+
+
+def normalizedlineupsfunction(payload, fixtureid, conn, headers, apiclient):
+    """
+    Write a fixture's lineups as one fixturelineupteam row per team and one
+    fixturelineupplayer row per player.
+
+    Teams, coaches and all players of both lineups are each resolved with one
+    query, and both tables are written in a single transaction. Players missing
+    from public.player are stored with a NULL playerid and their api id.
+    """
+    response = payload.get("response") or []
+    dims = dimensions(conn)
+    teamids = dims.resolvemany("team", [(event.get("team") or {}).get("id") for event in response])
+    coachids = dims.resolvemany("coach", [(event.get("coach") or {}).get("id") for event in response])
+    playerids = dims.resolvemany("player", lineupapiplayerids(response))
+
+    ds = 'API-Football'
+    cb = 'gislobo'
+    teamrows = []
+    playerrows = []
+    for event in response:
+        apiteamid = (event.get("team") or {}).get("id")
+        if apiteamid not in teamids:
+            logger.error("API Team ID %s is not in your database.", apiteamid)
+            sys.exit(0)
+        dbteamid = teamids[apiteamid]
+
+        apicoachid = (event.get("coach") or {}).get("id")
+        coachid = coachids.get(apicoachid)
+        if coachid is None and apicoachid is not None:
+            logger.debug("API Coach ID %s is not in your database, adding coach to database...", apicoachid)
+            coachid = coachwork(apiclient, headers, apicoachid, conn)
+            dims.add("coach", apicoachid, coachid)
+
+        formationid = getformationid(conn, event.get("formation"))
+        teamrows.append((fixtureid, dbteamid, coachid, formationid, ds, cb))
+
+        for role, entries in (("starter", event.get("startXI") or []), ("substitute", event.get("substitutes") or [])):
+            for slot, entry in enumerate(entries, start=1):
+                player = entry.get("player") or {}
+                apiplayerid = player.get("id")
+                if apiplayerid not in playerids:
+                    logger.warning("Player %s (%s) is not in the database, storing a NULL playerid.", apiplayerid, player.get('name'))
+                playerrows.append((
+                    fixtureid, dbteamid, playerids.get(apiplayerid), apiplayerid, slot, role,
+                    player.get("grid"), player.get("pos"), ds, cb,
+                ))
+
+    with conn:
+        with conn.cursor() as cur:
+            psycopg2.extras.execute_values(
+                cur, f"insert into public.fixturelineupteam ({', '.join(LINEUPTEAMCOLUMNS)}) values %s", teamrows)
+            psycopg2.extras.execute_values(
+                cur, f"insert into public.fixturelineupplayer ({', '.join(LINEUPPLAYERCOLUMNS)}) values %s",
+                playerrows, page_size=max(len(playerrows), 1))
+    logger.info("...inserted %s lineups with %s players.", len(teamrows), len(playerrows))
+    markingested("fixturelineupteam", fixtureid)
+
+
+def lineupsfunction(payload, f, conn, headers, apiclient):
     ## Grab the database fixtureid
-    print("Grabbing the database fixture id...")
+    logger.debug("Grabbing the database fixture id...")
     with conn.cursor() as cur:
         cur.execute("SELECT apisportsid, id from public.fixture where apisportsid = %s", (f,))
         existingfixtures = cur.fetchall()
@@ -2120,123 +1914,88 @@ def lineupsfunction(payload, f, conn, headers, apiconn):
     fixtureid = None
     if f in existingfixturesdict:
         fixtureid = existingfixturesdict[f]
-        print(f"The database fixture id is {fixtureid}.")
-        print("")
+        logger.debug("The database fixture id is %s.", fixtureid)
 
     ## See if the fixture already has lineups
-    print("Checking if the fixture already has lineups in the database...")
-    with conn.cursor() as cur:
-        cur.execute("select fixtureid from public.fixturelineups")
-        existingfixturelineupsidsfetchall = cur.fetchall()
-    existingfixturelineupsids = {row[0] for row in existingfixturelineupsidsfetchall}
-    if fixtureid in existingfixturelineupsids:
-        print(f"The fixture {fixtureid} already has lineups in the database, exiting.")
+    logger.debug("Checking if the fixture already has lineups in the database...")
+    if fixturehasrows(conn, LINEUPTABLES[LINEUPSTORAGE], fixtureid):
+        logger.debug("The fixture %s already has lineups in the database, exiting.", fixtureid)
         return
-    print("...fixture does not have lineups in the database, proceeding.")
-    print("")
+    logger.debug("...fixture does not have lineups in the database, proceeding.")
 
     # Get the response into a list of dictionaries
-    print("Getting the response into a list of dictionaries...")
+    logger.debug("Getting the response into a list of dictionaries...")
     response = payload.get("response") or {}
-    print(response)
+    logger.debug("%s", response)
     if len(response) != 2:
-        print("Something is wrong, the number of responses is not 2.")
+        logger.error("Something is wrong, the number of responses is not 2.")
         sys.exit(0)
     else:
-        print(f"There are {len(response)} responses, and there should be 2.")
-        print("")
+        logger.debug("There are %s responses, and there should be 2.", len(response))
 
-    print("---------------------------")
-    print("")
+    if LINEUPSTORAGE == "normalized":
+        normalizedlineupsfunction(payload, fixtureid, conn, headers, apiclient)
+        return
+
+
+    # Resolve every player of both lineups with one query; the loops below then hit the cache
+    dimensions(conn).resolvemany("player", lineupapiplayerids(response))
 
     ## Starting a loop to grab info and store the variables
-    print("Starting the loop to grab info and store the variables...")
-    print("")
+    logger.debug("Starting the loop to grab info and store the variables...")
     count = 0
     for event in response:
         count += 1
-        print(f"Loop {count}:")
-        print(f"This loop's information:  {event}.")
-        print("")
+        logger.debug("Loop %s:", count)
+        logger.debug("This loop's information:  %s.", event)
 
         ## Get the database team id
-        print("Getting the database team id...")
+        logger.debug("Getting the database team id...")
         teaminfo = event.get("team") or {}
         apiteamid = teaminfo.get("id")
-        print(f"The api team id is {apiteamid}.")
+        logger.debug("The api team id is %s.", apiteamid)
 
         # Get a list of existing db team ids
-        print("Getting a list of existing db team ids...")
-        with conn.cursor() as cur:
-            cur.execute("SELECT apifootballid, id from public.team where apifootballid = %s", (apiteamid,))
-            existingteams = cur.fetchall()
-        existingteamsdict = {existingteam[0]: existingteam[1] for existingteam in existingteams if
-                             existingteam[0] is not None}
+        logger.debug("Getting a list of existing db team ids...")
+        existingteamsdict = dimensions(conn).resolvemany("team", [apiteamid])
         dbteamid = None
         if apiteamid in existingteamsdict:
             dbteamid = existingteamsdict[apiteamid]
-            print(f"The database team id is {dbteamid}.")
-            print("")
+            logger.debug("The database team id is %s.", dbteamid)
         else:
-            print(f"API Team ID {apiteamid} is not in your database.")
+            logger.error("API Team ID %s is not in your database.", apiteamid)
             sys.exit(0)
 
         ## Get the coach id
-        print("Getting the coach id...")
+        logger.debug("Getting the coach id...")
         coachinfo = event.get("coach") or {}
         apicoachid = coachinfo.get("id")
-        print(f"The api coach id is {apicoachid}.")
+        logger.debug("The api coach id is %s.", apicoachid)
 
         # Get a list of existing db coach ids
-        print("Getting a list of existing db coach ids...")
-        with conn.cursor() as cur:
-            cur.execute("select apifootballid, id from public.coach where apifootballid = %s", (apicoachid,))
-            existingcoaches = cur.fetchall()
-        existingcoachesdict = {existingcoach[0]: existingcoach[1] for existingcoach in existingcoaches if
-                               existingcoach[0] is not None}
+        logger.debug("Getting a list of existing db coach ids...")
+        existingcoachesdict = dimensions(conn).resolvemany("coach", [apicoachid])
         coachid = None
         if apicoachid in existingcoachesdict:
             coachid = existingcoachesdict[apicoachid]
-            print(f"The database coach id is {coachid}.")
-            print("")
+            logger.debug("The database coach id is %s.", coachid)
         else:
-            print(f"API Coach ID {apicoachid} is not in your database.")
-            print("Adding coach to database...")
-            coachid = coachwork(apiconn, headers, apicoachid, conn)
-            print(f"The coach id is {coachid}.")
-            print("")
+            logger.debug("API Coach ID %s is not in your database.", apicoachid)
+            logger.debug("Adding coach to database...")
+            coachid = coachwork(apiclient, headers, apicoachid, conn)
+            dimensions(conn).add("coach", apicoachid, coachid)
+            logger.debug("The coach id is %s.", coachid)
 
         ## Get the formation id
         formation = event.get("formation")
-        print(f"The formation is {formation}.")
+        logger.debug("The formation is %s.", formation)
 
-        # Get a list of existing db formations
-        print("Getting a list of existing db formations...")
-        with conn.cursor() as cur:
-            cur.execute("select formation, id from public.formation")
-            existingformations = cur.fetchall()
-        existingformationsdict = {existingformation[0]: existingformation[1] for existingformation in existingformations
-                                  if existingformation[0] is not None}
-        formationid = None
-        if formation in existingformationsdict:
-            formationid = existingformationsdict[formation]
-            print(f"The database formation id is {formationid}.")
-            print("")
-        else:
-            print(f"Formation {formation} is not in your database.")
-            print("Adding formation to database...")
-            ds = 'API-Football'
-            cb = 'gislobo'
-            with conn:
-                with conn.cursor() as cur:
-                    cur.execute("insert into public.formation (formation, data_source, created_by) values (%s, %s, %s) returning id", (formation, ds, cb,))
-                    formationid = cur.fetchone()[0]
-                    print(f"The formation id is {formationid}.")
-                    print("")
+        formationid = getformationid(conn, formation)
+        logger.debug("The database formation id is %s.", formationid)
 
         ## Get the player ids
         # Get the starter ids
-        print("Getting the starter ids...")
+        logger.debug("Getting the starter ids...")
         starters = event.get("startXI") or []
 
         # Initialize starter variables
@@ -2253,65 +2012,63 @@ def lineupsfunction(payload, f, conn, headers, apiconn):
         starter11 = None
 
         # Loop through starters
-        print("Looping through starters...")
+        logger.debug("Looping through starters...")
         count1 = 0
         for starter in starters:
             count1 += 1
-            print(f"This starter is {starter}.")
+            logger.debug("This starter is %s.", starter)
             player = starter.get("player") or {}
             apiplayerid = player.get("id")
-            print(f"The api player id is {apiplayerid}.")
+            logger.debug("The api player id is %s.", apiplayerid)
 
             # Get db player id
-            try:
-                with conn.cursor() as cur:
-                    cur.execute("SELECT id from public.player WHERE apifootballid = %s", (apiplayerid,))
-                    databaseplayerid = cur.fetchone()[0]
-                print(f"The database player id is {databaseplayerid}.")
-            except TypeError:
-                print(f"The player doesn't exist in the database, setting playerid to 707 (null).")
-                databaseplayerid = 707
+            databaseplayerid = dimensions(conn).get("player", apiplayerid)
+            if databaseplayerid is not None:
+                logger.debug("The database player id is %s.", databaseplayerid)
+            else:
+                logger.warning("The player doesn't exist in the database, setting playerid to %s (null).", UNKNOWNPLAYERID)
+                databaseplayerid = UNKNOWNPLAYERID
 
             # Set starter variables
             if count1 == 1:
                 starter1 = databaseplayerid
-                print(f"Starter 1 is {starter1}.")
+                logger.debug("Starter 1 is %s.", starter1)
             elif count1 == 2:
                 starter2 = databaseplayerid
-                print(f"Starter 2 is {starter2}.")
+                logger.debug("Starter 2 is %s.", starter2)
             elif count1 == 3:
                 starter3 = databaseplayerid
-                print(f"Starter 3 is {starter3}.")
+                logger.debug("Starter 3 is %s.", starter3)
             elif count1 == 4:
                 starter4 = databaseplayerid
-                print(f"Starter 4 is {starter4}.")
+                logger.debug("Starter 4 is %s.", starter4)
             elif count1 == 5:
                 starter5 = databaseplayerid
-                print(f"Starter 5 is {starter5}.")
+                logger.debug("Starter 5 is %s.", starter5)
             elif count1 == 6:
                 starter6 = databaseplayerid
-                print(f"Starter 6 is {starter6}.")
+                logger.debug("Starter 6 is %s.", starter6)
             elif count1 == 7:
                 starter7 = databaseplayerid
-                print(f"Starter 7 is {starter7}.")
+                logger.debug("Starter 7 is %s.", starter7)
             elif count1 == 8:
                 starter8 = databaseplayerid
-                print(f"Starter 8 is {starter8}.")
+                logger.debug("Starter 8 is %s.", starter8)
             elif count1 == 9:
                 starter9 = databaseplayerid
-                print(f"Starter 9 is {starter9}.")
+                logger.debug("Starter 9 is %s.", starter9)
             elif count1 == 10:
                 starter10 = databaseplayerid
-                print(f"Starter 10 is {starter10}.")
+                logger.debug("Starter 10 is %s.", starter10)
             elif count1 == 11:
                 starter11 = databaseplayerid
-                print(f"Starter 11 is {starter11}.")
+                logger.debug("Starter 11 is %s.", starter11)
             else:
-                print("Something is wrong, the number of starters is not 11.")
+                logger.error("Something is wrong, the number of starters is not 11.")
                 sys.exit(0)
 
         # Get the substitute ids
-        print("Getting the substitute ids...")
+        logger.debug("Getting the substitute ids...")
         substitutes = event.get("substitutes") or []
 
         # Initialize substitute variables
@@ -2329,68 +2086,66 @@ def lineupsfunction(payload, f, conn, headers, apiconn):
         substitute12 = None
 
         # Loop through substitutes
-        print("Looping through substitutes...")
+        logger.debug("Looping through substitutes...")
         count2 = 0
         for substitute in substitutes:
             count2 += 1
-            print(f"This substitute is {substitute}.")
+            logger.debug("This substitute is %s.", substitute)
             player = substitute.get("player") or {}
             apiplayerid = player.get("id")
-            print(f"The api player id is {apiplayerid}.")
+            logger.debug("The api player id is %s.", apiplayerid)
 
             # Get db player id
-            try:
-                with conn.cursor() as cur:
-                    cur.execute("SELECT id from public.player WHERE apifootballid = %s", (apiplayerid,))
-                    databaseplayerid = cur.fetchone()[0]
-                print(f"The database player id is {databaseplayerid}.")
-            except TypeError:
-                print(f"The player doesn't exist in the database, setting playerid to 707 (null).")
-                databaseplayerid = 707
+            databaseplayerid = dimensions(conn).get("player", apiplayerid)
+            if databaseplayerid is not None:
+                logger.debug("The database player id is %s.", databaseplayerid)
+            else:
+                logger.warning("The player doesn't exist in the database, setting playerid to %s (null).", UNKNOWNPLAYERID)
+                databaseplayerid = UNKNOWNPLAYERID
 
             # Set substitute variables
             if count2 == 1:
                 substitute1 = databaseplayerid
-                print(f"Substitute 1 is {substitute1}.")
+                logger.debug("Substitute 1 is %s.", substitute1)
             elif count2 == 2:
                 substitute2 = databaseplayerid
-                print(f"Substitute 2 is {substitute2}.")
+                logger.debug("Substitute 2 is %s.", substitute2)
             elif count2 == 3:
                 substitute3 = databaseplayerid
-                print(f"Substitute 3 is {substitute3}.")
+                logger.debug("Substitute 3 is %s.", substitute3)
             elif count2 == 4:
                 substitute4 = databaseplayerid
-                print(f"Substitute 4 is {substitute4}.")
+                logger.debug("Substitute 4 is %s.", substitute4)
             elif count2 == 5:
                 substitute5 = databaseplayerid
-                print(f"Substitute 5 is {substitute5}.")
+                logger.debug("Substitute 5 is %s.", substitute5)
             elif count2 == 6:
                 substitute6 = databaseplayerid
-                print(f"Substitute 6 is {substitute6}.")
+                logger.debug("Substitute 6 is %s.", substitute6)
             elif count2 == 7:
                 substitute7 = databaseplayerid
-                print(f"Substitute 7 is {substitute7}.")
+                logger.debug("Substitute 7 is %s.", substitute7)
             elif count2 == 8:
                 substitute8 = databaseplayerid
-                print(f"Substitute 8 is {substitute8}.")
+                logger.debug("Substitute 8 is %s.", substitute8)
             elif count2 == 9:
                 substitute9 = databaseplayerid
-                print(f"Substitute 9 is {substitute9}.")
+                logger.debug("Substitute 9 is %s.", substitute9)
             elif count2 == 10:
                 substitute10 = databaseplayerid
-                print(f"Substitute 10 is {substitute10}.")
+                logger.debug("Substitute 10 is %s.", substitute10)
             elif count2 == 11:
                 substitute11 = databaseplayerid
-                print(f"Substitute 11 is {substitute11}.")
+                logger.debug("Substitute 11 is %s.", substitute11)
             elif count2 == 12:
                 substitute12 = databaseplayerid
-                print(f"Substitute 12 is {substitute12}.")
+                logger.debug("Substitute 12 is %s.", substitute12)
             else:
-                print("Something is wrong, the number of substitutes is more than 12.")
+                logger.error("Something is wrong, the number of substitutes is more than 12.")
                 sys.exit(0)
 
         # Inserting variables into database
-        print("Inserting variables into database...")
+        logger.debug("Inserting variables into database...")
         sql = """
               insert into public.fixturelineups (fixtureid, \
                                                  teamid, \
@@ -2462,76 +2217,157 @@ def lineupsfunction(payload, f, conn, headers, apiconn):
             with conn.cursor() as cur:
                 cur.execute(sql, params)
                 newid = cur.fetchone()[0]
-                print(f"...insert successful, new id: {newid}.")
+                logger.info("...insert successful, new id: %s.", newid)
 
-        print("")
-        print("---------------------------------")
-        print("")
 
+    markingested("fixturelineups", fixtureid)
 
 
+FIXTUREENDPOINTS = {
+    "fixture": "/fixtures?id={fixture}",
+    "events": "/fixtures/events?fixture={fixture}",
+    "statistics": "/fixtures/statistics?fixture={fixture}",
+    "playerstatistics": "/fixtures/players?fixture={fixture}",
+    "lineups": "/fixtures/lineups?fixture={fixture}",
+}
 
-def main():
-    # list out fixtures
-    ## 2017 fixture list
-    # fixturelist = [147926, 147936, 147940, 147953, 147967, 147976, 147992, 148006, 148019, 148029, 148043, 148057,
-    #                148066, 148074, 148078, 148088, 148096, 280488, 280464, 148109, 148114, 148131, 148143, 148164,
-    #                148186, 148194, 148217, 148219, 148221, 148232, 148243, 148245, 148255, 148264, 148271, 148281,
-    #                147915]
-    ## 2018 !!!MLS!!! fixture list
-    # fixturelist = [147510, 147526, 147533, 147548, 147555, 147573, 147582, 147586, 147604, 147608, 147621, 147633,
-    #                147646, 147656, 147662, 147672, 147686, 147690, 147701, 147705, 147727, 147730, 147745, 147755,
-    #                147788, 147794, 147816, 147822, 147835, 147838, 147857, 147860, 147882, 147894]
-    ## 2018 NON-MLS fixture list [280386, 280371, 147501, 147502, 147493, 147494, 147492]
-    ## 2019 MLS regular season and MLS playoffs fixture list]
-    # fixturelist = [128178, 128189, 128200, 128213, 128237, 128251, 128266, 128286, 128287, 128301, 128305, 128316,
-    #                128321, 128332, 128339, 128364, 128370, 128381, 128396, 128408, 128410, 128424, 128429, 128440,
-    #                128461, 128481, 128486, 128502, 128521, 128531, 128534, 128546, 128555, 128564, 246444, 250195,
-    #                250198]
-    ## 2020 MLS regular season and MLS is back tournament fixture list
-    # fixturelist = [634454, 634443, 634431, 634415, 634407, 634394, 634376, 634363, 634349, 628454, 628438, 628427,
-    #                588656, 588611, 588644, 588627, 588616, 588600, 566056, 566043, 566031, 564278, 564266]
-    ## 2021 MLS regular season and the one MLS playoff game
-    # fixturelist = [684131, 684144, 695168, 695187, 695199, 695219, 695227, 695246, 695249, 695269, 695278, 695296,
-    #                695297, 695311, 695323, 695340, 695355, 695366, 695387, 695393, 695410, 695419, 695437, 695452,
-    #                695463, 695476, 695490, 695505, 695521, 695529, 695554, 695567, 695578, 695582, 812188]
-    ## 2022 MLS regular season (no playoffs)
-    # fixturelist= [816726, 816738, 816757, 816762, 816779, 816790, 816805, 816827, 816835, 816848, 816871, 816887,
-    #               816900, 816927, 816934, 816952, 816956, 816972, 816982, 816999, 817019, 817023, 817041,
-    #               817055, 817069, 817084, 817097, 817106, 817118, 817131, 817147, 817152, 817166, 817178]
-    ## 2023 MLS regular season and playoffs (one round)
-    # fixturelist= [980793, 980806, 980818, 980832, 980846, 980857, 980876, 980888, 980908, 980909, 980924, 980935,
-    #               980948, 980968, 980977, 980987, 981010, 981012, 981030, 981046, 981067, 981076, 981086, 981094,
-    #               981118, 981120, 981133, 981150, 981162, 981176, 981187, 981217, 981224, 981239, 1139501, 1139505,
-    #               1139513]
-    ## 2024 MLS regular season and playoffs
-    # fixturelist= [1150755, 1150785, 1150810, 1150817, 1150837, 1150844, 1150864, 1150866, 1150889, 1150895, 1150908,
-    #               1150922, 1150935, 1150950, 1150965, 1150989, 1150995, 1151010, 1151029, 1151037, 1151052,
-    #               1151068, 1151078, 1151090, 1151105, 1151130, 1151132, 1151151, 1151164, 1151181, 1151198, 1151205,
-    #               1151220, 1151238, 1312300, 1312865, 1312866, 1312867, 1315362]
-    ## 2025 MLS regular season (no playoffs)
-    # fixturelist = [1326235, 1326247, 1326263, 1326288, 1326289,
-    #                1326305, 1326318, 1326330, 1326349, 1326362, 1326372, 1326386, 1326405, 1326415, 1326439, 1326440,
-    #                1326458, 1326471, 1326484, 1326515, 1326529, 1326538, 1326551, 1326570, 1326578, 1326602, 1326617,
-    #                1326630, 1326637, 1326739, 1326671, 1326694, 1326496, 1326695]
-    fixturelist = [1326247, 1326263, 1326288, 1326289,
-                   1326305, 1326318, 1326330, 1326349, 1326362, 1326372, 1326386, 1326405, 1326415, 1326439, 1326440,
-                   1326458, 1326471, 1326484, 1326515, 1326529, 1326538, 1326551, 1326570, 1326578, 1326602, 1326617,
-                   1326630, 1326637, 1326739, 1326671, 1326694, 1326496, 1326695]
 
+def submitfixturefetch(executor, apiclient, fixture):
+    """
+    Start fetching every per-fixture endpoint concurrently.
+
+    The five endpoints don't depend on each other, so they are all submitted at
+    once. Returns a dict of endpoint name -> Future resolving to the JSON payload.
+    Each download is booked in the run stats under the stage that consumes it.
+    """
+    def fetch(name, path):
+        with stats.attribute(fixture, name):
+            return apiclient.getjson(path)
+
+    return {
+        name: executor.submit(fetch, name, path.format(fixture=fixture))
+        for name, path in FIXTUREENDPOINTS.items()
+    }
+
+
+def ingestfixture(fixture, futures, conn, headers, apiclient):
+    logger.info("Running fixture %s...", fixture)
+
+    with stats.stage(fixture, "players"):
+        logger.debug("Getting fixture data from api...")
+        payload = futures["fixture"].result()
+        logger.debug("Fixture payload data:  %s.", payload)
+        players(payload, headers, conn)
+    logger.debug("...Players are done for %s.", fixture)
+
+    with stats.stage(fixture, "fixture"):
+        fixturefunction(payload, fixture, headers, conn)
+    logger.debug("...Fixture is done for %s.", fixture)
+
+    with stats.stage(fixture, "events"):
+        logger.debug("Getting events data from api...")
+        eventpayload = futures["events"].result()
+        eventfunction(eventpayload, fixture, conn)
+    logger.debug("...Events are done for %s.", fixture)
+
+    with stats.stage(fixture, "statistics"):
+        logger.debug("Getting Fixture Statistics data from api...")
+        statisticspayload = futures["statistics"].result()
+        statisticsfunction(statisticspayload, fixture, conn)
+    logger.debug("...Fixture Statistics are done for %s.", fixture)
+
+    with stats.stage(fixture, "playerstatistics"):
+        logger.debug("Getting Player Statistics data from api...")
+        playerstatisticspayload = futures["playerstatistics"].result()
+        playerstatisticsfunction(playerstatisticspayload, fixture, conn)
+    logger.debug("...Player Statistics are done for %s.", fixture)
+
+    with stats.stage(fixture, "lineups"):
+        logger.debug("Getting Lineups data from api...")
+        lineupspayload = futures["lineups"].result()
+        lineupsfunction(lineupspayload, fixture, conn, headers, apiclient)
+    logger.debug("...Lineups are done for %s.", fixture)
+
+    logger.info("%s", stats.fixturesummary(fixture))
+
+
+def parseargs(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest API-Football fixtures into the atlutdhistory database.")
+    parser.add_argument("--cache-dir", default=".apicache",
+                        help="directory for the on-disk api response cache (default: .apicache)")
+    parser.add_argument("--cache-ttl", type=float, default=168,
+                        help="hours before cached responses for unfinished fixtures, teams, coaches and "
+                             "player profiles are refetched (default: 168)")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch from the api")
+    parser.add_argument("--replay", action="store_true",
+                        help="run entirely from cached payloads without touching the network")
+    parser.add_argument("--team", type=int, default=ATLUTDTEAMID,
+                        help=f"api team id whose fixtures are ingested (default: {ATLUTDTEAMID})")
+    parser.add_argument("--seasons", type=parseseasons, default=None,
+                        help="season or inclusive range of seasons to ingest, e.g. 2025 or 2017-2025")
+    parser.add_argument("--fixtures", type=int, nargs="+", default=None,
+                        help="explicit api fixture ids to ingest instead of whole seasons")
+    parser.add_argument("--workers", type=int, default=2,
+                        help="fixtures fetched concurrently ahead of the database writer (default: 2)")
+    parser.add_argument("--lineups", choices=sorted(LINEUPTABLES), default="wide",
+                        help="lineup storage: the wide fixturelineups table or the normalized "
+                             "fixturelineupteam/fixturelineupplayer tables (default: wide)")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="logging verbosity; DEBUG adds every lookup and the raw payloads (default: INFO)")
+    parser.add_argument("--stats-json", default=None, metavar="PATH",
+                        help="also write the per-fixture and per-stage run stats to this JSON file")
+    parser.add_argument("--headless", action="store_true",
+                        help="never prompt: park unresolved venues, leagues and players in "
+                             "public.pendingresolution for resolvepending.py and keep going")
+    parser.add_argument("--daily-reserve", type=int, default=0,
+                        help="stop once only this many api requests of the daily quota are left (default: 0)")
+    args = parser.parse_args(argv)
+    if args.seasons is None and args.fixtures is None:
+        parser.error("one of --seasons or --fixtures is required")
+    return args
+
+
+def parseseasons(value):
+    """Parse "2025" or "2017-2025" into a list of seasons."""
+    first, _, last = value.partition("-")
+    try:
+        first = int(first)
+        last = int(last) if last else first
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid season range: {value!r}")
+    if last < first:
+        raise argparse.ArgumentTypeError(f"season range goes backwards: {value!r}")
+    return list(range(first, last + 1))
+
+
+def collectfixtures(apiclient, team, seasons):
+    """Derive the fixture list from one /fixtures?team=&season= call per season, keeping played matches."""
+    fixturelist = []
+    for season in seasons:
+        for apifixtureid, fixturedate, status in getseasonfixtures(apiclient, team, season):
+            if status in PLAYEDSTATUSES:
+                fixturelist.append(apifixtureid)
+            else:
+                logger.info("Skipping fixture %s (%s), status %s.", apifixtureid, fixturedate, status)
+    return fixturelist
+
+
+def main():
+    args = parseargs()
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    setlineupstorage(args.lineups)
+    setheadless(args.headless)
 
     ## Initializing
-    # Load headers from json file for use in api requests
-    print("Loading headers...")
-    headers = loadheaders("headers.json")
-    print("...headers loaded.")
-    print("")
+    # Load headers from json file for use in api requests (replay runs never hit the api)
+    logger.debug("Loading headers...")
+    headers = {} if args.replay else loadheaders("headers.json")
+    logger.debug("...headers loaded.")
 
     # Load DB config from json file for use in connecting to database
-    print("Loading DB config...")
+    logger.debug("Loading DB config...")
     db = loaddbconfig("dbconfig.json")
-    print("...DB config loaded.")
-    print("")
+    logger.debug("...DB config loaded.")
 
     # Connect
     conn = psycopg2.connect(
@@ -2540,103 +2376,68 @@ def main():
         dbname=db["dbname"],
         user=db["user"],
         password=db["password"],
+        connection_factory=CountingConnection,
     )
 
-    for fixture in fixturelist:
-        print(f"\n{'=' * 100}")
-        print(f"{' ' * 10}Running {fixture}...")
-        print(f"{'=' * 100}\n")
-
-        print("Getting fixture data from api...")
-        apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-        path = f"/fixtures?id={fixture}"
-        apiconn.request("GET", path, headers=headers)
-        res = apiconn.getresponse()
-        raw = res.read()
-        apiconn.close()
-        payload = json.loads(raw.decode("utf-8"))
-        print(f"Fixture payload data:  {payload}.")
-
-        print(f"\n{'=' * 50}")
-        print("Players...")
-        print(f"{'=' * 50}\n")
-        players(payload, headers, conn)
-        print(f"\n{'=' * 50}")
-        print(f"...Players are done for {fixture}.")
-        print(f"{'=' * 50}\n")
-
-        print(f"\n{'=' * 50}")
-        print("Fixture...")
-        print(f"{'=' * 50}\n")
-        fixturefunction(payload, fixture, headers, conn)
-        print(f"\n{'=' * 50}")
-        print(f"...Fixture is done for {fixture}.")
-        print(f"{'=' * 50}\n")
-
-        print(f"\n{'=' * 50}")
-        print("Events...")
-        print(f"{'=' * 50}\n")
-        print("Getting events data from api...")
-        apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-        eventpath = f"/fixtures/events?fixture={fixture}"
-        apiconn.request("GET", eventpath, headers=headers)
-        eventres = apiconn.getresponse()
-        eventraw = eventres.read()
-        apiconn.close()
-        eventpayload = json.loads(eventraw.decode("utf-8"))
-        eventfunction(eventpayload, fixture, conn)
-        print(f"\n{'=' * 50}")
-        print(f"...Events are done for {fixture}.")
-        print(f"{'=' * 50}\n")
-
-        print(f"\n{'=' * 50}")
-        print("Fixture Statistics...")
-        print(f"{'=' * 50}\n")
-        print("Getting Fixture Statistics data from api...")
-        apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-        statisticspath = f"/fixtures/statistics?fixture={fixture}"
-        apiconn.request("GET", statisticspath, headers=headers)
-        statisticsres = apiconn.getresponse()
-        statisticsraw = statisticsres.read()
-        apiconn.close()
-        statisticspayload = json.loads(statisticsraw.decode("utf-8"))
-        statisticsfunction(statisticspayload, fixture, conn)
-        print(f"\n{'=' * 50}")
-        print(f"...Fixture Statistics are done for {fixture}.")
-        print(f"{'=' * 50}\n")
-
-        print(f"\n{'=' * 50}")
-        print("Player Statistics...")
-        print(f"{'=' * 50}\n")
-        print("Getting Player Statistics data from api...")
-        apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-        playerstatisticspath = f"/fixtures/players?fixture={fixture}"
-        apiconn.request("GET", playerstatisticspath, headers=headers)
-        playerstatisticsres = apiconn.getresponse()
-        playerstatisticsraw = playerstatisticsres.read()
-        apiconn.close()
-        playerstatisticspayload = json.loads(playerstatisticsraw.decode("utf-8"))
-        playerstatisticsfunction(playerstatisticspayload, fixture, conn)
-        print(f"\n{'=' * 50}")
-        print(f"...Player Statistics are done for {fixture}.")
-        print(f"{'=' * 50}\n")
-
-        print(f"\n{'=' * 50}")
-        print("Lineups...")
-        print(f"{'=' * 50}\n")
-        print("Getting Lineups data from api...")
-        apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-        lineupspath = f"/fixtures/lineups?fixture={fixture}"
-        apiconn.request("GET", lineupspath, headers=headers)
-        lineupsres = apiconn.getresponse()
-        lineupsraw = lineupsres.read()
-        apiconn.close()
-        lineupspayload = json.loads(lineupsraw.decode("utf-8"))
-        lineupsfunction(lineupspayload, fixture, conn, headers, apiconn)
-        print(f"\n{'=' * 50}")
-        print(f"...Lineups are done for {fixture}.")
-        print(f"{'=' * 50}\n")
+    # One pooled keep-alive client shared by every stage of the run
+    cache = None
+    if not args.no_cache or args.replay:
+        cache = ResponseCache(args.cache_dir, ttl=args.cache_ttl * 3600)
+    apiclient = getclient(headers, poolsize=len(FIXTUREENDPOINTS) * max(args.workers, 1), cache=cache,
+                          offline=args.replay, ratelimiter=RateLimiter(dailyreserve=args.daily_reserve))
 
+    # Work out which fixtures to ingest: an explicit list, or every played fixture of the seasons
+    if args.fixtures:
+        fixturelist = args.fixtures
+    else:
+        fixturelist = collectfixtures(apiclient, args.team, args.seasons)
+    logger.info("%s fixtures requested.", len(fixturelist))
+
+    # One query diffs them against public.fixture, so nothing is fetched for complete fixtures
+    ingested = preloadingested(conn, fixturelist)
+    fixturelist = [f for f in fixturelist if ingested.get(f) != set(INGESTEDTABLES)]
+    logger.info("%s fixtures still need ingesting.", len(fixturelist))
+
+    # Keep up to `prefetch` fixtures downloading ahead of the one being written to the database.
+    # Writes stay on the single connection so new teams/players are never inserted twice.
+    prefetch = max(args.workers, 1)
+    fixtures = iter(fixturelist)
+    window = deque()
+    parkedfixtures = []
+    with ThreadPoolExecutor(max_workers=len(FIXTUREENDPOINTS) * (prefetch + 1)) as executor:
+        for fixture in itertools.islice(fixtures, prefetch + 1):
+            window.append((fixture, submitfixturefetch(executor, apiclient, fixture)))
+
+        while window:
+            fixture, futures = window.popleft()
+            nextfixture = next(fixtures, None)
+            if nextfixture is not None:
+                window.append((nextfixture, submitfixturefetch(executor, apiclient, nextfixture)))
+            try:
+                ingestfixture(fixture, futures, conn, headers, apiclient)
+            except PendingResolution as e:
+                # Only raised when headless: drop the fixture's open transaction, queue it and move on
+                conn.rollback()
+                parkpending(conn, fixture, "fixture", e.kind, e.apikey, detail=e.detail)
+                parkedfixtures.append(fixture)
+            except DailyQuotaExhausted as e:
+                # Everything committed so far stays; a rerun picks up from this fixture
+                logger.error("%s. Stopping at fixture %s.", e, fixture)
+                for _, pending in window:
+                    for future in pending.values():
+                        future.cancel()
+                break
+
+    apiclient.close()
+
+    if parkedfixtures:
+        logger.warning("%s fixtures parked for resolution: %s. Run resolvepending.py to finish them.",
+                       len(parkedfixtures), parkedfixtures)
+
+    logger.info("Run report:\n%s", stats.report())
+    if args.stats_json:
+        stats.writejson(args.stats_json)
+        logger.info("Run stats written to %s.", args.stats_json)
 
 
 if __name__ == "__main__":
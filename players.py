@@ -1,7 +1,12 @@
-import http.client
 import json
+import logging
 import psycopg2
 import unicodedata
+from apiclient import getclient
+
+# Raw payload and table dumps are logged at DEBUG; raise the level to see them
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 
 def loadHeaders(headersPath="headers.json"):
@@ -22,19 +27,14 @@ def loadDbConfig(configPath="dbconfig.json"):
 
 
 def getPlayers(headers, playerIds):
-    conn = http.client.HTTPSConnection("v3.football.api-sports.io")
     fixtureId = int(input("Enter the Fixture ID:  "))
     #fixtureId = 147926
     #fixtureId = 147915
     #fixtureId = 147936
     path = f"/fixtures?id={fixtureId}"
 
-    conn.request("GET", path, headers=headers)
-    res = conn.getresponse()
-    raw = res.read()
-
-    payload = json.loads(raw.decode("utf-8"))
-    print(payload)
+    payload = getclient(headers).getjson(path)
+    logger.debug("%s", payload)
 
     for item in payload.get("response", []):
         lineups = item.get("lineups") or []
@@ -53,19 +53,13 @@ def getPlayers(headers, playerIds):
                 pid = player.get("id")
                 if pid and pid not in playerIds:
                     playerIds.append(pid)
-    conn.close()
 
 
 def getPlayerProfile(headers, playerId):
-    conn = http.client.HTTPSConnection("v3.football.api-sports.io")
     path = f"/players/profiles?player={playerId}"
     normalized = {}
 
-    conn.request("GET", path, headers=headers)
-    res = conn.getresponse()
-    raw = res.read()
-
-    payload = json.loads(raw.decode("utf-8"))
+    payload = getclient(headers).getjson(path)
 
     for item in payload.get("response", []):
         p = item.get("player") or {}
@@ -87,7 +81,6 @@ def getPlayerProfile(headers, playerId):
             "weightkg": parseHeightWeight(p.get("weight")),
             #"position": p.get("position")
         }
-    conn.close()
     return normalized
 
 
@@ -136,7 +129,7 @@ def applyCountryCodes(conn, country):
         return sorted(candidates)
 
     candidates = country_lookup_candidates(country)
-    print(f"Looking up candidates: {candidates!r}")
+    logger.debug("Looking up candidates: %r", candidates)
 
     if not candidates:
         return {}
@@ -214,8 +207,8 @@ def buildDictionary(conn, playerId):
     birthcountryname = player.get(playerId).get("birthcountrycode")
     nationalityname = player.get(playerId).get("nationality")
     #positionname = player.get(playerId).get("position")
-    print(birthcountryname)
-    print(nationalityname)
+    logger.debug("%s", birthcountryname)
+    logger.debug("%s", nationalityname)
     #print(positionname)
 
     with conn:
@@ -243,7 +236,7 @@ def buildDictionary(conn, playerId):
         # positionId = getPositionId(conn, positionname)
         # print(positionId)
         # player[playerId]["position"] = positionId
-        print(player)
+        logger.debug("%s", player)
 
     sql = """
         INSERT INTO public.player (apifootballid, \
@@ -291,7 +284,7 @@ print("Getting Player IDs...")
 #playerIds = [103046, 2460, 6068]
 playerIds = []
 getPlayers(headers, playerIds)
-print(playerIds)
+logger.debug("%s", playerIds)
 
 # Connect once for lookups and load
 conn = psycopg2.connect(
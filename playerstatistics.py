@@ -1,7 +1,12 @@
 import json
-import http.client
+import logging
 import sys
 import psycopg2
+from apiclient import getclient
+
+# Raw payload and table dumps are logged at DEBUG; raise the level to see them
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 def loadheaders(headersPath="headers.json"):
     with open(headersPath, "r", encoding="utf-8") as f:
@@ -53,12 +58,9 @@ print("")
 
 ## Get api info on fixture, store it as a variable, payload
 print("Making the request to the api...")
-apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-apiconn.request("GET", path, headers=headers)
-res = apiconn.getresponse()
-raw = res.read()
-payload = json.loads(raw.decode("utf-8"))
-print(payload)
+apiclient = getclient(headers)
+payload = apiclient.getjson(path)
+logger.debug("%s", payload)
 print("...done, and raw payload data stored.")
 print("")
 
@@ -108,8 +110,8 @@ print("")
 # Get the events into a list of dictionaries
 print("Getting the responses into a list of dictionaries...")
 response = payload.get("response") or {}
-print(f"Response:  {response}.")
-print(f"There are {len(response)} events in the response.")
+logger.debug("Response:  %s.", response)
+logger.debug("There are %s events in the response.", len(response))
 if len(response) == apiresults:
     print("The number of events in the response matches the number of events the API initially tells us there are.  Proceeding.")
     print("")
@@ -127,7 +129,7 @@ count = 0
 for event in response:
     count += 1
     print(f"Loop {count}:")
-    print(f"This loop's information:  {event}.")
+    logger.debug("This loop's information:  %s.", event)
 
     ## Get the database team id
     print("Getting the database team id...")
@@ -234,7 +236,7 @@ for event in response:
             statistics = statisticslist[0]
         else:
             statistics = {}
-        print(f"This player's stats:  {statistics}.")
+        logger.debug("This player's stats:  %s.", statistics)
         print("")
 
         # Get the minutes played
@@ -313,7 +315,7 @@ for event in response:
         goalsconceded = goalsinfo.get("conceded")
         assists = goalsinfo.get("assists")
         saves = goalsinfo.get("saves")
-        print(f"This player's goals:  {goals}.")
+        logger.debug("This player's goals:  %s.", goals)
         print(f"This player's goals conceded:  {goalsconceded}.")
         print(f"This player's assists:  {assists}.")
         print(f"This player's saves:  {saves}.")
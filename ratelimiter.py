@@ -0,0 +1,81 @@
+import threading
+import time
+
+
+class DailyQuotaExhausted(RuntimeError):
+    """Raised instead of sending a request once the daily API quota is used up."""
+
+
+def _intheader(headers, name):
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread that talks to API-Football.
+
+    The bucket refills at the plan's per-minute rate. After each response the
+    limits are corrected from the quota headers the API sends back:
+
+        X-RateLimit-Limit / X-RateLimit-Remaining                  per minute
+        x-ratelimit-requests-limit / x-ratelimit-requests-remaining per day
+
+    so workers go as fast as the plan allows without waiting for a 429. Once
+    the daily remaining count reaches `dailyreserve`, acquire() raises
+    DailyQuotaExhausted rather than spending the last requests of the day.
+    """
+
+    def __init__(self, perminute=10, dailyreserve=0):
+        self.capacity = perminute
+        self.rate = perminute / 60.0
+        self.tokens = float(perminute)
+        self.dailyremaining = None
+        self.dailyreserve = dailyreserve
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a request may be sent, then take one token."""
+        while True:
+            with self._lock:
+                if self.dailyremaining is not None and self.dailyremaining <= self.dailyreserve:
+                    raise DailyQuotaExhausted(f"Daily API quota reached ({self.dailyremaining} requests left)")
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    if self.dailyremaining is not None:
+                        self.dailyremaining -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def update(self, headers):
+        """Correct the bucket from a response's quota headers."""
+        minutelimit = _intheader(headers, "X-RateLimit-Limit")
+        minuteremaining = _intheader(headers, "X-RateLimit-Remaining")
+        dailyremaining = _intheader(headers, "x-ratelimit-requests-remaining")
+        with self._lock:
+            self._refill()
+            if minutelimit:
+                self.capacity = minutelimit
+                self.rate = minutelimit / 60.0
+            if minuteremaining is not None:
+                self.tokens = min(self.tokens, float(minuteremaining))
+            if dailyremaining is not None:
+                self.dailyremaining = dailyremaining if self.dailyremaining is None \
+                    else min(self.dailyremaining, dailyremaining)
+
+    def backoff(self):
+        """Empty the bucket after a 429 so every worker waits for it to refill."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
@@ -0,0 +1,172 @@
+"""
+Finish what a headless multiplemain.py run parked in public.pendingresolution.
+
+Fixtures parked on an unknown venue or league are ingested again from the top,
+with the usual prompts. Events and player statistics rows parked on an unknown
+player are re-ingested on their own from the stored rows, prompting for the
+player where it still isn't in the database. Items are marked resolved as each
+fixture finishes, so the command can be stopped and rerun.
+
+    python resolvepending.py --list
+    python resolvepending.py
+    python resolvepending.py --fixtures 1161437
+"""
+import argparse
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg2
+
+import multiplemain
+from apicache import ResponseCache
+from apiclient import getclient
+from ingeststats import CountingConnection
+
+logger = logging.getLogger(__name__)
+
+
+def loadpending(conn, apifixtureids=None):
+    """Pending items, oldest fixture first, as dicts."""
+    query = """
+        SELECT id, apifixtureid, stage, kind, apikey, rowkey, payload, detail, created_at
+        FROM public.pendingresolution
+        WHERE status = 'pending'
+    """
+    params = ()
+    if apifixtureids:
+        query += " AND apifixtureid = ANY(%s)"
+        params = (list(apifixtureids),)
+    query += " ORDER BY apifixtureid, id"
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        columns = [d[0] for d in cur.description]
+        return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+def markresolved(conn, items):
+    with conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                UPDATE public.pendingresolution SET status = 'resolved', resolved_at = now()
+                WHERE id = ANY(%s)
+            """, ([item["id"] for item in items],))
+
+
+def parkedevents(items):
+    """Rebuild an /fixtures/events payload holding just the parked events, in their original order."""
+    events = {}
+    for item in items:
+        events.setdefault(item["rowkey"], item["payload"])
+    response = [events[key] for key in sorted(events, key=int)]
+    return {"results": len(response), "response": response}
+
+
+def parkedplayerstatistics(items):
+    """Rebuild an /fixtures/players payload holding just the parked players, grouped by team."""
+    teams = {}
+    players = defaultdict(dict)
+    for item in items:
+        team = item["payload"]["team"]
+        teams.setdefault(team.get("id"), team)
+        for player in item["payload"]["players"]:
+            players[team.get("id")].setdefault((player.get("player") or {}).get("id"), player)
+    response = [{"team": teams[teamid], "players": list(players[teamid].values())} for teamid in teams]
+    return {"results": len(response), "response": response}
+
+
+def describe(item):
+    detail = f" ({item['detail']})" if item["detail"] else ""
+    return f"{item['apifixtureid']} {item['stage']}: {item['kind']} {item['apikey']}{detail}"
+
+
+def resolvefixtures(fixtureitems, conn, headers, apiclient):
+    """Ingest parked fixtures from the top, prompting for whatever stopped them."""
+    with ThreadPoolExecutor(max_workers=len(multiplemain.FIXTUREENDPOINTS)) as executor:
+        for fixture, items in fixtureitems.items():
+            for item in items:
+                logger.info("Resolving %s", describe(item))
+            futures = multiplemain.submitfixturefetch(executor, apiclient, fixture)
+            multiplemain.ingestfixture(fixture, futures, conn, headers, apiclient)
+            markresolved(conn, items)
+
+
+def resolverows(rowitems, conn):
+    """Write parked events and player statistics rows, prompting for players still unknown."""
+    for (fixture, stage), items in rowitems.items():
+        for item in items:
+            logger.info("Resolving %s", describe(item))
+        if stage == "events":
+            multiplemain.eventfunction(parkedevents(items), fixture, conn, parked=True)
+        elif stage == "playerstatistics":
+            multiplemain.playerstatisticsfunction(parkedplayerstatistics(items), fixture, conn, parked=True)
+        else:
+            logger.error("Don't know how to re-ingest stage %s; leaving %s items pending.", stage, len(items))
+            continue
+        markresolved(conn, items)
+
+
+def parseargs(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve and re-ingest items parked by multiplemain.py --headless.")
+    parser.add_argument("--fixtures", type=int, nargs="+", default=None,
+                        help="only resolve items for these api fixture ids")
+    parser.add_argument("--list", action="store_true", help="list the pending items and exit")
+    parser.add_argument("--cache-dir", default=".apicache",
+                        help="directory for the on-disk api response cache (default: .apicache)")
+    parser.add_argument("--cache-ttl", type=float, default=168,
+                        help="hours before cached responses for unfinished fixtures are refetched (default: 168)")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch from the api")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parseargs()
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    db = multiplemain.loaddbconfig("dbconfig.json")
+    conn = psycopg2.connect(
+        host=db["host"],
+        port=db["port"],
+        dbname=db["dbname"],
+        user=db["user"],
+        password=db["password"],
+        connection_factory=CountingConnection,
+    )
+
+    pending = loadpending(conn, args.fixtures)
+    logger.info("%s items pending.", len(pending))
+    if args.list:
+        for item in pending:
+            print(f"{item['created_at']:%Y-%m-%d %H:%M}  {describe(item)}")
+        return
+    if not pending:
+        return
+
+    # Fixture-level items mean nothing past the players stage was written, so the
+    # whole fixture is re-ingested; row-level items only need their own rows
+    fixtureitems = defaultdict(list)
+    rowitems = defaultdict(list)
+    for item in pending:
+        if item["stage"] == "fixture":
+            fixtureitems[item["apifixtureid"]].append(item)
+        else:
+            rowitems[(item["apifixtureid"], item["stage"])].append(item)
+
+    multiplemain.setheadless(False)
+    if fixtureitems:
+        headers = multiplemain.loadheaders("headers.json")
+        cache = None if args.no_cache else ResponseCache(args.cache_dir, ttl=args.cache_ttl * 3600)
+        apiclient = getclient(headers, poolsize=len(multiplemain.FIXTUREENDPOINTS), cache=cache)
+        try:
+            resolvefixtures(fixtureitems, conn, headers, apiclient)
+        finally:
+            apiclient.close()
+    resolverows(rowitems, conn)
+
+    logger.info("Finished working through %s pending items.", len(pending))
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
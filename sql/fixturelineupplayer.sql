@@ -0,0 +1,70 @@
+-- Normalized lineup storage written by multiplemain.py --lineups normalized.
+-- One header row per team per fixture, and one row per player in the lineup, so
+-- there is no fixed limit on the number of substitutes.
+-- Safe to run repeatedly.
+
+CREATE TABLE IF NOT EXISTS public.fixturelineupteam (
+    id          serial PRIMARY KEY,
+    fixtureid   integer NOT NULL REFERENCES public.fixture (id),
+    teamid      integer NOT NULL REFERENCES public.team (id),
+    coachid     integer REFERENCES public.coach (id),
+    formationid integer REFERENCES public.formation (id),
+    data_source text,
+    created_by  text,
+    UNIQUE (fixtureid, teamid)
+);
+
+CREATE TABLE IF NOT EXISTS public.fixturelineupplayer (
+    id          serial PRIMARY KEY,
+    fixtureid   integer NOT NULL REFERENCES public.fixture (id),
+    teamid      integer NOT NULL REFERENCES public.team (id),
+    playerid    integer REFERENCES public.player (id),  -- NULL when the player isn't in public.player
+    apiplayerid integer,                                -- kept so unknown players can be filled in later
+    slot        smallint NOT NULL,                      -- 1-based order within the role
+    role        text NOT NULL CHECK (role IN ('starter', 'substitute')),
+    grid        text,
+    position    text,
+    data_source text,
+    created_by  text,
+    UNIQUE (fixtureid, teamid, role, slot)
+);
+
+CREATE INDEX IF NOT EXISTS fixturelineupteam_fixtureid_idx ON public.fixturelineupteam (fixtureid);
+CREATE INDEX IF NOT EXISTS fixturelineupplayer_playerid_idx ON public.fixturelineupplayer (playerid);
+
+-- Compatibility view in the layout of public.fixturelineups. Players missing from
+-- public.player show up as 707, the placeholder the wide table uses; substitutes
+-- past the twelfth are only visible in fixturelineupplayer.
+CREATE OR REPLACE VIEW public.fixturelineupswide AS
+SELECT t.fixtureid,
+       t.teamid,
+       t.coachid,
+       t.formationid,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'starter' AND p.slot = 1)     AS starter1,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'starter' AND p.slot = 2)     AS starter2,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'starter' AND p.slot = 3)     AS starter3,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'starter' AND p.slot = 4)     AS starter4,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'starter' AND p.slot = 5)     AS starter5,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'starter' AND p.slot = 6)     AS starter6,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'starter' AND p.slot = 7)     AS starter7,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'starter' AND p.slot = 8)     AS starter8,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'starter' AND p.slot = 9)     AS starter9,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'starter' AND p.slot = 10)    AS starter10,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'starter' AND p.slot = 11)    AS starter11,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 1)  AS substitute1,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 2)  AS substitute2,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 3)  AS substitute3,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 4)  AS substitute4,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 5)  AS substitute5,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 6)  AS substitute6,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 7)  AS substitute7,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 8)  AS substitute8,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 9)  AS substitute9,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 10) AS substitute10,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 11) AS substitute11,
+       max(coalesce(p.playerid, 707)) FILTER (WHERE p.role = 'substitute' AND p.slot = 12) AS substitute12,
+       t.data_source,
+       t.created_by
+FROM public.fixturelineupteam t
+LEFT JOIN public.fixturelineupplayer p ON p.fixtureid = t.fixtureid AND p.teamid = t.teamid
+GROUP BY t.fixtureid, t.teamid, t.coachid, t.formationid, t.data_source, t.created_by;
@@ -0,0 +1,12 @@
+-- Indexes backing the per-fixture lookups and "already ingested" EXISTS probes in multiplemain.py.
+-- Safe to run repeatedly.
+
+CREATE INDEX IF NOT EXISTS fixture_apisportsid_idx ON public.fixture (apisportsid);
+CREATE INDEX IF NOT EXISTS fixtureevent_fixtureid_idx ON public.fixtureevent (fixtureid);
+CREATE INDEX IF NOT EXISTS fixturestatistics_dbfixtureid_idx ON public.fixturestatistics (dbfixtureid);
+CREATE INDEX IF NOT EXISTS fixtureplayerstatistics_dbfixtureid_idx ON public.fixtureplayerstatistics (dbfixtureid);
+CREATE INDEX IF NOT EXISTS fixturelineups_fixtureid_idx ON public.fixturelineups (fixtureid);
+
+CREATE INDEX IF NOT EXISTS player_apifootballid_idx ON public.player (apifootballid);
+CREATE INDEX IF NOT EXISTS team_apifootballid_idx ON public.team (apifootballid);
+CREATE INDEX IF NOT EXISTS coach_apifootballid_idx ON public.coach (apifootballid);
@@ -0,0 +1,23 @@
+-- Queue of venues, leagues and players that multiplemain.py --headless could not
+-- resolve on its own. Fixture-level items (venue, league) park the whole fixture;
+-- player items park a single event or player statistics row, kept in payload.
+-- resolvepending.py works through the queue and re-ingests only what was parked.
+-- Safe to run repeatedly.
+
+CREATE TABLE IF NOT EXISTS public.pendingresolution (
+    id           serial PRIMARY KEY,
+    apifixtureid integer NOT NULL,
+    stage        text NOT NULL,                 -- ingest stage that parked it: fixture, events, playerstatistics
+    kind         text NOT NULL CHECK (kind IN ('venue', 'league', 'player')),
+    apikey       text NOT NULL,                 -- api id, or venue name when the api has no id
+    rowkey       text NOT NULL DEFAULT '',      -- which row of the stage's payload, '' for fixture-level items
+    payload      jsonb,                         -- the parked row, for row-level items
+    detail       text,
+    status       text NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'resolved')),
+    created_at   timestamp NOT NULL DEFAULT now(),
+    resolved_at  timestamp,
+    UNIQUE (apifixtureid, stage, kind, apikey, rowkey)
+);
+
+CREATE INDEX IF NOT EXISTS pendingresolution_pending_idx ON public.pendingresolution (apifixtureid)
+    WHERE status = 'pending';
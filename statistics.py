@@ -1,7 +1,12 @@
 import json
-import http.client
+import logging
 import sys
 import psycopg2
+from apiclient import getclient
+
+# Raw payload and table dumps are logged at DEBUG; raise the level to see them
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 
 def loadHeaders(headersPath="headers.json"):
@@ -48,12 +53,9 @@ apifixtureid = int(input("Enter the fixture ID:  "))
 path = f"/fixtures/statistics?fixture={apifixtureid}"
 
 ## Get api info on fixture, store it as a variable, payload
-apiconn = http.client.HTTPSConnection("v3.football.api-sports.io")
-apiconn.request("GET", path, headers=headers)
-res = apiconn.getresponse()
-raw = res.read()
-payload = json.loads(raw.decode("utf-8"))
-print(payload)
+apiclient = getclient(headers)
+payload = apiclient.getjson(path)
+logger.debug("%s", payload)
 
 ## Connect once to postgres for lookups and load
 conn = psycopg2.connect(
@@ -69,7 +71,7 @@ with conn.cursor() as cur:
     cur.execute("SELECT apisportsid, id from public.fixture where apisportsid = %s", (apifixtureid,))
     existingfixtures = cur.fetchall()
 existingfixturesdict = {existingfixture[0]: existingfixture[1] for existingfixture in existingfixtures if existingfixture[0] is not None}
-print(f"Existing fixtures: {existingfixturesdict}")
+logger.debug("Existing fixtures: %s", existingfixturesdict)
 databasefixtureid = None
 if apifixtureid in existingfixturesdict:
     databasefixtureid = existingfixturesdict[apifixtureid]
@@ -91,8 +93,8 @@ print(f"The API tells us there are {apiresults} events.")
 
 # Get the events into a list of dictionaries
 response = payload.get("response") or {}
-print(response)
-print(f"There are {len(response)} events in the response.")
+logger.debug("%s", response)
+logger.debug("There are %s events in the response.", len(response))
 if len(response) == apiresults:
     print("The number of events in the response matches the number of events the API initially tells us there are.")
 else:
@@ -103,7 +105,7 @@ count = 0
 for event in response:
     count += 1
     print(f"Event {count}:")
-    print(event)
+    logger.debug("%s", event)
 
     ## Get db team id
     teaminfo = event.get("team") or {}
@@ -140,10 +142,10 @@ for event in response:
     totalpasses = None
     passesaccurate = None
     apistats = event.get("statistics") or {}
-    print(f"Stats: {apistats}")
-    print(f"length of stats: {len(apistats)}")
+    logger.debug("Stats: %s", apistats)
+    logger.debug("length of stats: %s", len(apistats))
     for stat in apistats:
-        print(f"stat: {stat}")
+        logger.debug("stat: %s", stat)
         stattype = stat.get("type")
         statvalue = stat.get("value")
         if stattype == 'Shots on Goal':
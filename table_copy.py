@@ -1,7 +1,13 @@
 import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 import psycopg2
 import psycopg2.extras
-from typing import List, Tuple, Dict
+from psycopg2 import sql
+from typing import Callable, Dict, List, Optional, Tuple
 
 
 def load_config(config_path: str = "table_copy_config.json") -> Dict:
@@ -28,9 +34,30 @@ def load_config(config_path: str = "table_copy_config.json") -> Dict:
         },
         "options": {
             "truncate_target": true,
-            "batch_size": 1000
+            "batch_size": 1000,
+            "streaming": false,
+            "copy_format": "text",
+            "buffer_chunks": 16,
+            "chunk_size": 1048576,
+            "progress_interval": 5
         }
     }
+
+    With "streaming" on, rows are piped from COPY TO STDOUT on the source
+    straight into COPY FROM STDIN on the target (see stream_table_data()), and
+    batch_size is not used.
+
+    "mode": "incremental" replaces truncate-and-reload with a watermark sync
+    that upserts only new or changed rows (see sync_table_incremental()). The
+    watermark column is "watermark_column" (default "id"), or per table from a
+    "watermarks" map such as {"fixture": "updated_at"}; a "key_columns" map
+    overrides the primary key used to merge.
+
+    A top-level "tables" key switches to multi-table mode (see
+    copy_tables_data()): a list of table names, or "*" for every table in the
+    schema. The "table" entries of source and target are then ignored, and
+    "schema" (default "public") and the options "workers", "defer_constraints"
+    and "state_file" apply.
     """
     with open(config_path, "r", encoding="utf-8") as f:
         return json.load(f)
@@ -138,6 +165,782 @@ def import_table_data(
             conn.close()
 
 
+def connect_db(config: Dict):
+    """Open a connection from a source/target section of the config."""
+    return psycopg2.connect(
+        host=config.get("host", "localhost"),
+        database=config.get("database"),
+        user=config.get("user"),
+        password=config.get("password"),
+        port=config.get("port", 5432)
+    )
+
+
+def table_identifier(table: str) -> sql.Identifier:
+    """Quote a table name that may be schema-qualified ("public.fixture")."""
+    return sql.Identifier(*table.split("."))
+
+
+class CopyPipe:
+    """
+    Bounded in-memory pipe between a COPY TO STDOUT and a COPY FROM STDIN.
+
+    The exporting thread write()s COPY data into it and the importing cursor
+    read()s it back out. At most buffer_chunks chunks of about chunk_size bytes
+    are held at once, so memory stays constant however large the table is; a
+    full pipe blocks the exporter until the importer catches up.
+    """
+
+    _EOF = object()
+
+    def __init__(self, buffer_chunks: int = 16, chunk_size: int = 1 << 20,
+                 on_progress: Optional[Callable[["CopyPipe"], None]] = None):
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.bytes = 0
+        self.rows = 0
+        self._queue = queue.Queue(maxsize=buffer_chunks)
+        self._pending = bytearray()
+        self._buffer = memoryview(b"")
+        self._eof = False
+        self._abandoned = threading.Event()
+
+    # Exporter side
+    def write(self, data) -> int:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._pending += data
+        if len(self._pending) >= self.chunk_size:
+            self._put(bytes(self._pending))
+            self._pending.clear()
+        return len(data)
+
+    def _put(self, item) -> None:
+        while True:
+            if self._abandoned.is_set():
+                raise RuntimeError("COPY target stopped reading")
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Flush what is left and signal end of data, or hand the exporter's error to the reader."""
+        if error is None and self._pending:
+            self._put(bytes(self._pending))
+            self._pending.clear()
+        self._put(error if error is not None else self._EOF)
+
+    # Importer side
+    def read(self, size: int = -1) -> bytes:
+        while not self._buffer and not self._eof:
+            item = self._queue.get()
+            if item is self._EOF:
+                self._eof = True
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                self._buffer = memoryview(item)
+                self.rows += item.count(b"\n")
+        if size is None or size < 0 or size >= len(self._buffer):
+            out, self._buffer = self._buffer, memoryview(b"")
+        else:
+            out, self._buffer = self._buffer[:size], self._buffer[size:]
+        self.bytes += len(out)
+        if self.on_progress:
+            self.on_progress(self)
+        return bytes(out)
+
+    def abandon(self) -> None:
+        """Called when the importer fails, so a blocked exporter gives up instead of waiting forever."""
+        self._abandoned.set()
+
+
+COPY_FORMATS = ("text", "csv", "binary")
+
+
+def estimate_rows(conn, table: str) -> int:
+    """Planner estimate of a table's row count, for progress output; 0 if unknown."""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", (table,))
+        row = cursor.fetchone()
+    return max(row[0], 0) if row else 0
+
+
+def table_columns(conn, table: str) -> List[str]:
+    with conn.cursor() as cursor:
+        cursor.execute(sql.SQL("SELECT * FROM {} LIMIT 0").format(table_identifier(table)))
+        return [desc[0] for desc in cursor.description]
+
+
+def pipe_copy(
+        source_conn,
+        target_cursor,
+        copy_out: str,
+        copy_in: str,
+        label: str,
+        expected: int = 0,
+        copy_format: str = "text",
+        buffer_chunks: int = 16,
+        chunk_size: int = 1 << 20,
+        progress_interval: float = 5.0
+) -> int:
+    """
+    Run copy_out (a COPY ... TO STDOUT) on source_conn and feed it into copy_in
+    (a COPY ... FROM STDIN) on target_cursor, in constant memory.
+
+    The export runs on a background thread and the import on this one, joined
+    by a CopyPipe. The caller owns the target transaction: nothing is committed
+    here. Row progress is counted from the text stream; with copy_format
+    "binary" only bytes are reported until the end.
+
+    Returns the number of rows copied.
+    """
+    started = time.monotonic()
+    last_report = [started]
+
+    def report(pipe: CopyPipe, final: bool = False) -> None:
+        now = time.monotonic()
+        if not final and now - last_report[0] < progress_interval:
+            return
+        last_report[0] = now
+        elapsed = max(now - started, 1e-9)
+        rows = f"{pipe.rows:,}" + (f"/{expected:,} rows ({100 * pipe.rows / expected:.0f}%)"
+                                   if expected and copy_format != "binary" else " rows")
+        print(f"{label}: {rows}, {pipe.bytes / 1048576:.1f} MB, "
+              f"{pipe.bytes / 1048576 / elapsed:.1f} MB/s")
+
+    pipe = CopyPipe(buffer_chunks=buffer_chunks, chunk_size=chunk_size, on_progress=report)
+
+    def export() -> None:
+        error = None
+        try:
+            with source_conn.cursor() as cursor:
+                cursor.copy_expert(copy_out, pipe)
+        except BaseException as e:
+            error = e
+        try:
+            pipe.finish(error)
+        except RuntimeError:
+            pass  # the import already failed and is reporting its own error
+
+    exporter = threading.Thread(target=export, name=f"copy-out-{label}", daemon=True)
+    try:
+        exporter.start()
+        target_cursor.copy_expert(copy_in, pipe, size=chunk_size)
+        copied = target_cursor.rowcount
+    except Exception:
+        pipe.abandon()
+        raise
+    finally:
+        exporter.join()
+
+    if copied is None or copied < 0:
+        copied = pipe.rows
+    pipe.rows = copied
+    report(pipe, final=True)
+    return copied
+
+
+def stream_table_data(
+        source_config: Dict,
+        target_config: Dict,
+        source_table: str,
+        target_table: str,
+        truncate_target: bool = False,
+        copy_format: str = "text",
+        buffer_chunks: int = 16,
+        chunk_size: int = 1 << 20,
+        progress_interval: float = 5.0
+) -> int:
+    """
+    Copy a table by piping COPY (SELECT ...) TO STDOUT on the source into
+    COPY ... FROM STDIN on the target (see pipe_copy()).
+
+    The optional truncate and the load share one target transaction, so readers
+    never see the table empty. Columns are copied by name.
+
+    Returns the number of rows copied.
+    """
+    if copy_format not in COPY_FORMATS:
+        raise ValueError(f"copy_format must be one of {', '.join(COPY_FORMATS)}, not {copy_format!r}")
+    source_conn = connect_db(source_config)
+    target_conn = connect_db(target_config)
+    try:
+        column_names = table_columns(source_conn, source_table)
+        columns = sql.SQL(", ").join(sql.Identifier(c) for c in column_names)
+        copy_options = sql.SQL("(FORMAT {})").format(sql.SQL(copy_format))
+        copy_out = sql.SQL("COPY (SELECT {} FROM {}) TO STDOUT WITH {}").format(
+            columns, table_identifier(source_table), copy_options).as_string(source_conn)
+        copy_in = sql.SQL("COPY {} ({}) FROM STDIN WITH {}").format(
+            table_identifier(target_table), columns, copy_options).as_string(target_conn)
+
+        started = time.monotonic()
+        try:
+            with target_conn.cursor() as cursor:
+                if truncate_target:
+                    cursor.execute(sql.SQL("TRUNCATE TABLE {}").format(table_identifier(target_table)))
+                    print(f"Truncated target table {target_table}")
+                copied = pipe_copy(source_conn, cursor, copy_out, copy_in, target_table,
+                                   expected=estimate_rows(source_conn, source_table), copy_format=copy_format,
+                                   buffer_chunks=buffer_chunks, chunk_size=chunk_size,
+                                   progress_interval=progress_interval)
+            target_conn.commit()
+        except Exception:
+            target_conn.rollback()
+            raise
+
+        print(f"Streamed {copied} rows from {source_table} into {target_table} "
+              f"in {time.monotonic() - started:.1f}s")
+        return copied
+    finally:
+        source_conn.close()
+        target_conn.close()
+
+
+WATERMARK_TABLE = "public.table_copy_watermark"
+
+
+def ensure_watermark_table(conn) -> None:
+    with conn.cursor() as cursor:
+        cursor.execute(sql.SQL("""
+            CREATE TABLE IF NOT EXISTS {} (
+                table_name       text PRIMARY KEY,
+                watermark_column text NOT NULL,
+                watermark        text,
+                rows_copied      bigint,
+                synced_at        timestamptz NOT NULL DEFAULT now()
+            )
+        """).format(table_identifier(WATERMARK_TABLE)))
+    conn.commit()
+
+
+def read_watermark(conn, table: str, watermark_column: str) -> Optional[str]:
+    """The last synced watermark for a target table, or None to start from scratch."""
+    with conn.cursor() as cursor:
+        cursor.execute(sql.SQL("SELECT watermark_column, watermark FROM {} WHERE table_name = %s").format(
+            table_identifier(WATERMARK_TABLE)), (table,))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    if row[0] != watermark_column:
+        print(f"{table} was last synced on {row[0]}, not {watermark_column}; syncing every row")
+        return None
+    return row[1]
+
+
+def primary_key_columns(conn, table: str) -> List[str]:
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT a.attname
+            FROM pg_index x
+            JOIN pg_attribute a ON a.attrelid = x.indrelid AND a.attnum = ANY(x.indkey)
+            WHERE x.indrelid = %s::regclass AND x.indisprimary
+            ORDER BY array_position(x.indkey, a.attnum)
+        """, (table,))
+        return [row[0] for row in cursor.fetchall()]
+
+
+def sync_table_incremental(
+        source_config: Dict,
+        target_config: Dict,
+        source_table: str,
+        target_table: str,
+        watermark_column: str = "id",
+        key_columns: Optional[List[str]] = None,
+        copy_format: str = "text",
+        buffer_chunks: int = 16,
+        chunk_size: int = 1 << 20,
+        progress_interval: float = 5.0
+) -> int:
+    """
+    Copy only the rows added or changed since the last sync and upsert them.
+
+    The watermark is an ever-increasing column: "id" for append-only history
+    tables, or an updated-at timestamp where rows change. Its last synced value
+    is kept per target table in public.table_copy_watermark on the target.
+    Rows with watermark_column above it, up to the source's current maximum,
+    are streamed (see pipe_copy()) into a temporary staging table and merged
+    with INSERT ... ON CONFLICT on key_columns, which default to the target's
+    primary key. The merge and the new watermark commit together, so a failed
+    sync just repeats next time. Deleted source rows are not removed from the
+    target.
+
+    Returns the number of rows copied.
+    """
+    if copy_format not in COPY_FORMATS:
+        raise ValueError(f"copy_format must be one of {', '.join(COPY_FORMATS)}, not {copy_format!r}")
+    source_conn = connect_db(source_config)
+    target_conn = connect_db(target_config)
+    try:
+        ensure_watermark_table(target_conn)
+        last = read_watermark(target_conn, target_table, watermark_column)
+        key_columns = key_columns or primary_key_columns(target_conn, target_table)
+        if not key_columns:
+            raise ValueError(f"{target_table} has no primary key; set key_columns for an incremental sync")
+
+        column_names = table_columns(source_conn, source_table)
+        with source_conn.cursor() as cursor:
+            cursor.execute(sql.SQL("SELECT max({})::text FROM {}").format(
+                sql.Identifier(watermark_column), table_identifier(source_table)))
+            current = cursor.fetchone()[0]
+        if current is None or current == last:
+            print(f"{target_table} is up to date (watermark {last})")
+            return 0
+
+        watermark = sql.Identifier(watermark_column)
+        condition = sql.SQL("{} <= {}").format(watermark, sql.Literal(current))
+        if last is not None:
+            condition = sql.SQL("{} > {} AND ").format(watermark, sql.Literal(last)) + condition
+        columns = sql.SQL(", ").join(sql.Identifier(c) for c in column_names)
+        copy_options = sql.SQL("(FORMAT {})").format(sql.SQL(copy_format))
+        copy_out = sql.SQL("COPY (SELECT {} FROM {} WHERE {}) TO STDOUT WITH {}").format(
+            columns, table_identifier(source_table), condition, copy_options).as_string(source_conn)
+        copy_in = sql.SQL("COPY table_copy_stage ({}) FROM STDIN WITH {}").format(
+            columns, copy_options).as_string(target_conn)
+
+        updates = [c for c in column_names if c not in key_columns]
+        if updates:
+            on_conflict = sql.SQL("DO UPDATE SET {}").format(sql.SQL(", ").join(
+                sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c)) for c in updates))
+        else:
+            on_conflict = sql.SQL("DO NOTHING")
+        merge = sql.SQL("INSERT INTO {} ({}) SELECT {} FROM table_copy_stage ON CONFLICT ({}) {}").format(
+            table_identifier(target_table), columns, columns,
+            sql.SQL(", ").join(sql.Identifier(c) for c in key_columns), on_conflict)
+
+        started = time.monotonic()
+        print(f"Syncing {source_table} into {target_table} from {watermark_column} {last} to {current}...")
+        try:
+            with target_conn.cursor() as cursor:
+                cursor.execute(sql.SQL(
+                    "CREATE TEMP TABLE table_copy_stage ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA").format(
+                    columns, table_identifier(target_table)))
+                copied = pipe_copy(source_conn, cursor, copy_out, copy_in, target_table, copy_format=copy_format,
+                                   buffer_chunks=buffer_chunks, chunk_size=chunk_size,
+                                   progress_interval=progress_interval)
+                cursor.execute(merge)
+                cursor.execute(sql.SQL("""
+                    INSERT INTO {} (table_name, watermark_column, watermark, rows_copied, synced_at)
+                    VALUES (%s, %s, %s, %s, now())
+                    ON CONFLICT (table_name) DO UPDATE
+                    SET watermark_column = EXCLUDED.watermark_column, watermark = EXCLUDED.watermark,
+                        rows_copied = EXCLUDED.rows_copied, synced_at = EXCLUDED.synced_at
+                """).format(table_identifier(WATERMARK_TABLE)),
+                    (target_table, watermark_column, current, copied))
+            target_conn.commit()
+        except Exception:
+            target_conn.rollback()
+            raise
+
+        print(f"Synced {copied} new or changed rows from {source_table} into {target_table} "
+              f"in {time.monotonic() - started:.1f}s")
+        return copied
+    finally:
+        source_conn.close()
+        target_conn.close()
+
+
+def incremental_options(options: Dict, table: str) -> Dict:
+    """The sync_table_incremental() watermark and key settings for one table."""
+    name = table.split(".")[-1]
+    watermarks = options.get("watermarks", {})
+    keys = options.get("key_columns", {})
+    return {
+        "watermark_column": watermarks.get(table, watermarks.get(name, options.get("watermark_column", "id"))),
+        "key_columns": keys.get(table, keys.get(name)),
+    }
+
+
+def stream_options(options: Dict) -> Dict:
+    """The stream_table_data() keyword arguments set in the options section of the config."""
+    return {
+        "copy_format": options.get("copy_format", "text"),
+        "buffer_chunks": options.get("buffer_chunks", 16),
+        "chunk_size": options.get("chunk_size", 1 << 20),
+        "progress_interval": options.get("progress_interval", 5),
+    }
+
+
+def qualified(schema: str, table: str) -> str:
+    return table if "." in table else f"{schema}.{table}"
+
+
+def list_tables(conn, schema: str) -> List[str]:
+    """Every ordinary table in a schema, schema-qualified."""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.relname
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND c.relkind IN ('r', 'p') AND NOT c.relispartition
+            ORDER BY c.relname
+        """, (schema,))
+        return [f"{schema}.{row[0]}" for row in cursor.fetchall()]
+
+
+def foreign_key_dependencies(conn, tables: List[str]) -> Dict[str, set]:
+    """For each table, the other tables in the list its foreign keys reference."""
+    dependencies = {table: set() for table in tables}
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT cn.nspname || '.' || c.relname, fn.nspname || '.' || f.relname
+            FROM pg_constraint k
+            JOIN pg_class c ON c.oid = k.conrelid
+            JOIN pg_namespace cn ON cn.oid = c.relnamespace
+            JOIN pg_class f ON f.oid = k.confrelid
+            JOIN pg_namespace fn ON fn.oid = f.relnamespace
+            WHERE k.contype = 'f'
+        """)
+        for child, parent in cursor.fetchall():
+            if child in dependencies and parent in dependencies and child != parent:
+                dependencies[child].add(parent)
+    return dependencies
+
+
+def dependency_levels(dependencies: Dict[str, set]) -> List[List[str]]:
+    """
+    Group tables so every table comes after the tables it references. Tables
+    within a level don't depend on each other. Tables caught in a reference
+    cycle go in a final level, since constraints are off during the load anyway.
+    """
+    remaining = {table: set(parents) for table, parents in dependencies.items()}
+    levels = []
+    while remaining:
+        ready = sorted(table for table, parents in remaining.items() if not parents)
+        if not ready:
+            print(f"Foreign key cycle between {', '.join(sorted(remaining))}; copying them last")
+            levels.append(sorted(remaining))
+            break
+        levels.append(ready)
+        for table in ready:
+            del remaining[table]
+        for parents in remaining.values():
+            parents.difference_update(ready)
+    return levels
+
+
+def incoming_foreign_keys(conn, tables: List[str]) -> List[Dict]:
+    """Foreign keys on tables outside the list that reference a table in it."""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT n.nspname || '.' || c.relname, k.conname, k.contype, pg_get_constraintdef(k.oid),
+                   rn.nspname || '.' || r.relname
+            FROM pg_constraint k
+            JOIN pg_class c ON c.oid = k.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_class r ON r.oid = k.confrelid
+            JOIN pg_namespace rn ON rn.oid = r.relnamespace
+            WHERE k.contype = 'f'
+              AND (rn.nspname || '.' || r.relname) = ANY(%s)
+              AND NOT (n.nspname || '.' || c.relname) = ANY(%s)
+            ORDER BY 1, 2
+        """, (tables, tables))
+        return [
+            {"table": table, "name": name, "type": contype, "definition": definition, "references": references}
+            for table, name, contype, definition, references in cursor.fetchall()
+        ]
+
+
+def require_foreign_key_closed(conn, tables: List[str]) -> None:
+    """
+    Raise if tables outside the list reference one in it. Truncating or
+    dropping the keys of the listed tables would fail on those foreign keys.
+    """
+    incoming = incoming_foreign_keys(conn, tables)
+    if incoming:
+        raise ValueError(
+            "Tables outside the copy reference tables in it: "
+            + ", ".join(f"{fk['table']}.{fk['name']} -> {fk['references']}" for fk in incoming)
+            + '. Add them to "tables" or turn defer_constraints on.'
+        )
+
+
+def capture_deferred_ddl(conn, tables: List[str]) -> Dict[str, List[Dict]]:
+    """
+    Definitions of the primary key, unique, exclusion and foreign key
+    constraints and the other indexes on the given tables, so they can be
+    dropped for the load and recreated after it. Foreign keys on other tables
+    that reference these are included too, since the keys they rely on can't
+    be dropped (or the tables truncated) while they exist.
+    """
+    incoming = incoming_foreign_keys(conn, tables)
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT n.nspname || '.' || c.relname, k.conname, k.contype, pg_get_constraintdef(k.oid)
+            FROM pg_constraint k
+            JOIN pg_class c ON c.oid = k.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE k.contype IN ('p', 'u', 'x', 'f')
+              AND (n.nspname || '.' || c.relname) = ANY(%s)
+            ORDER BY 1, 2
+        """, (tables,))
+        constraints = [
+            {"table": table, "name": name, "type": contype, "definition": definition}
+            for table, name, contype, definition in cursor.fetchall()
+        ]
+        constraints.extend(incoming)
+        cursor.execute("""
+            SELECT n.nspname || '.' || c.relname, i.relname, pg_get_indexdef(x.indexrelid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_class c ON c.oid = x.indrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE (n.nspname || '.' || c.relname) = ANY(%s)
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint k WHERE k.conindid = x.indexrelid
+                                                             AND k.conrelid = x.indrelid)
+            ORDER BY 1, 2
+        """, (tables,))
+        indexes = [
+            {"table": table, "name": name, "definition": definition}
+            for table, name, definition in cursor.fetchall()
+        ]
+    return {"constraints": constraints, "indexes": indexes}
+
+
+def drop_deferred_ddl(conn, ddl: Dict[str, List[Dict]]) -> None:
+    """Drop foreign keys first, then the constraints they rely on, then plain indexes, in one transaction."""
+    constraints = sorted(ddl["constraints"], key=lambda c: c["type"] != "f")
+    with conn.cursor() as cursor:
+        for constraint in constraints:
+            cursor.execute(sql.SQL("ALTER TABLE {} DROP CONSTRAINT {}").format(
+                table_identifier(constraint["table"]), sql.Identifier(constraint["name"])))
+        for index in ddl["indexes"]:
+            schema = index["table"].split(".")[0]
+            cursor.execute(sql.SQL("DROP INDEX {}").format(sql.Identifier(schema, index["name"])))
+    conn.commit()
+    print(f"Deferred {len(ddl['constraints'])} constraints and {len(ddl['indexes'])} indexes until after the load")
+
+
+def _run_table_ddl(target_config: Dict, statements: List[sql.Composable]) -> None:
+    conn = connect_db(target_config)
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+    finally:
+        conn.close()
+
+
+def existing_deferred_ddl(conn, ddl: Dict[str, List[Dict]]) -> Tuple[Dict[Tuple[str, str], bool], set]:
+    """
+    Which of the captured constraints and indexes are already on the target:
+    ({(table, constraint name): validated}, {(table, index name)}).
+    """
+    tables = sorted({c["table"] for c in ddl["constraints"]} | {i["table"] for i in ddl["indexes"]})
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT n.nspname || '.' || c.relname, k.conname, k.convalidated
+            FROM pg_constraint k
+            JOIN pg_class c ON c.oid = k.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE (n.nspname || '.' || c.relname) = ANY(%s)
+        """, (tables,))
+        constraints = {(table, name): validated for table, name, validated in cursor.fetchall()}
+        cursor.execute("""
+            SELECT schemaname || '.' || tablename, indexname
+            FROM pg_indexes
+            WHERE (schemaname || '.' || tablename) = ANY(%s)
+        """, (tables,))
+        indexes = {(table, name) for table, name in cursor.fetchall()}
+    return constraints, indexes
+
+
+def restore_deferred_ddl(target_config: Dict, ddl: Dict[str, List[Dict]], workers: int) -> None:
+    """
+    Recreate what drop_deferred_ddl() removed. Keys and indexes are rebuilt
+    table by table, several tables at once. Foreign keys are then added NOT
+    VALID, which is instant, and validated in parallel, which only takes locks
+    that don't block each other. Anything already on the target is skipped (and
+    foreign keys left NOT VALID are validated), so a restore that was cut short
+    can simply be run again.
+    """
+    started = time.monotonic()
+    conn = connect_db(target_config)
+    try:
+        existing_constraints, existing_indexes = existing_deferred_ddl(conn, ddl)
+        conn.commit()
+        per_table = {}
+        for constraint in ddl["constraints"]:
+            if constraint["type"] != "f" and (constraint["table"], constraint["name"]) not in existing_constraints:
+                per_table.setdefault(constraint["table"], []).append(
+                    sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} {}").format(
+                        table_identifier(constraint["table"]), sql.Identifier(constraint["name"]),
+                        sql.SQL(constraint["definition"])))
+        for index in ddl["indexes"]:
+            if (index["table"], index["name"]) not in existing_indexes:
+                per_table.setdefault(index["table"], []).append(sql.SQL(index["definition"]))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(_run_table_ddl, target_config, statements)
+                           for statements in per_table.values()]:
+                future.result()
+
+        foreign_keys = [c for c in ddl["constraints"] if c["type"] == "f"]
+        to_validate = {}
+        with conn.cursor() as cursor:
+            for constraint in foreign_keys:
+                key = (constraint["table"], constraint["name"])
+                definition = constraint["definition"]
+                already_not_valid = definition.rstrip().upper().endswith("NOT VALID")
+                if key not in existing_constraints:
+                    cursor.execute(sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} {}").format(
+                        table_identifier(constraint["table"]), sql.Identifier(constraint["name"]),
+                        sql.SQL(definition if already_not_valid else f"{definition} NOT VALID")))
+                elif existing_constraints[key]:
+                    continue
+                if not already_not_valid:
+                    to_validate.setdefault(constraint["table"], []).append(
+                        sql.SQL("ALTER TABLE {} VALIDATE CONSTRAINT {}").format(
+                            table_identifier(constraint["table"]), sql.Identifier(constraint["name"])))
+        conn.commit()
+    finally:
+        conn.close()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(_run_table_ddl, target_config, statements)
+                       for statements in to_validate.values()]:
+            future.result()
+    print(f"Restored {len(ddl['constraints'])} constraints and {len(ddl['indexes'])} indexes "
+          f"in {time.monotonic() - started:.1f}s")
+
+
+def reset_sequences(conn, tables: List[str]) -> None:
+    """Move each serial/identity sequence on the copied tables past the largest id that was loaded."""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT n.nspname || '.' || c.relname, a.attname,
+                   pg_get_serial_sequence(quote_ident(n.nspname) || '.' || quote_ident(c.relname), a.attname)
+            FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE (n.nspname || '.' || c.relname) = ANY(%s) AND a.attnum > 0 AND NOT a.attisdropped
+        """, (tables,))
+        sequences = [row for row in cursor.fetchall() if row[2]]
+        for table, column, sequence in sequences:
+            cursor.execute(sql.SQL("SELECT setval(%s, coalesce(max({}), 0) + 1, false) FROM {}").format(
+                sql.Identifier(column), table_identifier(table)), (sequence,))
+    conn.commit()
+
+
+def _copy_one_table(source_config: Dict, target_config: Dict, table: str, options: Dict) -> Tuple[str, int, float]:
+    started = time.monotonic()
+    if options.get("mode", "full") == "incremental":
+        copied = sync_table_incremental(source_config, target_config, table, table,
+                                        **incremental_options(options, table), **stream_options(options))
+    else:
+        copied = stream_table_data(source_config, target_config, table, table, **stream_options(options))
+    return table, copied, time.monotonic() - started
+
+
+def copy_tables_data(config: Dict) -> None:
+    """
+    Copy many tables from source to target in one run.
+
+    Tables are truncated together, then copied by worker processes, each table
+    streamed as in stream_table_data(). A table starts only once the tables its
+    foreign keys reference are done, so independent tables load in parallel.
+    With defer_constraints (the default), the target's keys, foreign keys and
+    indexes on those tables, and foreign keys from other tables that reference
+    them, are dropped first and rebuilt after the load. Their definitions are
+    saved to state_file, so an interrupted run puts them back at the start of
+    the next one. Without it, a list that other tables reference is refused
+    before anything is truncated. Serial sequences are then moved past the
+    loaded ids.
+    """
+    source_config = config.get("source", {})
+    target_config = config.get("target", {})
+    options = config.get("options", {})
+    schema = target_config.get("schema", source_config.get("schema", "public"))
+    workers = max(int(options.get("workers", os.cpu_count() or 2)), 1)
+    incremental = options.get("mode", "full") == "incremental"
+    # An incremental sync merges into live tables, so it needs their keys and keeps their rows
+    defer_constraints = options.get("defer_constraints", True) and not incremental
+    state_file = options.get("state_file", "table_copy_deferred.json")
+
+    conn = connect_db(target_config)
+    try:
+        if os.path.exists(state_file):
+            print(f"Found {state_file} from an interrupted run; restoring its constraints and indexes first")
+            with open(state_file, "r", encoding="utf-8") as f:
+                restore_deferred_ddl(target_config, json.load(f), workers)
+            os.remove(state_file)
+
+        requested = config.get("tables")
+        if requested == "*":
+            tables = list_tables(conn, schema)
+        else:
+            tables = [qualified(schema, table) for table in requested]
+        if not tables:
+            raise ValueError("No tables to copy")
+        dependencies = foreign_key_dependencies(conn, tables)
+        levels = dependency_levels(dependencies)
+        print(f"Copying {len(tables)} tables with {workers} workers, in dependency order: "
+              + " | ".join(", ".join(level) for level in levels))
+
+        ddl = None
+        if defer_constraints:
+            ddl = capture_deferred_ddl(conn, tables)
+            outside = sorted({c["table"] for c in ddl["constraints"] if c["table"] not in tables})
+            if outside:
+                print(f"Also deferring foreign keys from {', '.join(outside)}, which reference copied tables; "
+                      f"they are validated against the new rows afterwards")
+            with open(state_file, "w", encoding="utf-8") as f:
+                json.dump(ddl, f, indent=2)
+            try:
+                drop_deferred_ddl(conn, ddl)
+            except Exception:
+                # Nothing was dropped (it's one transaction), so there's nothing to restore later
+                conn.rollback()
+                os.remove(state_file)
+                raise
+
+        if options.get("truncate_target", True) and not incremental:
+            if ddl is None:
+                require_foreign_key_closed(conn, tables)
+            with conn.cursor() as cursor:
+                cursor.execute(sql.SQL("TRUNCATE TABLE {}").format(
+                    sql.SQL(", ").join(table_identifier(table) for table in tables)))
+            conn.commit()
+            print(f"Truncated {len(tables)} target tables")
+    finally:
+        conn.close()
+
+    started = time.monotonic()
+    total_rows = 0
+    done = set()
+    waiting = {table: set(parents) for table, parents in dependencies.items()}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while waiting or running:
+            ready = sorted(table for table, parents in waiting.items() if parents <= done)
+            if not ready and not running:
+                # Only a foreign key cycle is left; constraints are off, so start all of it
+                ready = sorted(waiting)
+            for table in ready:
+                del waiting[table]
+                running[executor.submit(_copy_one_table, source_config, target_config, table, options)] = table
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                table, copied, elapsed = future.result()
+                del running[future]
+                done.add(table)
+                total_rows += copied
+                print(f"Finished {table}: {copied} rows in {elapsed:.1f}s ({len(done)}/{len(tables)} tables)")
+    print(f"Copied {total_rows} rows in {len(tables)} tables in {time.monotonic() - started:.1f}s")
+
+    if ddl is not None:
+        restore_deferred_ddl(target_config, ddl, workers)
+        os.remove(state_file)
+
+    conn = connect_db(target_config)
+    try:
+        reset_sequences(conn, tables)
+    finally:
+        conn.close()
+    print("Multi-table copy completed successfully!")
+
+
 def copy_table_data(config_path: str = "table_copy_config.json") -> None:
     """
     Copy data from one PostgreSQL table to another using configuration file.
@@ -151,6 +954,10 @@ def copy_table_data(config_path: str = "table_copy_config.json") -> None:
         config = load_config(config_path)
         print("Configuration loaded successfully.")
 
+        if "tables" in config:
+            copy_tables_data(config)
+            return
+
         source_config = config.get("source", {})
         target_config = config.get("target", {})
         options = config.get("options", {})
@@ -164,6 +971,31 @@ def copy_table_data(config_path: str = "table_copy_config.json") -> None:
         if not source_table or not target_table:
             raise ValueError("Source and target table names must be specified in config")
 
+        if options.get("mode", "full") == "incremental":
+            sync_table_incremental(
+                source_config,
+                target_config,
+                source_table,
+                target_table,
+                **incremental_options(options, target_table),
+                **stream_options(options)
+            )
+            print("Table sync completed successfully!")
+            return
+
+        if options.get("streaming", False):
+            print(f"Streaming {source_table} into {target_table}...")
+            stream_table_data(
+                source_config,
+                target_config,
+                source_table,
+                target_table,
+                truncate_target=truncate_target,
+                **stream_options(options)
+            )
+            print("Table copy completed successfully!")
+            return
+
         # Optionally truncate target table
         if truncate_target:
             conn = psycopg2.connect(
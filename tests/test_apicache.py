@@ -0,0 +1,58 @@
+import json
+import time
+
+from apicache import ResponseCache
+
+
+def fixturelist(*fixtures):
+    """A /fixtures payload holding (id, status short) fixtures."""
+    response = [{"fixture": {"id": fixtureid, "status": {"short": status}}} for fixtureid, status in fixtures]
+    return {"results": len(response), "response": response}
+
+
+def age(cache, path, seconds):
+    """Backdate a cache entry's fetch time."""
+    entry = cache._load(path)
+    entry["fetchedat"] -= seconds
+    with open(cache._entrypath(path), "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+
+
+def test_events_cached_before_fixture_finished_expire(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.put("/fixtures/events?fixture=1", {"results": 0, "response": []})
+    cache.put("/fixtures?id=1", fixturelist((1, "FT")))
+
+    assert not cache._load("/fixtures/events?fixture=1")["finished"]
+    age(cache, "/fixtures/events?fixture=1", 120)
+    assert cache.get("/fixtures/events?fixture=1") is None
+
+
+def test_events_cached_after_fixture_finished_never_expire(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.put("/fixtures?id=1", fixturelist((1, "FT")))
+    cache.put("/fixtures/events?fixture=1", {"results": 0, "response": []})
+
+    age(cache, "/fixtures/events?fixture=1", 120)
+    assert cache.get("/fixtures/events?fixture=1") == {"results": 0, "response": []}
+
+
+def test_season_list_with_kicked_off_unplayed_fixture_is_refetched(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    path = "/fixtures?team=1608&season=2025"
+    stale = fixturelist((1, "FT"), (2, "NS"))
+    stale["response"][1]["fixture"]["timestamp"] = int(time.time()) - 24 * 3600
+    cache.put(path, stale)
+
+    assert cache.get(path) is None
+    assert cache.get(path, ignorettl=True) == stale
+
+
+def test_season_list_with_only_future_unplayed_fixtures_is_served(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    path = "/fixtures?team=1608&season=2025"
+    current = fixturelist((1, "FT"), (2, "NS"))
+    current["response"][1]["fixture"]["date"] = "2999-03-01T00:30:00+00:00"
+    cache.put(path, current)
+
+    assert cache.get(path) == current
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+from ingeststats import CountingConnection, stats
+
+DSN = os.environ.get("INGEST_TEST_DSN")
+
+
+@pytest.mark.skipif(not DSN, reason="set INGEST_TEST_DSN to a Postgres DSN to run")
+def test_with_block_counts_one_commit():
+    conn = psycopg2.connect(DSN, connection_factory=CountingConnection)
+    try:
+        before = stats.fixturetotals(None)
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute("select 1")
+        after = stats.fixturetotals(None)
+    finally:
+        conn.close()
+
+    assert after["statements"] - before["statements"] == 1
+    assert after["commits"] - before["commits"] == 1
+
+
+def test_with_block_counts_one_commit_without_a_server():
+    # An unconnected connection object has nothing to commit, but psycopg2's own
+    # __exit__ still ends the block through commit(), which is what is counted
+    conn = CountingConnection.__new__(CountingConnection)
+    before = stats.fixturetotals(None)["commits"]
+    with conn:
+        pass
+    assert stats.fixturetotals(None)["commits"] - before == 1
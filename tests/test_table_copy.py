@@ -0,0 +1,108 @@
+import pytest
+
+pytest.importorskip("psycopg2")
+
+import table_copy
+
+
+class FakeCursor:
+    """Hands back one queued result set per execute(), in order."""
+
+    def __init__(self, results, executed):
+        self.results = results
+        self.executed = executed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.executed.append(query)
+        self.rows = self.results.pop(0) if self.results else []
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self.results, self.executed)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+INCOMING = [(
+    "public.fixture", "fixture_hometeam_fkey", "f",
+    "FOREIGN KEY (hometeam) REFERENCES public.team(id)", "public.team",
+)]
+
+
+def test_captured_ddl_includes_foreign_keys_from_tables_outside_the_copy():
+    conn = FakeConnection(
+        INCOMING,
+        [("public.team", "team_pkey", "p", "PRIMARY KEY (id)")],
+        [],
+    )
+    ddl = table_copy.capture_deferred_ddl(conn, ["public.team"])
+
+    assert [(c["table"], c["name"], c["type"]) for c in ddl["constraints"]] == [
+        ("public.team", "team_pkey", "p"),
+        ("public.fixture", "fixture_hometeam_fkey", "f"),
+    ]
+
+
+def test_copy_without_deferral_refuses_a_referenced_subset():
+    with pytest.raises(ValueError, match="public.fixture.fixture_hometeam_fkey -> public.team"):
+        table_copy.require_foreign_key_closed(FakeConnection(INCOMING), ["public.team"])
+
+
+def test_copy_without_deferral_accepts_a_closed_list():
+    table_copy.require_foreign_key_closed(FakeConnection([]), ["public.team", "public.fixture"])
+
+
+def test_restore_skips_what_an_interrupted_restore_already_recreated(monkeypatch):
+    ddl = {
+        "constraints": [
+            {"table": "public.team", "name": "team_pkey", "type": "p", "definition": "PRIMARY KEY (id)"},
+            {"table": "public.fixture", "name": "fixture_hometeam_fkey", "type": "f",
+             "definition": "FOREIGN KEY (hometeam) REFERENCES public.team(id)"},
+            {"table": "public.fixture", "name": "fixture_awayteam_fkey", "type": "f",
+             "definition": "FOREIGN KEY (awayteam) REFERENCES public.team(id)"},
+            {"table": "public.fixture", "name": "fixture_venue_fkey", "type": "f",
+             "definition": "FOREIGN KEY (venue) REFERENCES public.venue(id)"},
+        ],
+        "indexes": [
+            {"table": "public.team", "name": "team_name_idx",
+             "definition": "CREATE INDEX team_name_idx ON public.team USING btree (name)"},
+        ],
+    }
+    # The earlier run got as far as adding two of the foreign keys NOT VALID and validating one
+    conn = FakeConnection(
+        [("public.team", "team_pkey", True),
+         ("public.fixture", "fixture_hometeam_fkey", True),
+         ("public.fixture", "fixture_awayteam_fkey", False)],
+        [("public.team", "team_name_idx")],
+    )
+    batches = []
+    monkeypatch.setattr(table_copy, "connect_db", lambda config: conn)
+    monkeypatch.setattr(table_copy, "_run_table_ddl", lambda config, statements: batches.append(statements))
+
+    table_copy.restore_deferred_ddl({}, ddl, workers=2)
+
+    added = conn.executed[2:]
+    assert len(added) == 1 and "fixture_venue_fkey" in repr(added[0])
+    # Only the two foreign keys that aren't validated yet are left to run
+    rerun = sorted(repr(statement) for batch in batches for statement in batch)
+    assert len(rerun) == 2
+    assert "fixture_awayteam_fkey" in rerun[0] and "VALIDATE" in rerun[0]
+    assert "fixture_venue_fkey" in rerun[1] and "VALIDATE" in rerun[1]
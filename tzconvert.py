@@ -0,0 +1,217 @@
+"""
+UTC -> venue-local and Atlanta wall times for fixture timestamps.
+
+Resolved ZoneInfo objects are cached, so converting a batch costs one zone load
+per distinct zone rather than one per timestamp. recomputefixturetimes()
+rewrites public.fixture.localdatetime and atlantatime for the whole history,
+e.g. after a tzdata update:
+
+    python tzconvert.py --recompute
+"""
+import argparse
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import psycopg2
+import psycopg2.extras
+
+logger = logging.getLogger(__name__)
+
+ATLANTATIMEZONE = "America/New_York"
+
+# Minimal alias mapping for common names and Windows zones to IANA
+_TZ_ALIAS_MAP = {
+    # Canonical pass-through
+    "america/new_york": "America/New_York",
+    # US aliases
+    "us/eastern": "America/New_York",
+    "us/central": "America/Chicago",
+    "us/mountain": "America/Denver",
+    "us/pacific": "America/Los_Angeles",
+    # Abbreviations (ambiguous; pick common US mappings)
+    "est": "America/New_York",
+    "edt": "America/New_York",
+    "cst": "America/Chicago",
+    "cdt": "America/Chicago",
+    "mst": "America/Denver",
+    "mdt": "America/Denver",
+    "pst": "America/Los_Angeles",
+    "pdt": "America/Los_Angeles",
+    # Common Windows display names -> IANA
+    "(utc-05:00) eastern time (us & canada)": "America/New_York",
+    "(utc-06:00) central time (us & canada)": "America/Chicago",
+    "(utc-07:00) mountain time (us & canada)": "America/Denver",
+    "(utc-08:00) pacific time (us & canada)": "America/Los_Angeles",
+    "eastern standard time": "America/New_York",
+    "central standard time": "America/Chicago",
+    "mountain standard time": "America/Denver",
+    "pacific standard time": "America/Los_Angeles",
+}
+
+
+def _normalize_tz_key(key: str | None) -> str | None:
+    if not key or not str(key).strip():
+        return None
+    s = str(key).strip()
+    # If it's already an IANA-like path with slash, leave case as-is for ZoneInfo
+    if "/" in s:
+        return s
+    # Otherwise normalize for alias lookup
+    return " ".join(s.lower().split())
+
+
+def _alias_to_iana(key: str) -> str:
+    norm = _normalize_tz_key(key)
+    if not norm:
+        return key
+    # If looks like IANA (contains '/'), return as-is
+    if "/" in key:
+        return key
+    return _TZ_ALIAS_MAP.get(norm, key)
+
+
+@lru_cache(maxsize=None)
+def zoneinfo(key: str | None) -> ZoneInfo | None:
+    """ZoneInfo for an IANA name or known alias, or None if it can't be loaded. Cached per key."""
+    iana = _alias_to_iana(key)
+    if not iana or not iana.strip():
+        logger.debug("Invalid timezone %r: empty or None.", key)
+        return None
+    try:
+        return ZoneInfo(iana)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning("Timezone %r could not be loaded; falling back to the local timezone.", key)
+        return None
+
+
+def parseutc(utc_dt) -> datetime:
+    """
+    Aware UTC datetime from an ISO 8601 string ("...Z" or "+00:00") or a
+    datetime; naive datetimes are taken to be UTC.
+    """
+    if isinstance(utc_dt, str):
+        s = utc_dt.strip()
+        if not s:
+            raise ValueError("utc_dt string is empty")
+        if s.endswith("Z"):
+            s = s[:-1] + "+00:00"
+        try:
+            dt = datetime.fromisoformat(s)
+        except Exception as e:
+            raise ValueError(f"Unable to parse datetime string: {utc_dt!r}") from e
+    elif isinstance(utc_dt, datetime):
+        dt = utc_dt
+    else:
+        raise TypeError("utc_dt must be a str or datetime")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def to_tz_from_utc(utc_dt, target_tz: str) -> datetime:
+    """
+    Convert a UTC datetime (str or datetime) to the given IANA timezone.
+
+    Returns an aware datetime in the target timezone. If the requested timezone
+    cannot be loaded on this system, falls back to the local timezone.
+    """
+    dt = parseutc(utc_dt)
+    tz = zoneinfo(target_tz)
+    if tz is None:
+        return dt.astimezone()
+    return dt.astimezone(tz)
+
+
+def walltimes(utctimes, zones):
+    """
+    Convert a batch of UTC timestamps to wall times in their venue's zone and in Atlanta.
+
+    utctimes holds strings or datetimes as accepted by parseutc(); zones is
+    either one zone name for the whole batch or a sequence parallel to utctimes.
+    Returns a list of (utc, local, atlanta) naive wall-time datetimes, ready for
+    the timestamp-without-time-zone columns of public.fixture.
+    """
+    if zones is None or isinstance(zones, str):
+        zones = [zones] * len(utctimes)
+    atlanta = zoneinfo(ATLANTATIMEZONE)
+    results = []
+    for utc_dt, zone in zip(utctimes, zones, strict=True):
+        dt = parseutc(utc_dt)
+        tz = zoneinfo(zone)
+        local = dt.astimezone(tz) if tz is not None else dt.astimezone()
+        atl = local if tz is atlanta else (dt.astimezone(atlanta) if atlanta is not None else dt.astimezone())
+        results.append((
+            dt.astimezone(timezone.utc).replace(tzinfo=None),
+            local.replace(tzinfo=None),
+            atl.replace(tzinfo=None),
+        ))
+    return results
+
+
+def recomputefixturetimes(conn, pagesize=1000):
+    """
+    Recompute localdatetime and atlantatime for every fixture from utcdatetime
+    and its venue's timezone, in one read and one UPDATE ... FROM (VALUES ...).
+
+    Only rows whose stored times differ are written. Returns that row count.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT f.id, f.utcdatetime, v.timezone, f.localdatetime, f.atlantatime
+            FROM public.fixture f
+            LEFT JOIN public.venue v ON v.id = f.venue
+            WHERE f.utcdatetime IS NOT NULL
+        """)
+        fixtures = cur.fetchall()
+    logger.info("Recomputing wall times for %s fixtures...", len(fixtures))
+
+    converted = walltimes([row[1] for row in fixtures], [row[2] for row in fixtures])
+    rows = [
+        (row[0], local, atl)
+        for row, (_, local, atl) in zip(fixtures, converted)
+        if (local, atl) != (row[3], row[4])
+    ]
+
+    with conn:
+        with conn.cursor() as cur:
+            psycopg2.extras.execute_values(
+                cur,
+                """
+                UPDATE public.fixture AS f
+                SET localdatetime = v.localdatetime, atlantatime = v.atlantatime
+                FROM (VALUES %s) AS v (id, localdatetime, atlantatime)
+                WHERE f.id = v.id
+                """,
+                rows,
+                template="(%s, %s::timestamp, %s::timestamp)",
+                page_size=pagesize,
+            )
+    logger.info("...%s fixtures had their wall times updated.", len(rows))
+    return len(rows)
+
+
+def main():
+    from getfixturelist import loaddbconfig
+
+    parser = argparse.ArgumentParser(description="Fixture timestamp timezone conversion.")
+    parser.add_argument("--recompute", action="store_true",
+                        help="recompute localdatetime and atlantatime for every fixture in public.fixture")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if not args.recompute:
+        parser.error("nothing to do; pass --recompute")
+
+    db = loaddbconfig("dbconfig.json")
+    conn = psycopg2.connect(host=db["host"], port=db["port"], dbname=db["dbname"], user=db["user"],
+                            password=db["password"])
+    try:
+        recomputefixturetimes(conn)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
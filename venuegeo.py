@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+from geopy.geocoders import Nominatim
+from geopy.extra.rate_limiter import RateLimiter
+from geopy.exc import GeocoderTimedOut, GeocoderServiceError, GeocoderUnavailable
+from timezonefinderL import TimezoneFinder
+
+from ingeststats import stats
+
+logger = logging.getLogger(__name__)
+
+USERAGENT = "atlutdhistory-app/1.0 (contact: youremail@example.com)"
+
+
+def _addresskey(address):
+    return " ".join((address or "").lower().split())
+
+
+def _pointkey(lat, lon):
+    # ~10 cm; plenty to tell venues apart and stable across float round trips
+    return f"{lat:.6f},{lon:.6f}"
+
+
+class VenueGeo:
+    """
+    Address -> (lat, lon) and (lat, lon) -> timezone lookups for new venues.
+
+    The Nominatim geocoder, its rate limiter and the TimezoneFinder polygon data
+    are built once, on first use, and kept for the life of the process. Answers
+    are kept in a JSON file at `cachepath`, so a venue that has been looked up
+    before resolves without the network or the 1 s Nominatim delay. Addresses
+    that didn't geocode aren't cached, since that is often a transient failure.
+    """
+
+    def __init__(self, cachepath=".venuegeo.json", useragent=USERAGENT, mindelay=1.0):
+        self.cachepath = cachepath
+        self.useragent = useragent
+        self.mindelay = mindelay
+        self._geocode = None
+        self._timezonefinder = None
+        self._lock = threading.Lock()
+        self.cache = {"addresses": {}, "timezones": {}}
+        try:
+            with open(cachepath, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+            self.cache["addresses"].update(loaded.get("addresses") or {})
+            self.cache["timezones"].update(loaded.get("timezones") or {})
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            logger.warning("Venue geocode cache %s is unreadable; starting empty.", cachepath)
+
+    def _save(self):
+        directory = os.path.dirname(self.cachepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write to a temp file first so a crash never leaves a truncated cache behind
+        tmppath = f"{self.cachepath}.{os.getpid()}.tmp"
+        with open(tmppath, "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, indent=1, sort_keys=True)
+        os.replace(tmppath, self.cachepath)
+
+    def _geocoder(self):
+        if self._geocode is None:
+            geolocator = Nominatim(user_agent=self.useragent, timeout=10)
+            # RateLimiter respects the Nominatim usage policy and retries transient failures
+            self._geocode = RateLimiter(
+                geolocator.geocode,
+                min_delay_seconds=self.mindelay,
+                max_retries=3,
+                error_wait_seconds=2.0,
+                swallow_exceptions=False,
+            )
+        return self._geocode
+
+    def _finder(self):
+        if self._timezonefinder is None:
+            self._timezonefinder = TimezoneFinder()
+        return self._timezonefinder
+
+    def geocode(self, address) -> Optional[tuple[float, float]]:
+        """
+        Returns (latitude, longitude) in decimal degrees for the given address,
+        or None if not found or on transient network errors.
+        """
+        key = _addresskey(address)
+        if not key:
+            return None
+        with self._lock:
+            if key in self.cache["addresses"]:
+                return tuple(self.cache["addresses"][key])
+            stats.add("geocodes")
+            with stats.timer("geocodetime"):
+                try:
+                    location = self._geocoder()(address.strip(), exactly_one=True, addressdetails=False)
+                except (GeocoderTimedOut, GeocoderUnavailable, GeocoderServiceError) as e:
+                    logger.warning("Geocoding %r failed: %s", address, e)
+                    return None
+                except Exception:
+                    logger.exception("Unexpected error geocoding %r.", address)
+                    return None
+            if location is None:
+                return None
+            coords = (location.latitude, location.longitude)
+            self.cache["addresses"][key] = list(coords)
+            self._save()
+            return coords
+
+    def timezone(self, lat, lon) -> Optional[str]:
+        """IANA timezone name at a point, or None if it is outside every zone polygon."""
+        key = _pointkey(lat, lon)
+        with self._lock:
+            if key in self.cache["timezones"]:
+                return self.cache["timezones"][key]
+            stats.add("geocodes")
+            with stats.timer("geocodetime"):
+                tz = self._finder().timezone_at(lng=lon, lat=lat)
+            if tz:
+                self.cache["timezones"][key] = tz
+                self._save()
+            return tz
+
+    def locate(self, address):
+        """Return (lat, lon, timezone) for an address; any part that can't be found is None."""
+        coords = self.geocode(address)
+        if coords is None:
+            return None, None, None
+        lat, lon = coords
+        return lat, lon, self.timezone(lat, lon)
+
+
+_service = None
+_servicelock = threading.Lock()
+
+
+def venuegeo(cachepath=".venuegeo.json"):
+    """
+    Return the process-wide VenueGeo, creating it on first use.
+
+    cachepath only takes effect on the call that creates it.
+    """
+    global _service
+    with _servicelock:
+        if _service is None:
+            _service = VenueGeo(cachepath)
+        return _service